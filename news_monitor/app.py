@@ -1,10 +1,11 @@
 import os
 import logging
 import json
+import asyncio
 from datetime import datetime, timedelta
 import random
-from fastapi import FastAPI, Request, Form, File, UploadFile, Depends, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Request, Form, File, UploadFile, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from typing import Dict, List, Any, Optional
@@ -15,11 +16,18 @@ from storage import FileStorage
 from keywords_manager import KeywordsManager
 from news_scraper import TencentNewsCrawler, ToutiaoNewsCrawler, WeixinCrawler, WeiboCrawler
 from data_manager import NewsDataManager
+from crawl_orchestrator import CrawlOrchestrator
+from crawl_frontier import CrawlFrontier
+from crawl_scheduler import CrawlScheduler
+from job_queue import JobQueue
+from crawler_runtime import get_default_runtime
 from trend_analyzer import TrendAnalyzer
+from chart_renderer import ChartRenderer
 from logger import setup_logger
 
 # 设置日志
-logger = setup_logger()
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
+logger = setup_logger(LOG_DIR)
 
 # 创建应用
 app = FastAPI(title="新闻关键词舆情监控系统")
@@ -34,8 +42,8 @@ templates = Jinja2Templates(directory="templates")
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# 初始化存储
-storage = FileStorage(DATA_DIR)
+# 初始化存储，新闻数据和抓取边界频繁追加，使用追加日志存储
+storage = FileStorage(DATA_DIR, log_collections=["news_data", "crawl_frontier", "news_tokens"])
 
 # 初始化关键词管理器
 keywords_manager = KeywordsManager(storage)
@@ -43,9 +51,27 @@ keywords_manager = KeywordsManager(storage)
 # 初始化新闻数据管理器
 news_data_manager = NewsDataManager(storage)
 
+# 初始化抓取边界，记录已抓取的文章，避免重复抓取
+crawl_frontier = CrawlFrontier(storage)
+
+# 初始化抓取调度器，各平台爬虫在请求间复用
+crawl_orchestrator = CrawlOrchestrator({
+    "tencent": TencentNewsCrawler(),
+    "toutiao": ToutiaoNewsCrawler(),
+    "weixin": WeixinCrawler(),
+    "weibo": WeiboCrawler()
+}, frontier=crawl_frontier)
+
+# 设置NEWS_MONITOR_WORKERS=1时后台抓取交给worker.py的工作进程，调度器只添加任务
+job_queue = JobQueue(os.path.join(DATA_DIR, "crawl_jobs.db")) if os.environ.get("NEWS_MONITOR_WORKERS") == "1" else None
+
+# 初始化后台抓取调度器，定期抓取活跃关键词，设置NEWS_MONITOR_SCHEDULER=0可关闭
+crawl_scheduler = CrawlScheduler(crawl_orchestrator, keywords_manager, news_data_manager, storage, job_queue=job_queue)
+
 # 初始化趋势分析器
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
-trend_analyzer = TrendAnalyzer(news_data_manager, STATIC_DIR)
+chart_renderer = ChartRenderer()
+trend_analyzer = TrendAnalyzer(news_data_manager, STATIC_DIR, chart_renderer)
 
 # 检查是否为测试模式
 def is_test_mode():
@@ -58,6 +84,54 @@ if is_test_mode():
     import sys
     sys.exit(0)
 
+@app.on_event("startup")
+async def start_chart_renderer():
+    """启动图表渲染进程，在其他后台线程开始工作前创建"""
+    chart_renderer.start()
+
+@app.on_event("shutdown")
+async def shutdown_chart_renderer():
+    """退出时关闭图表渲染进程"""
+    chart_renderer.shutdown()
+
+@app.on_event("startup")
+async def prepare_news_data():
+    """启动时加载或重建新闻索引和统计；历史新闻的发布时间戳和情感类别由manage.py离线补充"""
+    news_data_manager.get_index()
+    news_data_manager.get_stats()
+
+@app.on_event("shutdown")
+async def save_news_index():
+    """退出时保存新闻索引和关键词词频"""
+    news_data_manager.save_index()
+    news_data_manager.save_word_frequency()
+
+def log_background_failure(future: asyncio.Future) -> None:
+    """记录后台启动任务的异常，否则线程池中抛出的异常无人获取"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"后台启动任务失败: {str(future.exception())}")
+
+@app.on_event("startup")
+async def warm_up_driver_pool():
+    """设置NEWS_MONITOR_WARM_DRIVERS为正数时在后台预启动相应数量的浏览器驱动，不阻塞服务启动；默认不预启动"""
+    count = int(os.environ.get("NEWS_MONITOR_WARM_DRIVERS", "0"))
+    if count > 0:
+        future = asyncio.get_running_loop().run_in_executor(None, get_default_runtime().driver_pool.warm_up, count)
+        future.add_done_callback(log_background_failure)
+
+@app.on_event("startup")
+async def start_crawl_scheduler():
+    """启动后台抓取调度"""
+    if os.environ.get("NEWS_MONITOR_SCHEDULER", "1") != "0":
+        crawl_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_crawl_orchestrator():
+    """退出时停止后台抓取，关闭抓取线程池、连接池和浏览器驱动"""
+    await crawl_scheduler.stop()
+    crawl_orchestrator.shutdown()
+    get_default_runtime().close()
+
 @app.get("/", response_class=HTMLResponse)
 async def get_home(request: Request):
     """首页"""
@@ -138,6 +212,25 @@ async def update_keyword_status(
             "error": "更新关键词状态失败，可能不存在该关键词"
         })
 
+@app.post("/keywords/update_interval")
+async def update_keyword_interval(
+    request: Request,
+    keyword_id: str = Form(...),
+    interval: int = Form(0)
+):
+    """更新关键词的后台抓取间隔，0表示使用默认间隔"""
+    success = keywords_manager.update_keyword_interval(keyword_id, interval if interval > 0 else None)
+    if success:
+        logger.info(f"更新关键词抓取间隔成功: {keyword_id} -> {interval}")
+        return RedirectResponse(url="/keywords", status_code=303)
+    else:
+        logger.error(f"更新关键词抓取间隔失败: {keyword_id} -> {interval}")
+        return templates.TemplateResponse("keywords.html", {
+            "request": request,
+            "keywords": keywords_manager.get_all_keywords(),
+            "error": "更新关键词抓取间隔失败，可能不存在该关键词"
+        })
+
 @app.get("/platforms", response_class=HTMLResponse)
 async def get_platforms_page(request: Request):
     """平台管理页面"""
@@ -311,66 +404,44 @@ async def crawl_news(
         "latest_news": []
     }
     
-    # 平台类型映射
-    platform_type_map = {
-        "tencent": "tencent",
-        "toutiao": "toutiao",
-        "weixin": "weixin",
-        "weibo": "weibo"
-    }
+    # 获取选择的平台信息
+    platform_infos = {}
+    for platform_type in platforms:
+        platform_info = next((p for p in active_platforms if p.get("type") == platform_type), None)
+        if not platform_info:
+            logger.warning(f"未找到平台类型 {platform_type} 的平台信息")
+            continue
+        platform_infos[platform_type] = platform_info
     
-    # 爬虫类映射
-    crawler_map = {
-        "tencent": TencentNewsCrawler(),
-        "toutiao": ToutiaoNewsCrawler(),
-        "weixin": WeixinCrawler(),
-        "weibo": WeiboCrawler()
-    }
+    # 各平台并发抓取，总耗时取决于最慢的平台
+    platform_news = await crawl_orchestrator.crawl(keyword, list(platform_infos), limit_per_platform)
     
-    # 遍历选择的平台进行抓取
-    for platform_type in platforms:
+    news_items = []
+    for platform_type, platform_info in platform_infos.items():
         try:
-            # 获取平台信息
-            platform_info = next((p for p in active_platforms if p.get("type") == platform_type), None)
-            if not platform_info:
-                logger.warning(f"未找到平台类型 {platform_type} 的平台信息")
-                continue
-            
-            platform_id = platform_info.get("id")
             platform_name = platform_info.get("name")
+            platform_items = platform_news.get(platform_type)
             
-            # 获取对应的爬虫类型
-            crawler_type = platform_type_map.get(platform_type)
-            if not crawler_type:
-                logger.warning(f"未找到平台类型 {platform_type} 的爬虫类型映射")
-                continue
+            # 平台搜索失败时（如网络受限）使用模拟数据；搜索结果都已抓取过时返回空列表
+            if platform_items is None:
+                news_count = random.randint(5, limit_per_platform)
+                platform_items = [generate_mock_news(keyword, platform_type, platform_name) for i in range(min(3, news_count))]
+            else:
+                news_count = len(platform_items)
             
-            # 获取对应的爬虫
-            crawler = crawler_map.get(crawler_type)
-            if not crawler:
-                logger.warning(f"未找到爬虫类型 {crawler_type} 的爬虫")
-                continue
-            
-            logger.info(f"使用 {crawler.__class__.__name__} 抓取关键词 {keyword}")
-            
-            # 模拟抓取结果
-            news_count = random.randint(5, limit_per_platform)
             crawl_result["total_count"] += news_count
             crawl_result["platform_counts"][platform_name] = news_count
-            
-            # 生成模拟新闻数据
-            for i in range(min(3, news_count)):
-                news_item = generate_mock_news(keyword, platform_type, platform_name)
-                crawl_result["latest_news"].append(news_item)
-                
-                # 保存到数据管理器
-                news_data_manager.save_news([news_item])
+            crawl_result["latest_news"].extend(platform_items)
+            news_items.extend(platform_items)
             
             logger.info(f"从 {platform_name} 抓取了 {news_count} 条新闻")
             
         except Exception as e:
             logger.error(f"抓取平台 {platform_type} 时发生错误: {str(e)}")
     
+    # 整批保存到数据管理器，保存涉及文件锁和索引更新，放到线程池中执行以免阻塞事件循环
+    await asyncio.get_running_loop().run_in_executor(None, news_data_manager.save_news, news_items)
+    
     # 对最新新闻按时间排序
     crawl_result["latest_news"] = sorted(
         crawl_result["latest_news"],
@@ -385,6 +456,81 @@ async def crawl_news(
         "crawl_result": crawl_result
     })
 
+def format_sse(event: Dict[str, Any]) -> str:
+    """将抓取事件编码为Server-Sent Events消息"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+# 流式抓取时每累计这么多条新闻保存一次
+STREAM_SAVE_BATCH = 20
+
+@app.get("/news/crawl/stream")
+async def stream_crawl_news(
+    keyword: str,
+    platforms: List[str] = Query(...),
+    limit_per_platform: int = 10
+):
+    """以Server-Sent Events推送抓取进度，每条新闻提取完成后立即推送并分批保存"""
+    all_platforms = storage.load_json("platforms", [])
+    platform_names = {p.get("type"): p.get("name") for p in all_platforms if p.get("status") == "active"}
+    platform_types = [platform_type for platform_type in platforms if platform_type in platform_names]
+    
+    async def event_stream():
+        batch = []
+        try:
+            async for event in crawl_orchestrator.stream(keyword, platform_types, limit_per_platform):
+                events = [event]
+                if event["event"] == "platform":
+                    event["platform"] = platform_names.get(event["platform_type"])
+                    # 平台未返回结果时（如网络受限）使用模拟数据，与/news/crawl一致
+                    if event["status"] == "empty":
+                        platform_type, platform_name = event["platform_type"], event["platform"]
+                        mock_items = [generate_mock_news(keyword, platform_type, platform_name) for i in range(min(3, limit_per_platform))]
+                        events += [{"event": "news", "platform_type": platform_type, "news": news} for news in mock_items]
+                        events.append({"event": "platform", "platform_type": platform_type, "platform": platform_name,
+                                       "status": "done", "count": len(mock_items), "mock": True})
+                
+                for item in events:
+                    if item["event"] == "news":
+                        batch.append(item["news"])
+                    yield format_sse(item)
+                
+                if len(batch) >= STREAM_SAVE_BATCH or (event["event"] == "done" and batch):
+                    await asyncio.get_running_loop().run_in_executor(None, news_data_manager.save_news, batch)
+                    batch = []
+        finally:
+            # 客户端中途断开时在线程池中保存已推送的新闻，不等待完成，避免阻塞事件循环
+            if batch:
+                asyncio.get_running_loop().run_in_executor(None, news_data_manager.save_news, batch)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@app.get("/api/crawl/status")
+async def get_crawl_status():
+    """后台抓取调度的运行状态和各关键词的上次、下次抓取时间，使用工作进程时包括任务队列状态"""
+    status = crawl_scheduler.get_status()
+    if job_queue is not None:
+        status["jobs"] = job_queue.get_summary()
+    return status
+
+@app.get("/api/crawl/fetch_stats")
+async def get_crawl_fetch_stats():
+    """各平台快速路径与浏览器回退的抓取次数"""
+    return get_default_runtime().get_fetch_stats()
+
+@app.get("/api/crawl/frontier")
+async def get_crawl_frontier_summary():
+    """抓取边界中各状态的文章数量"""
+    return crawl_frontier.get_summary()
+
+@app.get("/api/crawl/cache_stats")
+async def get_crawl_cache_stats():
+    """爬虫响应缓存的命中次数和占用空间"""
+    response_cache = get_default_runtime().response_cache
+    return response_cache.get_stats() if response_cache else {}
+
 @app.get("/analysis", response_class=HTMLResponse)
 async def get_analysis_page(
     request: Request,
@@ -404,8 +550,10 @@ async def get_analysis_page(
             "days": days
         })
     
-    # 分析关键词趋势
-    analysis_result = trend_analyzer.analyze_trend(keyword, days)
+    # 分析关键词趋势，图表由页面根据chart_data绘制，不生成图片
+    analysis_result = await asyncio.get_running_loop().run_in_executor(
+        None, trend_analyzer.analyze_trend, keyword, days, False
+    )
     
     if not analysis_result:
         logger.warning(f"分析关键词 {keyword} 趋势失败")
@@ -425,6 +573,27 @@ async def get_analysis_page(
         "analysis_result": analysis_result
     })
 
+@app.get("/api/analysis/{keyword}")
+async def get_analysis_data(keyword: str, days: int = Query(30, ge=1, le=365)):
+    """关键词的舆情分析结果，包括各图表的数据序列"""
+    analysis_result = await asyncio.get_running_loop().run_in_executor(
+        None, trend_analyzer.analyze_trend, keyword, days, False
+    )
+    if not analysis_result:
+        raise HTTPException(status_code=404, detail=f"未找到关键词 {keyword} 的相关新闻")
+    return analysis_result
+
+@app.get("/api/analysis/{keyword}/images")
+async def export_analysis_images(keyword: str, days: int = Query(30, ge=1, le=365)):
+    """生成关键词分析的图表图片，返回各图片路径"""
+    # 等待图表在渲染进程中绘制，放到线程池中执行，不阻塞事件循环
+    analysis_result = await asyncio.get_running_loop().run_in_executor(
+        None, trend_analyzer.analyze_trend, keyword, days
+    )
+    if not analysis_result:
+        raise HTTPException(status_code=404, detail=f"未找到关键词 {keyword} 的相关新闻")
+    return {name: path for name, path in analysis_result.items() if name.endswith("_path")}
+
 def get_dashboard_stats():
     """获取仪表盘统计数据"""
     # 获取关键词数量
@@ -437,18 +606,18 @@ def get_dashboard_stats():
     total_platforms = len(platforms)
     active_platforms = len([p for p in platforms if p.get("status") == "active"])
     
-    # 获取新闻数量
-    news_list = news_data_manager.get_all_news()
-    total_news = len(news_list)
+    # 新闻数量和互动数据读取入库时维护的统计
+    news_stats = news_data_manager.get_stats()
+    total_news = news_stats.total_news
     
     # 计算互动数据
-    total_interactions = sum([
-        n.get("read_count", 0) + 
-        n.get("comment_count", 0) + 
-        n.get("like_count", 0) + 
-        n.get("share_count", 0)
-        for n in news_list
-    ])
+    interaction_totals = news_data_manager.get_interaction_totals()
+    total_interactions = (
+        interaction_totals["read_count"] +
+        interaction_totals["comment_count"] +
+        interaction_totals["like_count"] +
+        interaction_totals["share_count"]
+    )
     
     # 计算变化率（模拟数据）
     news_change = random.randint(-20, 30)
@@ -494,21 +663,19 @@ def get_trend_data():
 
 def get_sentiment_data():
     """获取情感分析数据"""
-    # 生成模拟数据
-    return {
-        "positive": random.randint(30, 60),
-        "neutral": random.randint(20, 40),
-        "negative": random.randint(10, 30)
-    }
+    # 读取入库时分析并增量统计的情感分布
+    return news_data_manager.get_sentiment_counts()
 
 def get_platform_data():
     """获取平台分布数据"""
     # 获取平台列表
     platforms = storage.load_json("platforms", [])
     
-    # 生成模拟数据
+    # 读取入库时增量统计的各平台新闻数量，未配置的平台排在已配置平台之后
+    by_platform = dict(news_data_manager.get_stats().by_platform)
     labels = [p.get("name", "") for p in platforms]
-    values = [random.randint(10, 100) for _ in platforms]
+    labels.extend(name for name in by_platform if name and name not in labels)
+    values = [by_platform.get(name, 0) for name in labels]
     
     return {
         "labels": labels,
@@ -517,15 +684,11 @@ def get_platform_data():
 
 def get_interaction_data():
     """获取互动数据"""
-    # 生成模拟数据
+    # 读取入库时增量统计的互动数据合计
+    interactions = news_data_manager.get_interaction_totals()
     labels = ["阅读量", "评论数", "点赞数", "转发数", "分享数"]
-    values = [
-        random.randint(1000, 5000),
-        random.randint(100, 500),
-        random.randint(200, 800),
-        random.randint(50, 200),
-        random.randint(30, 150)
-    ]
+    fields = ["read_count", "comment_count", "like_count", "forward_count", "share_count"]
+    values = [interactions.get(field, 0) for field in fields]
     
     return {
         "labels": labels,
@@ -534,26 +697,14 @@ def get_interaction_data():
 
 def get_hot_news(limit=5):
     """获取热门新闻"""
-    # 获取所有新闻
-    all_news = news_data_manager.get_all_news()
+    # 与数据管理器共用热度排行
+    hot_news = news_data_manager.get_hot_news(limit)
     
     # 如果没有新闻数据，生成模拟数据
-    if not all_news:
+    if not hot_news:
         return generate_mock_hot_news(limit)
     
-    # 按互动量排序
-    sorted_news = sorted(
-        all_news,
-        key=lambda x: (
-            x.get("read_count", 0) + 
-            x.get("comment_count", 0) * 5 + 
-            x.get("like_count", 0) * 2
-        ),
-        reverse=True
-    )
-    
-    # 返回前N条
-    return sorted_news[:limit] if len(sorted_news) >= limit else sorted_news
+    return hot_news
 
 def generate_mock_news(keyword, platform_type, platform_name):
     """生成模拟新闻数据"""
@@ -620,8 +771,7 @@ def generate_mock_news(keyword, platform_type, platform_name):
         "read_count": read_count,
         "comment_count": comment_count,
         "like_count": like_count,
-        "share_count": share_count,
-        "sentiment": random.choice(["positive", "neutral", "negative"])
+        "share_count": share_count
     }
 
 def generate_mock_hot_news(limit=5):
@@ -0,0 +1,585 @@
+import os
+import time
+import random
+import shutil
+import socket
+import asyncio
+import logging
+import argparse
+import resource
+import tempfile
+import threading
+import statistics
+import tracemalloc
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Callable, Optional
+
+import requests
+
+from storage import FileStorage
+from data_manager import NewsDataManager
+from crawler_runtime import CrawlerRuntime
+from html_parser import available_parsers
+from rate_limiter import HostRateLimiter, PRIORITY_ARTICLE
+from news_scraper import TencentNewsCrawler
+from crawl_orchestrator import CrawlOrchestrator
+from crawl_fixtures import FixtureArchive, RecordingRuntime, ReplayRuntime, ReplayServer
+from news_tokens import enable_parallel
+from sentiment_analyzer import (
+    SentimentAnalyzer, POSITIVE_WORDS, NEGATIVE_WORDS, NEGATION_WORDS, DEGREE_WORDS, SENTIMENT_LABELS
+)
+from worker import build_crawlers
+
+PLATFORMS = [
+    ("tencent", "腾讯新闻"),
+    ("toutiao", "今日头条"),
+    ("weixin", "微信公众号"),
+    ("weibo", "微博")
+]
+
+KEYWORDS = ["人工智能", "数字经济", "元宇宙", "区块链", "新能源"]
+
+TAGS = ["科技", "财经", "政策", "观点", "趋势", "热点", "深度", "分析"]
+
+
+def make_news_items(count: int, start: int = 0) -> List[Dict[str, Any]]:
+    """
+    生成合成新闻数据，URL由序号决定，相同序号即为重复新闻
+    
+    Args:
+        count: 数量
+        start: 起始序号
+    
+    Returns:
+        新闻数据列表
+    """
+    rng = random.Random(start)
+    now = datetime.now()
+    items = []
+    for i in range(start, start + count):
+        platform_type, platform = PLATFORMS[i % len(PLATFORMS)]
+        keyword = KEYWORDS[i % len(KEYWORDS)]
+        publish_time = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        items.append({
+            "id": f"news_{i}",
+            "keyword": keyword,
+            "title": f"{keyword}相关新闻{i}",
+            "summary": f"关于{keyword}的第{i}条新闻摘要",
+            "content": "",
+            "url": f"https://example.com/{platform_type}/{i}",
+            "platform_type": platform_type,
+            "platform": platform,
+            "publish_time": publish_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tags": rng.sample(TAGS, 2),
+            "read_count": rng.randint(100, 10000),
+            "comment_count": rng.randint(10, 500),
+            "like_count": rng.randint(20, 1000),
+            "share_count": rng.randint(5, 200),
+            "forward_count": 0
+        })
+    return items
+
+
+def bench_ingest(sizes: List[int], batch_size: int = 100, batches: int = 20) -> None:
+    """
+    测试不同存量数据规模下save_news的吞吐量
+    
+    每批数据一半为新新闻，一半与存量数据URL重复。
+    
+    Args:
+        sizes: 存量新闻条数列表
+        batch_size: 每批新闻条数
+        batches: 批次数
+    """
+    print(f"{'存量条数':>10} {'索引构建(s)':>12} {'每批耗时(ms)':>14} {'吞吐量(条/s)':>14}")
+    for size in sizes:
+        data_dir = tempfile.mkdtemp(prefix="news_bench_")
+        try:
+            # 缓存预算需容纳全部存量数据，否则每次读取都会重放日志
+            storage = FileStorage(data_dir, log_collections=["news_data", "news_tokens"], cache_max_bytes=4 * 1024 ** 3)
+            storage.save_json("news_data", make_news_items(size))
+            manager = NewsDataManager(storage)
+            
+            start = time.perf_counter()
+            manager.get_index()
+            index_time = time.perf_counter() - start
+            
+            elapsed = 0.0
+            next_id = size
+            for _ in range(batches):
+                duplicates = make_news_items(batch_size // 2, start=random.randrange(max(size - batch_size, 1)))
+                fresh = make_news_items(batch_size - len(duplicates), start=next_id)
+                next_id += len(fresh)
+                
+                start = time.perf_counter()
+                manager.save_news(duplicates + fresh)
+                elapsed += time.perf_counter() - start
+            
+            per_batch_ms = elapsed / batches * 1000
+            throughput = batch_size * batches / elapsed if elapsed else 0.0
+            print(f"{size:>10} {index_time:>12.3f} {per_batch_ms:>14.3f} {throughput:>14.0f}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    模拟新闻站点的HTTP处理器，返回与腾讯新闻爬虫选择器匹配的搜索页和文章页
+    
+    每个新连接建立时等待connect_latency秒，模拟真实网络中TCP/TLS握手的往返耗时。
+    """
+    
+    protocol_version = "HTTP/1.1"
+    connect_latency = 0.0
+    article_count = 10
+    
+    def setup(self):
+        time.sleep(self.connect_latency)
+        # 响应头和正文分两次写出，关闭Nagle算法避免与延迟确认叠加产生额外等待
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().setup()
+    
+    def do_GET(self):
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        if self.path.startswith("/search"):
+            items = "".join(
+                f'<div class="vrwrap"><h3 class="vr-title"><a href="{host}/article/{i}">新闻{i}</a></h3>'
+                f'<p class="vr-summary">摘要{i}</p></div>'
+                for i in range(self.article_count)
+            )
+            body = f"<html><body>{items}</body></html>"
+        else:
+            paragraphs = "".join(f"<p>正文段落{i}</p>" for i in range(20))
+            body = (f'<html><body><div class="LEFT"><h1>{self.path}</h1></div>'
+                    f'<div class="content-article">{paragraphs}</div></body></html>')
+        
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class UnpooledRuntime(CrawlerRuntime):
+    """
+    不复用连接的运行时，每次请求都调用requests.get，作为对比基准
+    """
+    
+    def get(self, url, headers=None, priority=PRIORITY_ARTICLE, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        self.rate_limiter.acquire(url, priority)
+        return requests.get(url, headers=headers, **kwargs)
+
+
+def make_sentiment_corpus(count: int, sentences: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    生成情感分析用的合成新闻，正文由带情感词、否定词和程度副词的短句组成
+    
+    Args:
+        count: 新闻条数
+        sentences: 每条新闻正文的句数
+        seed: 随机种子
+    
+    Returns:
+        新闻数据列表
+    """
+    rng = random.Random(seed)
+    subjects = ["公司", "市场", "行业", "用户", "专家", "政策", "平台", "产品", "数据", "监管部门"]
+    degrees = list(DEGREE_WORDS)
+    items = []
+    for i in range(count):
+        keyword = KEYWORDS[i % len(KEYWORDS)]
+        # 每条新闻有一个主要倾向，句子多数跟随该倾向
+        words = POSITIVE_WORDS if rng.random() < 0.5 else NEGATIVE_WORDS
+        parts = []
+        for _ in range(sentences):
+            sentence = f"{keyword}{rng.choice(subjects)}"
+            if rng.random() < 0.2:
+                sentence += rng.choice(NEGATION_WORDS)
+            if rng.random() < 0.4:
+                sentence += rng.choice(degrees)
+            sentence += rng.choice(words if rng.random() < 0.7 else POSITIVE_WORDS + NEGATIVE_WORDS)
+            parts.append(sentence)
+        items.append({
+            "url": f"https://example.com/sentiment/{i}",
+            "keyword": keyword,
+            "title": f"{keyword}相关新闻{i}",
+            "content": "，".join(parts) + "。"
+        })
+    return items
+
+
+def bench_sentiment(count: int = 5000, batch_sizes: Optional[List[int]] = None, processes: int = 0) -> None:
+    """
+    测试情感分析在不同批次大小下的吞吐量
+    
+    Args:
+        count: 合成新闻条数
+        batch_sizes: 每批分析的新闻条数列表
+        processes: jieba并行分词的进程数，0为不启用并行模式
+    """
+    if processes > 0:
+        enable_parallel(processes)
+    analyzer = SentimentAnalyzer()
+    # 预先加载jieba词典，不计入耗时
+    analyzer.score_texts(["预热"])
+    
+    print(f"{'批次大小':>10} {'耗时(s)':>10} {'吞吐量(条/s)':>14}  情感分布")
+    for batch_size in batch_sizes or [1, 100, 1000]:
+        items = make_sentiment_corpus(count)
+        start = time.perf_counter()
+        for offset in range(0, len(items), batch_size):
+            analyzer.score_items(items[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+        
+        counts = {sentiment: 0 for sentiment in SENTIMENT_LABELS}
+        for item in items:
+            counts[item["sentiment"]] += 1
+        distribution = " ".join(f"{SENTIMENT_LABELS[sentiment]}={n}" for sentiment, n in counts.items())
+        print(f"{batch_size:>10} {elapsed:>10.2f} {count / elapsed:>14.0f}  {distribution}")
+
+
+def bench_http(articles: int = 20, rounds: int = 5, connect_latency: float = 0.02) -> None:
+    """
+    测试腾讯新闻爬虫先抓搜索页再抓文章页时，连接池会话与逐次新建连接的耗时
+    
+    Args:
+        articles: 每轮抓取的文章数
+        rounds: 轮数
+        connect_latency: 模拟的建立连接耗时（秒）
+    """
+    StubHandler.connect_latency = connect_latency
+    StubHandler.article_count = articles
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    print(f"{'模式':>8} {'搜索页(ms)':>12} {'每篇文章(ms)':>14} {'总耗时(s)':>10}")
+    try:
+        # 本地测试不限速
+        rate_limiter = HostRateLimiter(default_rate=1e6, default_burst=1000)
+        for name, runtime in [("逐次连接", UnpooledRuntime(rate_limiter=rate_limiter)), ("连接池", CrawlerRuntime(rate_limiter=rate_limiter))]:
+            crawler = TencentNewsCrawler(runtime)
+            crawler.search_url = base_url + "/search?q={}"
+            search_elapsed = 0.0
+            article_elapsed = 0.0
+            for _ in range(rounds):
+                start = time.perf_counter()
+                results = crawler.search_keyword("人工智能", limit=articles)
+                search_elapsed += time.perf_counter() - start
+                
+                start = time.perf_counter()
+                for item in results:
+                    crawler.extract_news_info(item["url"])
+                article_elapsed += time.perf_counter() - start
+            runtime.close()
+            
+            search_ms = search_elapsed / rounds * 1000
+            article_ms = article_elapsed / (rounds * articles) * 1000
+            print(f"{name:>8} {search_ms:>12.2f} {article_ms:>14.2f} {search_elapsed + article_elapsed:>10.2f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def make_search_page(results: int = 10, noise: int = 300) -> str:
+    """
+    生成与搜狗站内搜索结构相同的搜索结果页，包含大量与结果无关的页面元素
+    
+    Args:
+        results: 结果条数
+        noise: 无关元素数量
+    
+    Returns:
+        HTML内容
+    """
+    nav = "".join(f'<li class="nav-item"><a href="/c/{i}">频道{i}</a><span class="badge">{i}</span></li>' for i in range(noise))
+    items = "".join(
+        f'<div class="vrwrap"><h3 class="vr-title"><a href="https://news.qq.com/rain/a/{i}">人工智能相关新闻{i}</a></h3>'
+        f'<p class="vr-summary">关于人工智能的第{i}条新闻摘要，' + "内容" * 40 + '</p>'
+        f'<span class="fz-mid c-color-gray2">2024-01-{i % 28 + 1:02d}</span></div>'
+        for i in range(results)
+    )
+    scripts = "".join(f"<script>var config{i} = {{a: {i}, b: '{'x' * 200}'}};</script>" for i in range(noise // 10))
+    return f'<html><head><title>搜索</title>{scripts}</head><body><ul class="nav">{nav}</ul><div id="main">{items}</div></body></html>'
+
+
+def make_article_page(paragraphs: int = 60, noise: int = 300) -> str:
+    """
+    生成与腾讯新闻文章页结构相同的页面
+    
+    Args:
+        paragraphs: 正文段落数
+        noise: 无关元素数量
+    
+    Returns:
+        HTML内容
+    """
+    nav = "".join(f'<li class="nav-item"><a href="/c/{i}">频道{i}</a></li>' for i in range(noise))
+    body = "".join(f"<p>正文第{i}段，" + "文字" * 60 + "</p>" for i in range(paragraphs))
+    tags = "".join(f'<a href="/t/{i}">标签{i}</a>' for i in range(5))
+    return (f'<html><body><ul class="nav">{nav}</ul><div class="LEFT"><h1>文章标题</h1>'
+            f'<div class="article-info"><span class="time">2024-01-01 10:00:00</span></div>'
+            f'<div class="content-article">{body}</div><div class="tags">{tags}</div></div></body></html>')
+
+
+def measure(func: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    """
+    测量函数的平均耗时和单次执行的Python内存峰值
+    
+    tracemalloc只统计Python分配的内存，C扩展解析器内部的内存不计入。
+    
+    Args:
+        func: 被测函数
+        rounds: 执行次数
+    
+    Returns:
+        包含ms（平均毫秒）和peak_kb（内存峰值KB）的字典
+    """
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+    return {"ms": elapsed / rounds * 1000, "peak_kb": peak / 1024}
+
+
+def bench_parse(rounds: int = 50, fixtures_dir: Optional[str] = None) -> None:
+    """
+    测试各HTML解析后端解析搜索页和文章页的耗时和内存
+    
+    搜索页分别测试完整解析和只解析结果项的部分解析，文章页按爬虫的提取流程测试。
+    
+    Args:
+        rounds: 每项测试的执行次数
+        fixtures_dir: 保存的页面目录，文件名以search开头的作为搜索页，其余作为文章页；
+                      不指定时使用生成的页面
+    """
+    search_pages = [make_search_page()]
+    article_pages = [make_article_page()]
+    if fixtures_dir:
+        search_pages, article_pages = [], []
+        for filename in sorted(os.listdir(fixtures_dir)):
+            if filename.endswith(".html"):
+                with open(os.path.join(fixtures_dir, filename), "r", encoding="utf-8") as f:
+                    (search_pages if filename.startswith("search") else article_pages).append(f.read())
+    
+    print(f"{'解析后端':>12} {'页面':>16} {'每页耗时(ms)':>14} {'内存峰值(KB)':>14}")
+    for backend in available_parsers():
+        crawler = TencentNewsCrawler(CrawlerRuntime(parser=backend))
+        parser = crawler.parser
+        current = {"html": ""}
+        # 跳过网络请求，直接返回待解析的页面
+        crawler.get_html = lambda url: current["html"]
+        
+        def full_search():
+            for html in search_pages:
+                soup = parser.parse(html)
+                for item in parser.select(soup, '.vrwrap'):
+                    parser.select_one(item, '.vr-title a')
+        
+        def partial_search():
+            for html in search_pages:
+                current["html"] = html
+                crawler.search_keyword("人工智能")
+        
+        def article():
+            for html in article_pages:
+                current["html"] = html
+                crawler.extract_news_info("https://news.qq.com/rain/a/0")
+        
+        cases = [("搜索页(完整解析)", full_search, len(search_pages)),
+                 ("搜索页(部分解析)", partial_search, len(search_pages)),
+                 ("文章页", article, len(article_pages))]
+        for name, func, pages in cases:
+            if not pages:
+                continue
+            result = measure(func, rounds)
+            print(f"{backend:>12} {name:>16} {result['ms'] / pages:>14.3f} {result['peak_kb'] / pages:>14.1f}")
+
+
+def record_fixtures(path: str, keywords: List[str], platform_types: List[str], limit: int = 10) -> None:
+    """
+    按正常流程抓取关键词，把访问到的所有页面录制到存档，供crawl测试离线回放
+    
+    Args:
+        path: 存档文件路径
+        keywords: 关键词列表
+        platform_types: 平台类型列表
+        limit: 每个平台的结果数量限制
+    """
+    fixtures = FixtureArchive(path)
+    runtime = RecordingRuntime(fixtures)
+    orchestrator = CrawlOrchestrator(build_crawlers(runtime))
+    try:
+        for keyword in keywords:
+            results = asyncio.run(orchestrator.crawl(keyword, platform_types, limit))
+            for platform_type in platform_types:
+                fixtures.add_search(platform_type, keyword, limit)
+            print(f"{keyword}: " + ", ".join(f"{pt}={len(items)}" for pt, items in results.items()))
+    finally:
+        orchestrator.shutdown()
+        runtime.close()
+        fixtures.save()
+    print(f"已录制 {len(fixtures.pages)} 个页面到 {path}")
+
+
+def replay_crawler(platform_type: str, searches: List[Dict[str, Any]], base_url: str,
+                   concurrency: int, rounds: int) -> Dict[str, Any]:
+    """
+    在独立进程中回放一个平台的录制搜索，统计每次抓取加解析的耗时
+    
+    每个平台使用单独的进程，进程的内存峰值只包含该平台爬虫的开销。
+    
+    Args:
+        platform_type: 平台类型
+        searches: 该平台录制的搜索
+        base_url: 回放服务器地址
+        concurrency: 提取详情页的并发线程数
+        rounds: 回放轮数
+    
+    Returns:
+        包含pages、elapsed、latencies（秒）和peak_rss_kb的字典
+    """
+    logging.basicConfig(level=logging.WARNING)
+    runtime = ReplayRuntime(base_url, pool_maxsize=max(10, concurrency))
+    crawler = build_crawlers(runtime)[platform_type]
+    latencies: List[float] = []
+    
+    def timed(func: Callable, *args) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(rounds):
+                for search in searches:
+                    results = timed(crawler.search_keyword, search["keyword"], search["limit"]) or []
+                    list(executor.map(lambda item: timed(crawler.extract_news_info, item["url"]), results))
+    finally:
+        runtime.close()
+    
+    return {
+        "pages": len(latencies),
+        "elapsed": time.perf_counter() - start,
+        "latencies": latencies,
+        # Linux下ru_maxrss的单位为KB
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+
+def bench_crawl(path: str, latency: float = 0.05, jitter: float = 0.02, concurrency: int = 4, rounds: int = 3,
+                platform_types: Optional[List[str]] = None) -> None:
+    """
+    离线回放录制的页面，测试各平台爬虫的抓取吞吐量、延迟分布和内存峰值
+    
+    回放服务器在主进程中运行，每个响应按latency±jitter延迟返回，模拟站点响应时间；
+    各平台爬虫依次在新启动的进程中运行，互不影响内存统计。
+    需要浏览器的页面回放时仍会启动Chrome。
+    
+    Args:
+        path: 存档文件路径
+        latency: 每个响应的平均延迟（秒）
+        jitter: 延迟的随机浮动范围（秒）
+        concurrency: 提取详情页的并发线程数
+        rounds: 回放轮数
+        platform_types: 要测试的平台类型，默认为存档中录制的全部平台
+    """
+    fixtures = FixtureArchive.load(path)
+    searches: Dict[str, List[Dict[str, Any]]] = {}
+    for search in fixtures.searches:
+        searches.setdefault(search["platform_type"], []).append(search)
+    
+    print(f"{'平台':>10} {'页面数':>8} {'页面/秒':>10} {'p50(ms)':>10} {'p99(ms)':>10} {'内存峰值(MB)':>14}")
+    with ReplayServer(fixtures, latency, jitter) as server:
+        for platform_type in platform_types or list(searches):
+            if platform_type not in searches:
+                print(f"{platform_type:>10} 存档中没有录制的搜索")
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                result = executor.submit(
+                    replay_crawler, platform_type, searches[platform_type], server.base_url, concurrency, rounds
+                ).result()
+            
+            latencies = sorted(result["latencies"])
+            if not latencies:
+                print(f"{platform_type:>10} 没有回放任何页面")
+                continue
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            print(f"{platform_type:>10} {result['pages']:>8} {result['pages'] / result['elapsed']:>10.1f} "
+                  f"{p50:>10.1f} {p99:>10.1f} {result['peak_rss_kb'] / 1024:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻监控系统性能测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    ingest_parser = subparsers.add_parser("ingest", help="测试新闻入库吞吐量")
+    ingest_parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="存量新闻条数")
+    ingest_parser.add_argument("--batch-size", type=int, default=100, help="每批新闻条数")
+    ingest_parser.add_argument("--batches", type=int, default=20, help="批次数")
+    
+    http_parser = subparsers.add_parser("http", help="测试连接池会话对抓取延迟的影响")
+    http_parser.add_argument("--articles", type=int, default=20, help="每轮抓取的文章数")
+    http_parser.add_argument("--rounds", type=int, default=5, help="轮数")
+    http_parser.add_argument("--connect-latency", type=float, default=0.02, help="模拟的建立连接耗时（秒）")
+    
+    parse_parser = subparsers.add_parser("parse", help="测试各HTML解析后端的解析耗时和内存")
+    parse_parser.add_argument("--rounds", type=int, default=50, help="执行次数")
+    parse_parser.add_argument("--fixtures", default=None, help="保存的页面目录")
+    
+    record_parser = subparsers.add_parser("record", help="抓取真实站点并录制页面存档")
+    record_parser.add_argument("fixtures", help="存档文件路径")
+    record_parser.add_argument("--keywords", nargs="+", default=KEYWORDS[:2], help="关键词")
+    record_parser.add_argument("--platforms", nargs="+", default=[pt for pt, _ in PLATFORMS], help="平台类型")
+    record_parser.add_argument("--limit", type=int, default=10, help="每个平台的结果数量限制")
+    
+    crawl_parser = subparsers.add_parser("crawl", help="离线回放录制的页面，测试各平台爬虫的吞吐量")
+    crawl_parser.add_argument("fixtures", help="存档文件路径")
+    crawl_parser.add_argument("--latency", type=float, default=0.05, help="回放响应的平均延迟（秒）")
+    crawl_parser.add_argument("--jitter", type=float, default=0.02, help="回放响应延迟的随机浮动范围（秒）")
+    crawl_parser.add_argument("--concurrency", type=int, default=4, help="提取详情页的并发线程数")
+    crawl_parser.add_argument("--rounds", type=int, default=3, help="回放轮数")
+    crawl_parser.add_argument("--platforms", nargs="+", default=None, help="平台类型，默认为存档中的全部平台")
+    
+    sentiment_parser = subparsers.add_parser("sentiment", help="测试情感分析在合成语料上的吞吐量")
+    sentiment_parser.add_argument("--items", type=int, default=5000, help="合成新闻条数")
+    sentiment_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000], help="每批分析的新闻条数")
+    sentiment_parser.add_argument("--processes", type=int, default=0, help="jieba并行分词的进程数，0为不启用并行模式")
+    
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    
+    if args.command == "ingest":
+        bench_ingest(args.sizes, args.batch_size, args.batches)
+    elif args.command == "http":
+        bench_http(args.articles, args.rounds, args.connect_latency)
+    elif args.command == "parse":
+        bench_parse(args.rounds, args.fixtures)
+    elif args.command == "record":
+        record_fixtures(args.fixtures, args.keywords, args.platforms, args.limit)
+    elif args.command == "crawl":
+        bench_crawl(args.fixtures, args.latency, args.jitter, args.concurrency, args.rounds, args.platforms)
+    elif args.command == "sentiment":
+        bench_sentiment(args.items, args.batch_sizes, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+# 由缓存管理的图片文件名：图表类型加内容哈希；旧版本按秒级时间戳命名的图片同样参与淘汰
+CACHED_IMAGE_PATTERN = re.compile(r"^[a-z_]+_(?:[0-9a-f]{32}|.+_\d{14})\.png$")
+
+
+class ChartCache:
+    """
+    图表图片缓存，以图表类型、关键词、天数、输入数据和渲染版本的哈希作为文件名
+    
+    输入数据没有变化时直接返回已生成的图片，不再提交绘图任务；图表代码修改后
+    提高渲染版本，旧图片不再命中并随淘汰删除。超过max_age未被使用的图片删除，
+    总大小超过上限时按最近使用时间淘汰，使用时间记录在文件的mtime中。
+    """
+    
+    def __init__(self, images_dir: str, url_prefix: str = "/static/images", renderer_version: int = 1,
+                 max_bytes: int = 64 * 1024 * 1024, max_age: float = 7 * 24 * 3600, evict_interval: float = 300.0):
+        """
+        初始化图表缓存
+        
+        Args:
+            images_dir: 图片目录
+            url_prefix: 图片目录对应的URL前缀
+            renderer_version: 渲染版本，图表样式修改后递增
+            max_bytes: 图片总大小上限（字节）
+            max_age: 图片未被使用的最长保留时间（秒）
+            evict_interval: 两次淘汰检查的最短间隔（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.images_dir = images_dir
+        self.url_prefix = url_prefix
+        self.renderer_version = renderer_version
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        self._stats = {"hit": 0, "miss": 0, "evicted": 0}
+        # 正在绘制的图片文件名到结果的字典
+        self._pending: Dict[str, Future] = {}
+        
+        os.makedirs(images_dir, exist_ok=True)
+    
+    def key(self, chart_type: str, keyword: str, days: Optional[int], data: Any) -> str:
+        """
+        计算图表的缓存键
+        
+        Args:
+            chart_type: 图表类型
+            keyword: 关键词
+            days: 天数，图表与天数无关时为None
+            data: 绘图用的输入数据，需可序列化为JSON
+        
+        Returns:
+            缓存键
+        """
+        payload = json.dumps([chart_type, keyword, days, data, self.renderer_version],
+                             ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get_or_submit(self, chart_type: str, keyword: str, days: Optional[int], data: Any,
+                      submit: Callable[[str], Future]) -> Future:
+        """
+        获取图表图片，没有缓存时调用submit提交绘图任务
+        
+        同一图表正在绘制时直接返回进行中的任务，不重复绘制。
+        
+        Args:
+            chart_type: 图表类型，作为文件名前缀
+            keyword: 关键词
+            days: 天数，图表与天数无关时为None
+            data: 绘图用的输入数据
+            submit: 提交绘图任务的函数，参数为图片保存路径，返回绘图完成时结束的Future
+        
+        Returns:
+            结果为图片URL的Future，绘图失败时包含异常
+        """
+        filename = f"{chart_type}_{self.key(chart_type, keyword, days, data)}.png"
+        path = os.path.join(self.images_dir, filename)
+        url = f"{self.url_prefix}/{filename}"
+        result: Future = Future()
+        try:
+            os.utime(path)
+            with self._lock:
+                self._stats["hit"] += 1
+            result.set_result(url)
+            return result
+        except FileNotFoundError:
+            pass
+        
+        with self._lock:
+            pending = self._pending.get(filename)
+            if pending is not None:
+                self._stats["hit"] += 1
+                return pending
+            self._pending[filename] = result
+            self._stats["miss"] += 1
+        
+        # 先写临时文件再替换，并发请求不会读到不完整的图片
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.png"
+        
+        def rendered(future: Future) -> None:
+            try:
+                future.result()
+                os.replace(tmp_path, path)
+                result.set_result(url)
+            except Exception as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                result.set_exception(e)
+            finally:
+                with self._lock:
+                    self._pending.pop(filename, None)
+            self.evict()
+        
+        try:
+            submit(tmp_path).add_done_callback(rendered)
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(filename, None)
+            result.set_exception(e)
+        return result
+    
+    def evict(self, force: bool = False) -> int:
+        """
+        删除过期的图片，并按最近使用时间淘汰直到总大小不超过上限
+        
+        Args:
+            force: 是否忽略淘汰检查的最短间隔
+        
+        Returns:
+            删除的图片数
+        """
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_evict < self.evict_interval:
+                return 0
+            self._last_evict = now
+        
+        files = []
+        for entry in os.scandir(self.images_dir):
+            if entry.is_file() and CACHED_IMAGE_PATTERN.match(entry.name):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        
+        total_bytes = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            if now - mtime <= self.max_age and total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        
+        if removed:
+            with self._lock:
+                self._stats["evicted"] += removed
+            self.logger.info(f"已删除 {removed} 张过期的图表图片")
+        return removed
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+        
+        Returns:
+            包含命中、未命中和淘汰次数的字典
+        """
+        with self._lock:
+            return dict(self._stats)
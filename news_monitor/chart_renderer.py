@@ -0,0 +1,254 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from wordcloud import WordCloud
+
+# 饼图和互动数据图依次使用的颜色
+CHART_COLORS = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
+
+
+def new_figure(figsize: tuple) -> Figure:
+    """
+    创建使用Agg后端的图表，不经过pyplot的全局状态，可在多个线程或进程中同时绘制
+    
+    Args:
+        figsize: 图表尺寸（英寸）
+    
+    Returns:
+        图表
+    """
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def add_bar_labels(ax: Any, bars: Any) -> None:
+    """
+    在柱状图的每个柱子上方标注数值
+    
+    Args:
+        ax: 坐标轴
+        bars: 柱子列表
+    """
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                f'{int(height)}',
+                ha='center', va='bottom')
+
+
+def render_trend_chart(path: str, keyword: str, dates: List[str], counts: List[int]) -> None:
+    """
+    绘制热度趋势图
+    
+    Args:
+        path: 图片保存路径
+        keyword: 关键词
+        dates: 日期列表
+        counts: 每天的新闻数量
+    """
+    figure = new_figure((10, 6))
+    ax = figure.add_subplot()
+    ax.plot(dates, counts, marker='o', linestyle='-', color='#3498db', linewidth=2)
+    ax.fill_between(dates, counts, color='#3498db', alpha=0.2)
+    
+    ax.set_title(f"关键词 '{keyword}' 的热度趋势", fontsize=16)
+    ax.set_xlabel("日期", fontsize=12)
+    ax.set_ylabel("新闻数量", fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def render_tag_chart(path: str, keyword: str, tags: List[str], counts: List[int]) -> None:
+    """
+    绘制标签分布图
+    
+    Args:
+        path: 图片保存路径
+        keyword: 关键词
+        tags: 标签列表
+        counts: 各标签的数量
+    """
+    figure = new_figure((10, 6))
+    ax = figure.add_subplot()
+    add_bar_labels(ax, ax.bar(tags, counts, color='#2ecc71'))
+    
+    ax.set_title(f"关键词 '{keyword}' 的标签分布", fontsize=16)
+    ax.set_xlabel("标签", fontsize=12)
+    ax.set_ylabel("数量", fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def render_wordcloud(path: str, frequencies: Dict[str, int]) -> None:
+    """
+    按词频绘制词云
+    
+    Args:
+        path: 图片保存路径
+        frequencies: 词到出现次数的字典
+    """
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        max_words=100,
+        max_font_size=150,
+        random_state=42
+    ).generate_from_frequencies(frequencies)
+    
+    figure = new_figure((10, 6))
+    ax = figure.add_subplot()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis("off")
+    figure.savefig(path)
+
+
+def render_pie_chart(path: str, title: str, labels: List[str], sizes: List[int], colors: List[str]) -> None:
+    """
+    绘制饼图
+    
+    Args:
+        path: 图片保存路径
+        title: 标题
+        labels: 各部分的名称
+        sizes: 各部分的数量
+        colors: 各部分的颜色
+    """
+    figure = new_figure((8, 8))
+    ax = figure.add_subplot()
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90, shadow=True)
+    ax.axis('equal')
+    ax.set_title(title, fontsize=16)
+    figure.savefig(path)
+
+
+def render_interaction_chart(path: str, keyword: str, labels: List[str], values: List[int]) -> None:
+    """
+    绘制互动数据图
+    
+    Args:
+        path: 图片保存路径
+        keyword: 关键词
+        labels: 互动类型列表
+        values: 各类互动的数量
+    """
+    figure = new_figure((10, 6))
+    ax = figure.add_subplot()
+    add_bar_labels(ax, ax.bar(labels, values, color=CHART_COLORS))
+    
+    ax.set_title(f"关键词 '{keyword}' 的互动数据", fontsize=16)
+    ax.set_xlabel("互动类型", fontsize=12)
+    ax.set_ylabel("数量", fontsize=12)
+    ax.set_ylim(0, max(values) * 1.2)
+    
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def warm_up() -> int:
+    """
+    空任务，用于提前启动渲染进程
+    
+    Returns:
+        进程ID
+    """
+    return os.getpid()
+
+
+class ChartRenderer:
+    """
+    图表渲染服务，在进程池中并行绘制图表
+    
+    绘图函数都使用Figure对象和Agg后端，互不共享状态。支持fork的系统上用fork启动
+    渲染进程，子进程直接继承已导入的matplotlib；进程池在服务启动时通过start
+    一次性创建，避免在请求处理线程繁忙时fork。不支持fork的系统上使用spawn，
+    渲染进程会重新导入启动脚本。processes为0时在调用线程中直接绘制。
+    """
+    
+    def __init__(self, processes: Optional[int] = None):
+        """
+        初始化渲染服务
+        
+        Args:
+            processes: 渲染进程数，默认为CPU核数，最多6个（每次分析的图表数）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.processes = min(6, os.cpu_count() or 1) if processes is None else processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        """
+        获取进程池，首次调用时创建
+        
+        Returns:
+            进程池
+        """
+        with self._lock:
+            if self._executor is None:
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context(method)
+                )
+            return self._executor
+    
+    def start(self) -> None:
+        """
+        启动所有渲染进程
+        """
+        if self.processes > 0:
+            for future in [self._pool().submit(warm_up) for _ in range(self.processes)]:
+                future.result()
+            self.logger.info(f"已启动 {self.processes} 个图表渲染进程")
+    
+    def submit(self, render: Callable[..., None], path: str, *args) -> Future:
+        """
+        提交一个绘图任务
+        
+        Args:
+            render: 模块级的绘图函数，第一个参数为图片保存路径
+            path: 图片保存路径
+            *args: 绘图函数的其他参数
+        
+        Returns:
+            绘图完成时结束的Future，绘图失败时包含异常
+        """
+        if self.processes <= 0:
+            future: Future = Future()
+            try:
+                render(path, *args)
+                future.set_result(path)
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        try:
+            return self._pool().submit(render, path, *args)
+        except BrokenProcessPool:
+            # 渲染进程异常退出后进程池不再可用，重建一次
+            self.logger.warning("图表渲染进程池已损坏，重新创建")
+            with self._lock:
+                self._executor = None
+            return self._pool().submit(render, path, *args)
+    
+    def shutdown(self) -> None:
+        """
+        关闭进程池
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,299 @@
+import json
+import time
+import random
+import socket
+import hashlib
+import logging
+import zipfile
+import threading
+from functools import partial
+from urllib.parse import quote, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from crawler_runtime import CrawlerRuntime
+from rate_limiter import HostRateLimiter
+
+# 页面来源：requests直接抓取的HTTP响应、浏览器渲染后的页面源码
+SOURCE_HTTP = "http"
+SOURCE_BROWSER = "browser"
+
+
+class FixtureArchive:
+    """
+    抓取录制存档，一个zip文件，包含index.json和压缩保存的页面正文
+    
+    index.json记录每个页面的来源、URL、状态码和Content-Type，以及录制时执行的搜索，
+    回放时按相同的关键词和平台重新执行。同一来源同一URL只保留最后一次录制的内容。
+    """
+    
+    def __init__(self, path: str):
+        """
+        初始化存档
+        
+        Args:
+            path: 存档文件路径
+        """
+        self.path = path
+        self.pages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.searches: List[Dict[str, Any]] = []
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, source: str, url: str, status: int, content_type: str, body: bytes) -> None:
+        """
+        添加一个页面
+        
+        Args:
+            source: 页面来源，http或browser
+            url: 原始URL
+            status: HTTP状态码
+            content_type: Content-Type
+            body: 页面正文
+        """
+        name = f"pages/{hashlib.sha1(f'{source} {url}'.encode('utf-8')).hexdigest()}"
+        with self._lock:
+            self.pages[(source, url)] = {
+                "source": source, "url": url, "status": status, "content_type": content_type, "file": name
+            }
+            self._bodies[name] = body
+    
+    def add_search(self, platform_type: str, keyword: str, limit: int) -> None:
+        """
+        记录一次录制的搜索
+        
+        Args:
+            platform_type: 平台类型
+            keyword: 关键词
+            limit: 结果数量限制
+        """
+        with self._lock:
+            self.searches.append({"platform_type": platform_type, "keyword": keyword, "limit": limit})
+    
+    def get(self, source: str, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        获取页面
+        
+        Args:
+            source: 页面来源
+            url: 原始URL
+        
+        Returns:
+            (页面信息, 正文)，未录制时返回None
+        """
+        page = self.pages.get((source, url))
+        if page is None:
+            return None
+        return page, self._bodies[page["file"]]
+    
+    def save(self) -> None:
+        """
+        写入存档文件
+        """
+        with self._lock, zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("index.json", json.dumps(
+                {"pages": list(self.pages.values()), "searches": self.searches}, ensure_ascii=False, indent=2
+            ))
+            for page in self.pages.values():
+                archive.writestr(page["file"], self._bodies[page["file"]])
+    
+    @classmethod
+    def load(cls, path: str) -> "FixtureArchive":
+        """
+        读取存档文件，页面正文全部解压到内存，回放时不再读文件
+        
+        Args:
+            path: 存档文件路径
+        
+        Returns:
+            存档
+        """
+        fixtures = cls(path)
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read("index.json"))
+            for page in index["pages"]:
+                fixtures.pages[(page["source"], page["url"])] = page
+                fixtures._bodies[page["file"]] = archive.read(page["file"])
+        fixtures.searches = index.get("searches", [])
+        return fixtures
+
+
+class DriverProxy:
+    """
+    浏览器驱动代理，拦截get方法，其余属性和方法转发给实际的驱动
+    """
+    
+    def __init__(self, driver: Any):
+        self._driver = driver
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._driver, name)
+
+
+class RecordingDriver(DriverProxy):
+    """
+    录制用的浏览器驱动，每次打开页面后保存渲染后的页面源码
+    """
+    
+    def __init__(self, driver: Any, fixtures: FixtureArchive):
+        super().__init__(driver)
+        self._fixtures = fixtures
+    
+    def get(self, url: str) -> None:
+        self._driver.get(url)
+        self._fixtures.add(SOURCE_BROWSER, url, 200, "text/html; charset=utf-8", self._driver.page_source.encode("utf-8"))
+
+
+class ReplayDriver(DriverProxy):
+    """
+    回放用的浏览器驱动，将页面地址改写到回放服务器
+    """
+    
+    def __init__(self, driver: Any, base_url: str):
+        super().__init__(driver)
+        self._base_url = base_url
+    
+    def get(self, url: str) -> None:
+        self._driver.get(replay_url(self._base_url, SOURCE_BROWSER, url))
+
+
+def replay_url(base_url: str, source: str, url: str) -> str:
+    """
+    将原始URL改写为回放服务器上的地址
+    
+    Args:
+        base_url: 回放服务器地址
+        source: 页面来源
+        url: 原始URL
+    
+    Returns:
+        回放地址
+    """
+    return f"{base_url}/{source}/{quote(url, safe='')}"
+
+
+class RecordingRuntime(CrawlerRuntime):
+    """
+    录制用的爬虫运行时，正常访问站点，并保存每个HTTP响应和浏览器页面源码
+    
+    录制时不使用响应缓存，保证存档中是完整的页面。
+    """
+    
+    def __init__(self, fixtures: FixtureArchive, **kwargs):
+        """
+        初始化录制运行时
+        
+        Args:
+            fixtures: 存档
+            **kwargs: CrawlerRuntime的其他参数
+        """
+        kwargs["response_cache"] = None
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+    
+    def create_driver(self) -> Any:
+        return RecordingDriver(super().create_driver(), self.fixtures)
+    
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]], priority: int, **kwargs) -> requests.Response:
+        response = super()._fetch(url, headers, priority, **kwargs)
+        self.fixtures.add(SOURCE_HTTP, url, response.status_code, response.headers.get("Content-Type", ""),
+                          response.content)
+        return response
+
+
+class ReplayRuntime(CrawlerRuntime):
+    """
+    回放用的爬虫运行时，所有请求改写到本地回放服务器，不限速也不使用响应缓存
+    """
+    
+    def __init__(self, base_url: str, **kwargs):
+        """
+        初始化回放运行时
+        
+        Args:
+            base_url: 回放服务器地址
+            **kwargs: CrawlerRuntime的其他参数
+        """
+        kwargs["response_cache"] = None
+        kwargs.setdefault("rate_limiter", HostRateLimiter(default_rate=1e6, default_burst=1000))
+        super().__init__(**kwargs)
+        self.base_url = base_url
+    
+    def create_driver(self) -> Any:
+        return ReplayDriver(super().create_driver(), self.base_url)
+    
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]], priority: int, **kwargs) -> requests.Response:
+        return super()._fetch(replay_url(self.base_url, SOURCE_HTTP, url), headers, priority, **kwargs)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    回放服务器的请求处理器，按路径中的来源和原始URL返回录制的页面，响应前按配置的延迟等待
+    """
+    
+    protocol_version = "HTTP/1.1"
+    
+    def __init__(self, *args, fixtures: FixtureArchive, latency: float, jitter: float, **kwargs):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        super().__init__(*args, **kwargs)
+    
+    def setup(self):
+        # 响应头和正文分两次写出，关闭Nagle算法避免与延迟确认叠加产生额外等待
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().setup()
+    
+    def do_GET(self):
+        source, _, quoted = self.path.lstrip("/").partition("/")
+        page = self.fixtures.get(source, unquote(quoted))
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        
+        if page is None:
+            status, content_type, body = 404, "text/plain; charset=utf-8", b"not recorded"
+        else:
+            status, content_type, body = page[0]["status"], page[0]["content_type"], page[1]
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """
+    本地回放服务器，在后台线程中提供录制的页面
+    """
+    
+    def __init__(self, fixtures: FixtureArchive, latency: float = 0.0, jitter: float = 0.0):
+        """
+        初始化回放服务器
+        
+        Args:
+            fixtures: 存档
+            latency: 每个响应的平均延迟（秒）
+            jitter: 延迟的随机浮动范围（秒），实际延迟在latency±jitter内均匀分布
+        """
+        self.logger = logging.getLogger(__name__)
+        handler = partial(ReplayHandler, fixtures=fixtures, latency=latency, jitter=jitter)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    def __enter__(self) -> "ReplayServer":
+        self._thread.start()
+        self.logger.info(f"回放服务器已启动: {self.base_url}")
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
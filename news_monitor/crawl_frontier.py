@@ -0,0 +1,310 @@
+import time
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from storage import FileStorage
+from news_index import url_fingerprint
+
+# 抓取状态：已发现待抓取、已抓取、抓取失败
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# 参与内容哈希的字段，点赞数等互动数据每次抓取都会变化，不计入
+CONTENT_HASH_FIELDS = ("title", "content", "publish_time", "author")
+
+
+def content_hash(news_info: Dict[str, Any]) -> str:
+    """
+    计算新闻内容哈希，用于判断重新抓取时内容是否变化
+    
+    Args:
+        news_info: 详情页提取的新闻信息
+    
+    Returns:
+        16位十六进制哈希
+    """
+    content = json.dumps([news_info.get(field) for field in CONTENT_HASH_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class CrawlFrontier:
+    """
+    持久化的抓取边界，记录每个文章URL的抓取状态、上次抓取时间、内容哈希和下次到期时间
+    
+    搜索结果在提取详情前先登记为待抓取，提取完成后标记为已抓取，中断的抓取下次从
+    待抓取的URL继续。已抓取的文章到期前不再重复请求；到期后重新抓取，内容未变化时
+    刷新间隔翻倍，变化时恢复为初始间隔。
+    
+    每次状态变化追加一条完整记录，读取时同一URL以最后一条为准，
+    过期记录超过有效记录数时整体重写。Web服务和入库进程共用同一存储，每次读取前
+    检查存储是否被写入，其他进程追加的记录补充到内存，存储被重写时整体重新加载。
+    """
+    
+    def __init__(self, storage: FileStorage, collection: str = "crawl_frontier",
+                 refresh_interval: int = 6 * 3600, max_refresh_interval: int = 7 * 24 * 3600,
+                 retry_interval: int = 600, max_failures: int = 3):
+        """
+        初始化抓取边界
+        
+        Args:
+            storage: 文件存储，collection应声明为日志集合
+            collection: 集合名称
+            refresh_interval: 文章首次抓取后重新抓取的间隔（秒）
+            max_refresh_interval: 内容持续不变时重新抓取间隔的上限（秒）
+            retry_interval: 抓取失败后重试的间隔（秒）
+            max_failures: 连续失败达到该次数后不再重试
+        """
+        self.logger = logging.getLogger(__name__)
+        self.storage = storage
+        self.collection = collection
+        self.refresh_interval = refresh_interval
+        self.max_refresh_interval = max_refresh_interval
+        self.retry_interval = retry_interval
+        self.max_failures = max_failures
+        self._lock = threading.RLock()
+        # URL指纹到最新记录的字典，首次使用时从存储加载
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        # 上次加载的存储数据及已应用的记录数，用于发现其他进程写入的记录
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._applied = 0
+        # 尚未写入存储的记录
+        self._dirty: List[Dict[str, Any]] = []
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        加载所有URL的最新记录，与存储同步，过期记录过多时压缩存储
+        
+        存储数据只被追加时只应用新增的记录，被重写（压缩）时重新加载；
+        尚未写入存储的记录始终优先。
+        
+        Returns:
+            URL指纹到记录的字典
+        """
+        with self.storage.lock(self.collection):
+            entries = self.storage.load_json(self.collection, [])
+            if self._records is not None and entries is self._entries and len(entries) == self._applied:
+                return self._records
+            
+            if self._records is None or entries is not self._entries or len(entries) < self._applied:
+                self._records = {}
+                self._applied = 0
+            for entry in entries[self._applied:]:
+                self._records[entry["fingerprint"]] = entry
+            reloaded = self._applied == 0
+            
+            if reloaded and len(entries) > 2 * len(self._records) + 1000:
+                self.storage.save_json(self.collection, list(self._records.values()))
+                entries = self.storage.load_json(self.collection, [])
+            self._entries = entries
+            self._applied = len(entries)
+        
+        for record in self._dirty:
+            self._records[record["fingerprint"]] = record
+        if reloaded:
+            self.logger.info(f"已加载抓取边界，共 {len(self._records)} 个URL")
+        return self._records
+    
+    def _put(self, record: Dict[str, Any]) -> None:
+        """
+        更新一条记录，等待flush写入存储
+        
+        Args:
+            record: 完整记录
+        """
+        self._load()[record["fingerprint"]] = record
+        self._dirty.append(record)
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        获取URL的抓取记录
+        
+        Args:
+            url: 文章URL
+        
+        Returns:
+            抓取记录，未记录过时返回None
+        """
+        with self._lock:
+            return self._load().get(url_fingerprint(url))
+    
+    def should_fetch(self, url: str, now: Optional[float] = None) -> bool:
+        """
+        判断URL是否需要抓取
+        
+        未记录过或仍处于待抓取状态的URL需要抓取；已抓取和失败的URL到期后才重新抓取，
+        连续失败次数达到上限的URL不再抓取。
+        
+        Args:
+            url: 文章URL
+            now: 当前时间戳，默认取当前时间
+        
+        Returns:
+            是否需要抓取
+        """
+        return self._is_due(self.get(url), time.time() if now is None else now)
+    
+    def _is_due(self, record: Optional[Dict[str, Any]], now: float) -> bool:
+        """
+        判断抓取记录对应的URL是否需要抓取
+        
+        Args:
+            record: 抓取记录，未记录过时为None
+            now: 当前时间戳
+        
+        Returns:
+            是否需要抓取
+        """
+        if record is None or record["status"] == STATUS_PENDING:
+            return True
+        if record["status"] == STATUS_FAILED and record.get("failures", 0) >= self.max_failures:
+            return False
+        return now >= record.get("next_due", 0)
+    
+    def add_pending(self, platform_type: str, keyword: str, items: List[Dict[str, Any]]) -> None:
+        """
+        将搜索结果登记为待抓取，并立即写入存储，抓取中断后可以继续
+        
+        Args:
+            platform_type: 平台类型
+            keyword: 搜索关键词
+            items: 搜索结果列表，每项包含url字段
+        """
+        with self._lock:
+            records = self._load()
+            for item in items:
+                fingerprint = url_fingerprint(item["url"])
+                record = dict(records.get(fingerprint) or {"fingerprint": fingerprint, "url": item["url"]})
+                if record.get("status") == STATUS_PENDING:
+                    continue
+                # 保存搜索结果，续抓时不需要重新搜索
+                record.update(status=STATUS_PENDING, platform_type=platform_type, keyword=keyword, item=item)
+                self._put(record)
+            self.flush()
+    
+    def pending(self, platform_type: str, keyword: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取上次未完成的待抓取搜索结果
+        
+        Args:
+            platform_type: 平台类型
+            keyword: 搜索关键词，为None时不按关键词过滤
+        
+        Returns:
+            搜索结果列表
+        """
+        with self._lock:
+            return [
+                record["item"] for record in self._load().values()
+                if record["status"] == STATUS_PENDING and record.get("platform_type") == platform_type
+                and (keyword is None or record.get("keyword") == keyword) and record.get("item")
+            ]
+    
+    def plan(self, platform_type: str, keyword: str, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        根据抓取记录确定需要提取详情的文章，并登记为待抓取
+        
+        Args:
+            platform_type: 平台类型
+            keyword: 关键词
+            search_results: 本次搜索结果
+        
+        Returns:
+            需要提取详情的搜索结果，包括上次中断时未提取的文章
+        """
+        with self._lock:
+            now = time.time()
+            planned: Dict[str, Dict[str, Any]] = {}
+            for item in search_results + self.pending(platform_type, keyword):
+                # pending已与存储同步，逐条判断时直接读取内存中的记录
+                if item["url"] not in planned and self._is_due(self._records.get(url_fingerprint(item["url"])), now):
+                    planned[item["url"]] = item
+            
+            skipped = len({item["url"] for item in search_results} - set(planned))
+            if skipped:
+                self.logger.info(f"{platform_type} 平台关键词 {keyword} 有 {skipped} 篇文章未到重新抓取时间，已跳过")
+            self.add_pending(platform_type, keyword, list(planned.values()))
+            return list(planned.values())
+    
+    def mark_done(self, url: str, news_info: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        标记URL已抓取，并按内容是否变化安排下次抓取时间
+        
+        Args:
+            url: 文章URL
+            news_info: 详情页提取的新闻信息
+            now: 当前时间戳，默认取当前时间
+        
+        Returns:
+            内容与上次抓取相比是否变化，首次抓取时为True
+        """
+        now = time.time() if now is None else now
+        digest = content_hash(news_info)
+        with self._lock:
+            fingerprint = url_fingerprint(url)
+            previous = self._load().get(fingerprint) or {}
+            changed = previous.get("content_hash") != digest
+            if changed or not previous.get("interval"):
+                interval = self.refresh_interval
+            else:
+                interval = min(self.max_refresh_interval, previous["interval"] * 2)
+            
+            record = {key: value for key, value in previous.items() if key != "item"}
+            record.update(
+                fingerprint=fingerprint, url=url, status=STATUS_DONE, fetched_at=int(now),
+                content_hash=digest, interval=interval, next_due=int(now + interval), failures=0
+            )
+            self._put(record)
+            return changed
+    
+    def mark_failed(self, url: str, now: Optional[float] = None) -> None:
+        """
+        标记URL抓取失败，间隔retry_interval后重试
+        
+        Args:
+            url: 文章URL
+            now: 当前时间戳，默认取当前时间
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            fingerprint = url_fingerprint(url)
+            previous = self._load().get(fingerprint) or {}
+            record = {key: value for key, value in previous.items() if key != "item"}
+            record.update(
+                fingerprint=fingerprint, url=url, status=STATUS_FAILED,
+                failures=previous.get("failures", 0) + 1, next_due=int(now + self.retry_interval)
+            )
+            self._put(record)
+    
+    def flush(self) -> bool:
+        """
+        将尚未保存的记录追加写入存储
+        
+        Returns:
+            是否写入成功
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            dirty, self._dirty = self._dirty, []
+            if self.storage.extend_json(self.collection, dirty):
+                return True
+            # 写入失败时保留记录，下次flush重试
+            self._dirty = dirty + self._dirty
+            return False
+    
+    def get_summary(self) -> Dict[str, int]:
+        """
+        获取各抓取状态的URL数量
+        
+        Returns:
+            状态到URL数量的字典
+        """
+        with self._lock:
+            summary = {STATUS_PENDING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+            for record in self._load().values():
+                summary[record["status"]] = summary.get(record["status"], 0) + 1
+            return summary
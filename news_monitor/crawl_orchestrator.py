@@ -0,0 +1,225 @@
+import time
+import asyncio
+import logging
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, AsyncIterator
+
+from news_scraper import BaseCrawler
+from news_index import url_fingerprint
+from crawl_frontier import CrawlFrontier, content_hash
+
+
+def merge_news(search_item: Dict[str, Any], news_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并搜索结果和详情页提取的新闻信息，详情页中的非空字段优先，并记录详情的内容哈希，
+    重新抓取后保存时据此判断正文是否变化
+    
+    Args:
+        search_item: 搜索结果
+        news_info: 新闻信息，提取失败时为None
+    
+    Returns:
+        新闻数据
+    """
+    news = dict(search_item)
+    if news_info:
+        news.update({key: value for key, value in news_info.items() if value not in (None, "", [])})
+        news["content_hash"] = content_hash(news_info)
+    
+    # 新闻ID由URL指纹决定，重复抓取同一新闻时ID不变
+    news.setdefault("id", f"news_{news.get('platform_type', '')}_{url_fingerprint(news['url'])}")
+    news.setdefault("crawl_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    return news
+
+
+class CrawlOrchestrator:
+    """
+    抓取调度器，并发执行多个平台的关键词搜索和新闻详情提取
+    
+    爬虫方法都是阻塞调用，按是否使用Selenium分别放入两个线程池执行，
+    事件循环只负责调度，不会被单个慢速平台阻塞。并发数受全局上限和
+    单个域名上限共同限制，整次抓取超过截止时间后返回已完成的结果。
+    
+    配置了抓取边界时，搜索结果中未到期的文章不再提取详情，
+    上次同一关键词中断时未提取的文章在本次一并提取。
+    """
+    
+    def __init__(self, crawlers: Dict[str, BaseCrawler], max_concurrency: int = 16,
+                 per_host_concurrency: int = 4, selenium_workers: int = 2, deadline: float = 60.0,
+                 frontier: Optional[CrawlFrontier] = None):
+        """
+        初始化抓取调度器
+        
+        Args:
+            crawlers: 平台类型到爬虫的字典
+            max_concurrency: 全局同时进行的请求数上限
+            per_host_concurrency: 单个域名同时进行的请求数上限
+            selenium_workers: Selenium线程池大小，每个线程同时只驱动一个浏览器
+            deadline: 单次抓取的截止时间（秒）
+            frontier: 抓取边界，为None时每次抓取全部搜索结果
+        """
+        self.logger = logging.getLogger(__name__)
+        self.crawlers = crawlers
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.deadline = deadline
+        self.frontier = frontier
+        self._http_pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crawl-http")
+        self._selenium_pool = ThreadPoolExecutor(max_workers=selenium_workers, thread_name_prefix="crawl-selenium")
+    
+    def shutdown(self) -> None:
+        """
+        关闭线程池，不等待仍在执行的请求
+        """
+        self._http_pool.shutdown(wait=False)
+        self._selenium_pool.shutdown(wait=False)
+    
+    async def crawl(self, keyword: str, platform_types: List[str], limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        并发抓取多个平台的关键词新闻
+        
+        Args:
+            keyword: 关键词
+            platform_types: 平台类型列表
+            limit: 每个平台的结果数量限制
+        
+        Returns:
+            平台类型到新闻列表的字典，超时未完成的平台只包含已提取的新闻，
+            搜索未完成或没有结果的平台不在字典中；搜索结果都未到重新抓取时间时对应列表为空
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        
+        def collect(event: Dict[str, Any]) -> None:
+            if event["event"] == "platform" and event["status"] == "extracting":
+                results.setdefault(event["platform_type"], [])
+            elif event["event"] == "news":
+                results.setdefault(event["platform_type"], []).append(event["news"])
+        
+        await self.execute(keyword, platform_types, limit, collect)
+        return results
+    
+    async def stream(self, keyword: str, platform_types: List[str], limit: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        并发抓取多个平台的关键词新闻，每提取一条新闻立即产出，不在内存中累积结果
+        
+        迭代提前结束（如客户端断开）时取消尚未完成的抓取。
+        
+        Args:
+            keyword: 关键词
+            platform_types: 平台类型列表
+            limit: 每个平台的结果数量限制
+        
+        Yields:
+            抓取事件，格式见execute方法
+        """
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        task = asyncio.ensure_future(self.execute(keyword, platform_types, limit, queue.put_nowait))
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["event"] == "done":
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    async def execute(self, keyword: str, platform_types: List[str], limit: int,
+                      emit: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        并发抓取多个平台的关键词新闻，抓取过程以事件形式通知调用方
+        
+        事件均包含event字段：
+        - platform: 平台状态变化，status为searching、extracting（附total和skipped）、
+          empty（搜索没有结果）、done（附count）或timeout
+        - news: 提取完成的一条新闻，附platform_type和news
+        - done: 整次抓取结束，附total_count和elapsed，总是最后一个事件
+        
+        Args:
+            keyword: 关键词
+            platform_types: 平台类型列表
+            limit: 每个平台的结果数量限制
+            emit: 事件回调，在事件循环线程中调用
+        """
+        # 信号量绑定当前事件循环，每次抓取单独创建
+        global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        counts: Dict[str, int] = {}
+        
+        async def run(crawler: BaseCrawler, method: str, url: str, *args):
+            host = urlparse(url).netloc
+            host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+            # 先占用域名配额再占用全局配额，避免等待同一域名时占住全局名额
+            async with host_semaphore:
+                async with global_semaphore:
+                    pool = self._selenium_pool if method in crawler.selenium_methods else self._http_pool
+                    func: Callable = getattr(crawler, method)
+                    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        
+        async def crawl_platform(platform_type: str, crawler: BaseCrawler):
+            emit({"event": "platform", "platform_type": platform_type, "status": "searching"})
+            search_results = await run(crawler, "search_keyword", crawler.search_url, keyword, limit)
+            if not search_results:
+                emit({"event": "platform", "platform_type": platform_type, "status": "empty"})
+                return
+            
+            planned = search_results
+            if self.frontier is not None:
+                planned = await asyncio.get_running_loop().run_in_executor(
+                    self._http_pool, self.frontier.plan, platform_type, keyword, search_results
+                )
+            counts[platform_type] = 0
+            emit({
+                "event": "platform", "platform_type": platform_type, "status": "extracting",
+                "total": len(planned), "skipped": len(search_results) - len(planned)
+            })
+            
+            async def extract(search_item: Dict[str, Any]):
+                news_info = await run(crawler, "extract_news_info", search_item["url"], search_item["url"])
+                counts[platform_type] += 1
+                emit({"event": "news", "platform_type": platform_type, "news": merge_news(search_item, news_info)})
+                if self.frontier is not None:
+                    # 标记会加载抓取边界并持有线程锁，与plan一样放到线程池中执行
+                    if news_info:
+                        mark, args = self.frontier.mark_done, (search_item["url"], news_info)
+                    else:
+                        mark, args = self.frontier.mark_failed, (search_item["url"],)
+                    await asyncio.get_running_loop().run_in_executor(self._http_pool, mark, *args)
+            
+            await asyncio.gather(*(extract(item) for item in planned))
+            emit({"event": "platform", "platform_type": platform_type, "status": "done", "count": counts[platform_type]})
+        
+        start = time.perf_counter()
+        tasks = {}
+        for platform_type in platform_types:
+            crawler = self.crawlers.get(platform_type)
+            if not crawler:
+                self.logger.warning(f"未找到平台类型 {platform_type} 的爬虫")
+                continue
+            tasks[asyncio.ensure_future(crawl_platform(platform_type, crawler))] = platform_type
+        
+        try:
+            if tasks:
+                done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+                for task in pending:
+                    task.cancel()
+                    emit({"event": "platform", "platform_type": tasks[task], "status": "timeout"})
+                # 已提交到线程池的请求无法中断，会在后台执行完毕后丢弃结果
+                if pending:
+                    self.logger.warning(f"抓取关键词 {keyword} 超过截止时间 {self.deadline} 秒，{len(pending)} 个平台未完成")
+                for task in done:
+                    if task.exception():
+                        self.logger.error(f"抓取关键词 {keyword} 时发生错误: {str(task.exception())}")
+        finally:
+            # 调用方取消抓取时同样取消各平台任务
+            for task in tasks:
+                task.cancel()
+            if self.frontier is not None:
+                # 整次抓取的标记一次写入存储，写入时持有文件锁，同样不在事件循环中执行
+                await asyncio.get_running_loop().run_in_executor(self._http_pool, self.frontier.flush)
+        
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"抓取关键词 {keyword} 完成，耗时 {elapsed:.2f} 秒")
+        emit({"event": "done", "total_count": sum(counts.values()), "elapsed": round(elapsed, 2)})
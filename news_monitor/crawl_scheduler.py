@@ -0,0 +1,234 @@
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from storage import FileStorage
+from keywords_manager import KeywordsManager
+from data_manager import NewsDataManager
+from crawl_orchestrator import CrawlOrchestrator
+from job_queue import JobQueue
+
+
+class CrawlScheduler:
+    """
+    后台抓取调度器，按各关键词的抓取间隔定期抓取所有活跃关键词
+    
+    在应用的事件循环中运行，抓取和保存都不占用请求处理路径。关键词的抓取间隔
+    取其crawl_interval字段，未设置时使用默认间隔；每次的实际间隔在±jitter比例内
+    随机浮动，避免多个关键词总是同时抓取。同一关键词上一次抓取未结束时不会再次开始，
+    同时进行的抓取数不超过max_running。
+    
+    配置了任务队列时只为到期的关键词添加搜索任务，由worker.py的工作进程抓取和入库。
+    """
+    
+    def __init__(self, orchestrator: CrawlOrchestrator, keywords_manager: KeywordsManager,
+                 data_manager: NewsDataManager, storage: FileStorage, default_interval: int = 1800,
+                 jitter: float = 0.1, max_running: int = 2, limit_per_platform: int = 10,
+                 initial_delay: float = 30.0, tick: float = 5.0, job_queue: Optional[JobQueue] = None):
+        """
+        初始化后台抓取调度器
+        
+        Args:
+            orchestrator: 抓取调度器
+            keywords_manager: 关键词管理器
+            data_manager: 新闻数据管理器
+            storage: 文件存储，用于读取平台列表
+            default_interval: 未设置抓取间隔的关键词使用的间隔（秒）
+            jitter: 抓取间隔的随机浮动比例
+            max_running: 同时进行的关键词抓取数上限
+            limit_per_platform: 每个平台的结果数量限制
+            initial_delay: 启动后首次抓取的最长随机延迟（秒）
+            tick: 检查到期关键词的间隔（秒）
+            job_queue: 任务队列，为None时在当前进程中抓取
+        """
+        self.logger = logging.getLogger(__name__)
+        self.orchestrator = orchestrator
+        self.keywords_manager = keywords_manager
+        self.data_manager = data_manager
+        self.storage = storage
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.max_running = max_running
+        self.limit_per_platform = limit_per_platform
+        self.initial_delay = initial_delay
+        self.tick = tick
+        self.job_queue = job_queue
+        # 关键词到调度状态的字典
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+    
+    def _interval(self, keyword_info: Dict[str, Any]) -> float:
+        """
+        计算关键词本次的抓取间隔
+        
+        Args:
+            keyword_info: 关键词信息
+        
+        Returns:
+            加入随机浮动后的间隔（秒）
+        """
+        interval = keyword_info.get("crawl_interval") or self.default_interval
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+    
+    def _active_platforms(self) -> List[str]:
+        """
+        获取有对应爬虫的活跃平台类型
+        
+        Returns:
+            平台类型列表
+        """
+        platforms = self.storage.load_json("platforms", [])
+        return [
+            p["type"] for p in platforms
+            if p.get("status") == "active" and p.get("type") in self.orchestrator.crawlers
+        ]
+    
+    def start(self) -> None:
+        """
+        在当前事件循环中启动调度
+        """
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._run())
+            self.logger.info("后台抓取调度已启动")
+    
+    async def stop(self) -> None:
+        """
+        停止调度并取消进行中的抓取
+        """
+        tasks = list(self._running.values())
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.logger.info("后台抓取调度已停止")
+    
+    async def _run(self) -> None:
+        """
+        调度循环，定期检查到期的关键词并启动抓取
+        """
+        while True:
+            try:
+                self._schedule()
+            except Exception as e:
+                self.logger.error(f"调度后台抓取时发生错误: {str(e)}")
+            await asyncio.sleep(self.tick)
+    
+    def _schedule(self) -> None:
+        """
+        同步活跃关键词列表，启动已到期且未在抓取中的关键词
+        """
+        now = time.time()
+        active = {k["keyword"]: k for k in self.keywords_manager.get_active_keywords() if k.get("keyword")}
+        
+        for keyword in list(self._states):
+            if keyword not in active and keyword not in self._running:
+                del self._states[keyword]
+        for keyword, keyword_info in active.items():
+            state = self._states.get(keyword)
+            if state is None:
+                self._states[keyword] = {
+                    "next_run": now + random.uniform(0, self.initial_delay),
+                    "interval": keyword_info.get("crawl_interval"),
+                    "last_start": None, "last_end": None, "last_duration": None,
+                    "last_count": None, "last_error": None, "runs": 0
+                }
+            elif state.get("interval") != keyword_info.get("crawl_interval"):
+                # 抓取间隔被修改后按新间隔重新安排
+                state["interval"] = keyword_info.get("crawl_interval")
+                if state["last_start"] is not None:
+                    state["next_run"] = state["last_start"] + self._interval(keyword_info)
+        
+        due = sorted(
+            (state["next_run"], keyword) for keyword, state in self._states.items()
+            if keyword not in self._running and state["next_run"] <= now
+        )
+        for _, keyword in due[:max(0, self.max_running - len(self._running))]:
+            self._running[keyword] = asyncio.ensure_future(self._crawl(active[keyword]))
+    
+    async def _crawl(self, keyword_info: Dict[str, Any]) -> None:
+        """
+        抓取一个关键词的所有活跃平台并保存结果
+        
+        Args:
+            keyword_info: 关键词信息
+        """
+        keyword = keyword_info["keyword"]
+        state = self._states[keyword]
+        state["last_start"] = time.time()
+        state["interval"] = keyword_info.get("crawl_interval")
+        try:
+            platform_types = self._active_platforms()
+            if self.job_queue is not None:
+                added = await asyncio.get_running_loop().run_in_executor(
+                    None, self.job_queue.enqueue_search, keyword, platform_types, self.limit_per_platform
+                )
+                state["last_count"] = added
+                state["last_error"] = None
+                self.logger.info(f"已为关键词 {keyword} 添加 {added} 个搜索任务")
+                return
+            results = await self.orchestrator.crawl(keyword, platform_types, self.limit_per_platform)
+            news_items = [news for items in results.values() for news in items]
+            # 保存时需要更新索引和统计，放到线程池中执行
+            await asyncio.get_running_loop().run_in_executor(None, self.data_manager.save_news, news_items)
+            state["last_count"] = len(news_items)
+            state["last_error"] = None
+            self.logger.info(f"后台抓取关键词 {keyword} 完成，共 {len(news_items)} 条新闻")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state["last_error"] = str(e)
+            self.logger.error(f"后台抓取关键词 {keyword} 时发生错误: {str(e)}")
+        finally:
+            state["last_end"] = time.time()
+            state["last_duration"] = round(state["last_end"] - state["last_start"], 2)
+            state["runs"] += 1
+            state["next_run"] = state["last_start"] + self._interval(keyword_info)
+            self._running.pop(keyword, None)
+    
+    def is_running(self, keyword: str) -> bool:
+        """
+        判断关键词是否正在后台抓取
+        
+        Args:
+            keyword: 关键词
+        
+        Returns:
+            是否正在抓取
+        """
+        return keyword in self._running
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取调度状态
+        
+        Returns:
+            包含调度是否运行和各关键词上次抓取情况、下次抓取时间的字典
+        """
+        def format_time(timestamp: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else None
+        
+        keywords = {}
+        for keyword, state in self._states.items():
+            keywords[keyword] = {
+                "running": keyword in self._running,
+                "interval": state.get("interval") or self.default_interval,
+                "next_run": format_time(state["next_run"]),
+                "last_start": format_time(state["last_start"]),
+                "last_end": format_time(state["last_end"]),
+                "last_duration": state["last_duration"],
+                "last_count": state["last_count"],
+                "last_error": state["last_error"],
+                "runs": state["runs"]
+            }
+        return {
+            "enabled": self._loop_task is not None and not self._loop_task.done(),
+            "running": len(self._running),
+            "max_running": self.max_running,
+            "keywords": keywords
+        }
@@ -0,0 +1,249 @@
+import time
+import random
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from driver_pool import DriverPool, create_chrome_driver
+from html_parser import HtmlParser, get_parser
+from rate_limiter import HostRateLimiter, CaptchaDetected, PRIORITY_ARTICLE, THROTTLE_STATUS_CODES
+from response_cache import ResponseCache
+
+# 爬虫请求和浏览器使用的User-Agent
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# 需要重试的HTTP状态码
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CrawlerRuntime:
+    """
+    爬虫运行时，持有所有爬虫共用的连接池会话、浏览器驱动池、HTML解析后端、限速器和响应缓存
+    
+    同一域名的请求复用已建立的TCP/TLS连接，失败的请求按指数退避加随机抖动重试。
+    requests.Session的连接池是线程安全的，可供多个抓取线程同时使用。
+    """
+    
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, backoff_max: float = 10.0,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 driver_pool: Optional[DriverPool] = None, driver_pool_size: int = 2, driver_max_pages: int = 50,
+                 parser: str = "auto", rate_limiter: Optional[HostRateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        """
+        初始化爬虫运行时
+        
+        Args:
+            pool_connections: 缓存连接池的域名数量
+            pool_maxsize: 每个域名连接池保留的连接数
+            max_retries: 最大重试次数
+            backoff_factor: 退避基数（秒），第n次重试前最多等待backoff_factor * 2^n秒
+            backoff_max: 单次退避等待的上限（秒）
+            connect_timeout: 建立连接的超时时间（秒）
+            read_timeout: 读取响应的超时时间（秒）
+            driver_pool: 浏览器驱动池，默认首次使用时创建无头Chrome驱动池
+            driver_pool_size: 默认驱动池的驱动数量上限
+            driver_max_pages: 默认驱动池中单个驱动访问的页面数上限
+            parser: HTML解析后端名称，auto表示使用最快的可用后端
+            rate_limiter: 按域名限速的限速器，默认使用HostRateLimiter的默认速率
+            response_cache: 磁盘响应缓存，为None时不缓存
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.parser: HtmlParser = get_parser(parser)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.response_cache = response_cache
+        
+        # 重试由get方法实现，适配器本身不重试
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self._driver_pool = driver_pool
+        self._driver_pool_size = driver_pool_size
+        self._driver_max_pages = driver_max_pages
+        self._driver_pool_lock = threading.Lock()
+        
+        # 平台类型到快速路径成功次数和回退到浏览器次数的字典
+        self._fetch_stats: Dict[str, Dict[str, int]] = {}
+        self._fetch_stats_lock = threading.Lock()
+    
+    @property
+    def driver_pool(self) -> DriverPool:
+        """
+        浏览器驱动池，首次访问时创建
+        """
+        with self._driver_pool_lock:
+            if self._driver_pool is None:
+                self._driver_pool = DriverPool(
+                    size=self._driver_pool_size,
+                    max_pages=self._driver_max_pages,
+                    factory=self.create_driver
+                )
+            return self._driver_pool
+    
+    def create_driver(self) -> Any:
+        """
+        创建默认驱动池使用的浏览器驱动
+        
+        Returns:
+            无头Chrome驱动
+        """
+        return create_chrome_driver(DEFAULT_USER_AGENT)
+    
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        计算第attempt次重试前的等待时间，在退避上限内均匀随机，避免多个请求同时重试
+        
+        Args:
+            attempt: 重试序号，从0开始
+        
+        Returns:
+            等待时间（秒）
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+    
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, priority: int = PRIORITY_ARTICLE,
+            **kwargs) -> requests.Response:
+        """
+        发送GET请求，配置了响应缓存时优先使用缓存，缓存过期后发送条件请求
+        
+        有效期内的缓存响应不发送请求；站点返回304时返回缓存的响应体。
+        来自缓存的响应带有from_cache属性，值为hit或revalidated。
+        带有其他requests参数（如params、stream）的请求不使用缓存。
+        
+        Args:
+            url: 请求URL
+            headers: 请求头
+            priority: 请求优先级，同一域名排队时数值小的先执行
+            **kwargs: 传给requests的其他参数
+        
+        Returns:
+            最后一次请求的响应或缓存的响应
+        
+        Raises:
+            CaptchaDetected: 重试次数用尽后仍返回验证码页面
+            requests.RequestException: 重试次数用尽后仍无法连接
+        """
+        if self.response_cache is None or kwargs:
+            return self._fetch(url, headers, priority, **kwargs)
+        
+        cached, conditional = self.response_cache.lookup(url)
+        if cached is not None:
+            return cached
+        
+        response = self._fetch(url, dict(headers or {}, **conditional), priority)
+        if response.status_code == 304 and conditional:
+            revalidated = self.response_cache.revalidated(url, response)
+            if revalidated is not None:
+                return revalidated
+            # 缓存在请求期间被淘汰，重新下载完整响应
+            response = self._fetch(url, headers, priority)
+        
+        self.response_cache.store(url, response)
+        return response
+    
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]], priority: int, **kwargs) -> requests.Response:
+        """
+        发送GET请求，请求前按域名限速，连接失败、超时、返回可重试状态码或验证码页面时自动重试
+        
+        Args:
+            url: 请求URL
+            headers: 请求头
+            priority: 请求优先级
+            **kwargs: 传给requests的其他参数
+        
+        Returns:
+            最后一次请求的响应
+        
+        Raises:
+            CaptchaDetected: 重试次数用尽后仍返回验证码页面
+            requests.RequestException: 重试次数用尽后仍无法连接
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(url, priority)
+            try:
+                response = self.session.get(url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                self.logger.warning(f"请求 {url} 失败: {str(e)}，第 {attempt + 1} 次重试")
+            else:
+                # 被限流时限速器会暂停该域名，重试请求在获取许可时等待
+                throttled = self.rate_limiter.report(response)
+                if not throttled and response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                if attempt >= self.max_retries:
+                    if throttled and response.status_code not in THROTTLE_STATUS_CODES:
+                        raise CaptchaDetected(f"请求 {url} 返回验证码页面", response=response)
+                    return response
+                if throttled:
+                    self.logger.warning(f"请求 {url} 被站点限流，第 {attempt + 1} 次重试")
+                else:
+                    self.logger.warning(f"请求 {url} 返回状态码 {response.status_code}，第 {attempt + 1} 次重试")
+                response.close()
+            
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+    
+    def record_fetch(self, platform_type: str, fallback: bool) -> None:
+        """
+        记录一次页面抓取使用的路径
+        
+        Args:
+            platform_type: 平台类型
+            fallback: 是否回退到了浏览器
+        """
+        with self._fetch_stats_lock:
+            stats = self._fetch_stats.setdefault(platform_type, {"fast": 0, "fallback": 0})
+            stats["fallback" if fallback else "fast"] += 1
+    
+    def get_fetch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取各平台快速路径和浏览器回退的次数
+        
+        Returns:
+            平台类型到统计的字典，包含fast、fallback和fallback_rate
+        """
+        with self._fetch_stats_lock:
+            result = {}
+            for platform_type, stats in self._fetch_stats.items():
+                total = stats["fast"] + stats["fallback"]
+                result[platform_type] = dict(stats, fallback_rate=stats["fallback"] / total if total else 0.0)
+            return result
+    
+    def close(self) -> None:
+        """
+        关闭会话及其连接池，以及已创建的浏览器驱动池
+        """
+        self.session.close()
+        with self._driver_pool_lock:
+            if self._driver_pool is not None:
+                self._driver_pool.close()
+
+
+_default_runtime: Optional[CrawlerRuntime] = None
+_default_runtime_lock = threading.Lock()
+
+
+def get_default_runtime() -> CrawlerRuntime:
+    """
+    获取进程内共用的默认爬虫运行时，首次调用时创建，响应缓存保存在应用数据目录下
+    
+    Returns:
+        爬虫运行时
+    """
+    global _default_runtime
+    with _default_runtime_lock:
+        if _default_runtime is None:
+            _default_runtime = CrawlerRuntime(response_cache=ResponseCache())
+        return _default_runtime
@@ -1,23 +1,347 @@
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from news_index import NewsView, NewsIndex, url_fingerprint, parse_publish_time, publish_timestamp
+from news_frame import NewsFrame, INTERACTION_FIELDS
+from hot_ranker import HotNewsRanker, DEFAULT_HOT_SCORE_WEIGHTS
+from news_stats import NewsStats
+from news_tokens import TokenStore, WordFrequency
+from sentiment_analyzer import SentimentAnalyzer, SENTIMENT_LABELS
+
+# 重新抓取到的正文变化时写回的字段，发布时间沿用首次保存的值，按日期的索引无需调整
+CONTENT_UPDATE_FIELDS = ("title", "content", "author")
 
 class NewsDataManager:
     """
     新闻数据管理类，提供新闻数据的存储、查询和分析功能
     """
     
-    def __init__(self, storage):
+    def __init__(self, storage, hot_score_weights: Optional[Dict[str, float]] = None, hot_news_capacity: int = 100,
+                 sentiment_analyzer: Optional[SentimentAnalyzer] = None):
         """
         初始化新闻数据管理器
         
         Args:
             storage: 文件存储对象
+            hot_score_weights: 热度计算公式中各互动字段的权重，默认使用DEFAULT_HOT_SCORE_WEIGHTS
+            hot_news_capacity: 增量维护的热门新闻条数上限
+            sentiment_analyzer: 入库时使用的情感分析器，默认使用内置情感词典
         """
         self.storage = storage
         self.news_file = "news_data"
+        self.index_file = "news_index"
+        self.stats_file = "news_stats"
+        self.word_freq_file = "news_word_freq"
         self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._index: Optional[NewsIndex] = None
+        # 本进程的派生视图对应的统计revision，其他进程更新已有新闻后不再一致
+        self._revision: Optional[int] = None
+        self._frame: Optional[NewsFrame] = None
+        self.hot_score_weights = hot_score_weights or DEFAULT_HOT_SCORE_WEIGHTS
+        self.hot_news_capacity = hot_news_capacity
+        self._hot_ranker: Optional[HotNewsRanker] = None
+        self._stats: Optional[NewsStats] = None
+        self.token_store = TokenStore(storage)
+        self._word_freq: Optional[WordFrequency] = None
+        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+    
+    def get_index(self) -> NewsIndex:
+        """
+        获取与当前新闻数据同步的索引
+        
+        首次调用时优先从索引文件加载，再补充索引文件之后新增的数据；
+        索引文件缺失或与数据不一致时从头重建。
+        
+        Returns:
+            新闻索引
+        """
+        return self._get_indexed_news()[1]
+    
+    def _get_indexed_news(self) -> Tuple[List[Dict[str, Any]], NewsIndex]:
+        """
+        获取全部新闻数据及与之同步的索引
+        
+        Returns:
+            (新闻数据列表, 新闻索引)
+        """
+        with self._lock:
+            all_news = self.get_all_news()
+            
+            if self._index is None:
+                self._index = NewsIndex.from_dict(self.storage.load_json(self.index_file))
+                added = self._index.sync(all_news)
+                self.logger.info(f"新闻索引已就绪，共 {self._index.count} 条，本次补充 {added} 条")
+                if added:
+                    self.save_index()
+            else:
+                self._index.sync(all_news)
+            
+            return all_news, self._index
+    
+    def get_frame(self) -> NewsFrame:
+        """
+        获取与当前新闻数据同步的列式视图，首次调用时构建
+        
+        Returns:
+            新闻列式视图
+        """
+        with self._lock:
+            self._sync_revision()
+            all_news = self.get_all_news()
+            if self._frame is None:
+                self._frame = NewsFrame()
+            self._frame.sync(all_news)
+            return self._frame
+    
+    def get_hot_ranker(self) -> HotNewsRanker:
+        """
+        获取与当前新闻数据同步的热门新闻排行，首次调用时构建
+        
+        Returns:
+            热门新闻排行
+        """
+        with self._lock:
+            self._sync_revision()
+            all_news = self.get_all_news()
+            if self._hot_ranker is None:
+                self._hot_ranker = HotNewsRanker(self.hot_news_capacity, self.hot_score_weights)
+            self._hot_ranker.sync(all_news)
+            return self._hot_ranker
+    
+    def get_stats(self) -> NewsStats:
+        """
+        获取新闻统计
+        
+        首次调用时从统计文件加载并补充之后新增的数据，之后由save_news增量维护，
+        读取时只检查统计文件是否被其他进程更新，无需加载新闻数据。
+        
+        Returns:
+            新闻统计
+        """
+        with self._lock:
+            if self._stats is None:
+                self._stats = NewsStats.from_dict(self.storage.load_json(self.stats_file))
+                added = self._stats.sync(self.get_all_news())
+                self.logger.info(f"新闻统计已就绪，共 {self._stats.count} 条，本次补充 {added} 条")
+                if added:
+                    self.save_stats()
+            else:
+                saved = self.storage.load_json(self.stats_file)
+                if isinstance(saved, dict) and (saved.get("count", 0) > self._stats.count
+                                                or saved.get("revision", 0) > self._stats.revision):
+                    self._stats = NewsStats.from_dict(saved)
+            
+            return self._stats
+    
+    def _sync_revision(self) -> None:
+        """
+        其他进程更新了已有新闻或重建了统计时，丢弃依赖已有新闻数据的视图，下次读取时重建或重新加载
+        """
+        revision = self.get_stats().revision
+        if self._revision is not None and revision != self._revision:
+            self.logger.info("已有新闻的数据已被其他进程更新，重新加载依赖已有新闻数据的视图")
+            self._frame = None
+            self._hot_ranker = None
+            self._word_freq = None
+        self._revision = revision
+    
+    def save_stats(self) -> bool:
+        """
+        将统计保存到统计文件
+        
+        Returns:
+            是否成功保存
+        """
+        with self._lock:
+            if self._stats is None:
+                return False
+            return self.storage.save_json(self.stats_file, self._stats.to_dict())
+    
+    def rebuild_stats(self) -> int:
+        """
+        丢弃已保存的统计，遍历全部新闻数据重新计算，用于统计文件损坏或与数据不符时恢复
+        
+        Returns:
+            参与统计的新闻条数
+        """
+        with self._lock:
+            stats = NewsStats()
+            stats.sync(self.get_all_news())
+            # 递增revision，通知其他进程重建依赖新闻数据的视图
+            stats.revision = self._stats.revision + 1 if self._stats is not None else 0
+            self._stats = stats
+            self._revision = stats.revision
+            if not self.save_stats():
+                self.logger.error("保存重建的新闻统计失败")
+            
+            self.logger.info(f"新闻统计已重建，共 {stats.count} 条")
+            return stats.count
+    
+    def get_word_frequency(self) -> WordFrequency:
+        """
+        获取与当前新闻数据同步的关键词词频
+        
+        首次调用时从词频文件加载并补充之后新增的数据，新增新闻的分词结果
+        优先从分词结果存储读取，只有未分词过的新闻才调用jieba。
+        
+        Returns:
+            关键词词频
+        """
+        with self._lock:
+            self._sync_revision()
+            all_news = self.get_all_news()
+            if self._word_freq is None:
+                self._word_freq = WordFrequency.from_dict(self.storage.load_json(self.word_freq_file), self.token_store)
+                added = self._word_freq.sync(all_news)
+                self.logger.info(f"关键词词频已就绪，共 {self._word_freq.count} 条，本次补充 {added} 条")
+                if added:
+                    self.save_word_frequency()
+            else:
+                self._word_freq.sync(all_news)
+            
+            return self._word_freq
+    
+    def save_word_frequency(self) -> bool:
+        """
+        将关键词词频保存到词频文件
+        
+        Returns:
+            是否成功保存
+        """
+        with self._lock:
+            if self._word_freq is None:
+                return False
+            return self.storage.save_json(self.word_freq_file, self._word_freq.to_dict())
+    
+    def rebuild_word_frequency(self, batch_size: int = 2000) -> int:
+        """
+        为全部新闻补充分词结果并重新计算关键词词频，用于批量回填历史新闻
+        
+        按批分词，启用jieba并行模式时每批由多个进程同时处理。
+        
+        Args:
+            batch_size: 每批分词的新闻条数
+        
+        Returns:
+            参与统计的新闻条数
+        """
+        with self._lock:
+            all_news = self.get_all_news()
+            word_freq = WordFrequency(self.token_store)
+            for start in range(0, len(all_news), batch_size):
+                word_freq.extend(start, all_news[start:start + batch_size])
+                self.logger.info(f"已分词 {word_freq.count}/{len(all_news)} 条新闻")
+            self._word_freq = word_freq
+            if not self.save_word_frequency():
+                self.logger.error("保存重建的关键词词频失败")
+            
+            self.logger.info(f"关键词词频已重建，共 {word_freq.count} 条")
+            return word_freq.count
+    
+    def get_top_words(self, keyword: str, limit: int = 100) -> Dict[str, int]:
+        """
+        获取关键词相关新闻中出现次数最多的词
+        
+        Args:
+            keyword: 关键词
+            limit: 词数上限
+        
+        Returns:
+            按出现次数降序排列的词到次数的字典
+        """
+        try:
+            return self.get_word_frequency().top(keyword, limit)
+        except Exception as e:
+            self.logger.error(f"获取关键词词频时发生错误: {str(e)}")
+            return {}
+    
+    def _loaded_views(self) -> List[NewsView]:
+        """
+        获取已加载的派生视图
+        
+        Returns:
+            视图列表
+        """
+        views = (self._index, self._frame, self._hot_ranker, self._stats, self._word_freq)
+        return [view for view in views if view is not None]
+    
+    def save_index(self) -> bool:
+        """
+        将索引保存到索引文件，下次启动时无需重建
+        
+        Returns:
+            是否成功保存
+        """
+        with self._lock:
+            if self._index is None:
+                return False
+            return self.storage.save_json(self.index_file, self._index.to_dict())
+    
+    def migrate_publish_ts(self) -> int:
+        """
+        为缺少publish_ts字段的历史新闻补充发布时间戳并写回存储
+        
+        Returns:
+            补充的新闻条数
+        """
+        try:
+            with self._lock, self.storage.lock(self.news_file):
+                all_news = self.get_all_news()
+                missing = [item for item in all_news if "publish_ts" not in item]
+                if not missing:
+                    return 0
+                
+                for item in missing:
+                    item["publish_ts"] = parse_publish_time(item.get("publish_time"))
+                
+                if not self.storage.save_json(self.news_file, all_news):
+                    self.logger.error("写回发布时间戳失败")
+                    return 0
+            
+            self.logger.info(f"已为 {len(missing)} 条新闻补充发布时间戳")
+            return len(missing)
+        except Exception as e:
+            self.logger.error(f"补充发布时间戳时发生错误: {str(e)}")
+            return 0
+    
+    def migrate_sentiment(self, rescore: bool = False, batch_size: int = 2000) -> int:
+        """
+        为未分析过情感的历史新闻批量分析情感并写回存储，之后重建统计和列式视图
+        
+        Args:
+            rescore: 是否重新分析全部新闻，用于情感词典修改后
+            batch_size: 每批分析的新闻条数
+        
+        Returns:
+            分析的新闻条数
+        """
+        try:
+            with self._lock, self.storage.lock(self.news_file):
+                all_news = self.get_all_news()
+                scored = 0
+                for start in range(0, len(all_news), batch_size):
+                    scored += self.sentiment_analyzer.score_items(all_news[start:start + batch_size], rescore)
+                if not scored:
+                    return 0
+                
+                if not self.storage.save_json(self.news_file, all_news):
+                    self.logger.error("写回情感分析结果失败")
+                    return 0
+                # URL未变化，索引等视图仍然有效；情感分布需要重新统计
+                self._frame = None
+                self.rebuild_stats()
+            
+            self.logger.info(f"已为 {scored} 条新闻分析情感")
+            return scored
+        except Exception as e:
+            self.logger.error(f"分析历史新闻情感时发生错误: {str(e)}")
+            return 0
     
     def save_news(self, news_items: List[Dict[str, Any]]) -> bool:
         """
@@ -25,33 +349,139 @@ class NewsDataManager:
         
         Args:
             news_items: 新闻数据列表
-            
+        
         Returns:
             是否成功保存
         """
         try:
-            # 获取现有数据
-            existing_news = self.get_all_news()
-            
-            # 添加新数据
-            for item in news_items:
-                # 检查是否已存在相同URL的新闻
-                if not any(existing["url"] == item["url"] for existing in existing_news):
-                    existing_news.append(item)
-            
-            # 保存到文件
-            result = self.storage.save_json(existing_news, self.news_file)
+            # 持有新闻集合的文件锁完成读取、去重和追加，其他进程同时入库时不会重复保存
+            with self._lock, self.storage.lock(self.news_file):
+                self._sync_revision()
+                all_news, index = self._get_indexed_news()
+                stats = self.get_stats()
+                base = index.count
+                
+                # 一次遍历完成整批去重，同时排除批次内重复的URL；已保存过的新闻是重新抓取的结果，
+                # 只更新互动数据和变化的正文
+                new_items = []
+                refreshed = []
+                batch_fingerprints = set()
+                for item in news_items:
+                    fingerprint = url_fingerprint(item["url"])
+                    if fingerprint in batch_fingerprints:
+                        continue
+                    batch_fingerprints.add(fingerprint)
+                    position = index.url_positions.get(fingerprint)
+                    if position is not None:
+                        refreshed.append((position, item))
+                        continue
+                    # 入库时一次性解析发布时间，之后的时间过滤和统计都使用时间戳
+                    item["publish_ts"] = parse_publish_time(item.get("publish_time"))
+                    new_items.append(item)
+                
+                # 入库时整批分析情感，统计和分析页面直接读取保存的情感类别
+                try:
+                    self.sentiment_analyzer.score_items(new_items)
+                except Exception as e:
+                    self.logger.error(f"分析新闻情感时发生错误: {str(e)}")
+                
+                # 只追加新数据，日志存储下无需重写整个集合
+                result = self.storage.extend_json(self.news_file, new_items)
+                if result and new_items:
+                    # 入库时分词并保存结果，之后生成词云和重建词频都无需再次分词
+                    try:
+                        self.token_store.get_tokens(new_items)
+                    except Exception as e:
+                        self.logger.error(f"新闻分词时发生错误: {str(e)}")
+                    # 新数据追加在末尾，直接补充各视图，无需重新加载全部数据
+                    for view in self._loaded_views():
+                        if view.count == base:
+                            view.extend(base, new_items)
+                    # 统计文档很小，每批入库后保存，重启或其他进程读取时无需重新计算
+                    if stats.count == base + len(new_items):
+                        self.save_stats()
+                
+                updated = self._update_refreshed(all_news, refreshed) if result else 0
+                result = result and updated >= 0
             
             if result:
-                self.logger.info(f"成功保存 {len(news_items)} 条新闻数据")
+                self.logger.info(
+                    f"成功保存 {len(new_items)} 条新闻数据，更新 {updated} 条已保存的新闻，"
+                    f"跳过 {len(news_items) - len(new_items) - updated} 条重复数据"
+                )
             else:
                 self.logger.error("保存新闻数据失败")
-                
+            
             return result
         except Exception as e:
             self.logger.error(f"保存新闻数据时发生错误: {str(e)}")
             return False
     
+    def _update_refreshed(self, all_news: List[Dict[str, Any]], refreshed: List[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        将重新抓取的结果写回已保存的新闻，并调整各视图，调用方需持有锁
+        
+        互动数据有变化时写回变化的字段；内容哈希变化时同时写回正文并重新分析情感，
+        词频按新旧分词结果调整。
+        
+        Args:
+            all_news: 全部新闻数据
+            refreshed: (已保存新闻的位置, 重新抓取的新闻数据)列表
+        
+        Returns:
+            有变化的新闻条数，写入失败时为-1
+        """
+        changes = []
+        for position, item in refreshed:
+            old_item = all_news[position]
+            update = {
+                field: item[field] for field in INTERACTION_FIELDS
+                if item.get(field) is not None and item[field] != old_item.get(field)
+            }
+            digest = item.get("content_hash")
+            if digest and digest != old_item.get("content_hash"):
+                update["content_hash"] = digest
+                update.update({
+                    field: item[field] for field in CONTENT_UPDATE_FIELDS
+                    if item.get(field) and item[field] != old_item.get(field)
+                })
+            if update:
+                changes.append((position, dict(old_item), update))
+        if not changes:
+            return 0
+        
+        rewritten = [(old_item, update) for _, old_item, update in changes
+                     if any(field in update for field in CONTENT_UPDATE_FIELDS)]
+        if rewritten:
+            try:
+                scored = [dict(old_item, **update) for old_item, update in rewritten]
+                self.sentiment_analyzer.score_items(scored, rescore=True)
+                for (old_item, update), item in zip(rewritten, scored):
+                    update.update(sentiment=item["sentiment"], sentiment_score=item["sentiment_score"])
+            except Exception as e:
+                self.logger.error(f"分析新闻情感时发生错误: {str(e)}")
+            # 词频文件需要随正文一起调整，其他进程重新加载时才能读到调整后的词频
+            self.get_word_frequency()
+        
+        if not self.storage.update_many_json(self.news_file, [({"url": old_item["url"]}, update)
+                                                               for _, old_item, update in changes]):
+            self.logger.error(f"更新 {len(changes)} 条已保存的新闻失败")
+            return -1
+        
+        stats = self.get_stats()
+        for position, old_item, update in changes:
+            new_item = dict(old_item, **update)
+            for view in self._loaded_views():
+                if view.count > position:
+                    view.update(position, old_item, new_item)
+        # 递增revision，通知其他进程重建依赖已有新闻数据的视图
+        stats.revision += 1
+        self._revision = stats.revision
+        self.save_stats()
+        if rewritten:
+            self.save_word_frequency()
+        return len(changes)
+    
     def get_all_news(self) -> List[Dict[str, Any]]:
         """
         获取所有新闻数据
@@ -71,13 +501,13 @@ class NewsDataManager:
         
         Args:
             keyword: 关键词
-            
+        
         Returns:
             新闻数据列表
         """
         try:
-            all_news = self.get_all_news()
-            return [item for item in all_news if item.get("keyword") == keyword]
+            all_news, index = self._get_indexed_news()
+            return [all_news[i] for i in index.by_keyword.get(keyword, [])]
         except Exception as e:
             self.logger.error(f"根据关键词获取新闻数据时发生错误: {str(e)}")
             return []
@@ -88,13 +518,13 @@ class NewsDataManager:
         
         Args:
             platform_type: 平台类型
-            
+        
         Returns:
             新闻数据列表
         """
         try:
-            all_news = self.get_all_news()
-            return [item for item in all_news if item.get("platform_type") == platform_type]
+            all_news, index = self._get_indexed_news()
+            return [all_news[i] for i in index.by_platform_type.get(platform_type, [])]
         except Exception as e:
             self.logger.error(f"根据平台类型获取新闻数据时发生错误: {str(e)}")
             return []
@@ -106,24 +536,27 @@ class NewsDataManager:
         Args:
             start_date: 开始日期
             end_date: 结束日期
-            
+        
         Returns:
             新闻数据列表
         """
         try:
-            all_news = self.get_all_news()
+            all_news, index = self._get_indexed_news()
             filtered_news = []
             
-            for item in all_news:
-                try:
-                    publish_time = item.get("publish_time", "")
-                    if publish_time:
-                        publish_date = datetime.strptime(publish_time, "%Y-%m-%d %H:%M:%S")
-                        if start_date <= publish_date <= end_date:
-                            filtered_news.append(item)
-                except Exception as e:
-                    self.logger.warning(f"解析新闻发布时间失败: {str(e)}")
-                    continue
+            # 只检查日期范围内各天桶中的新闻
+            days = []
+            current_date = start_date.date()
+            while current_date <= end_date.date():
+                days.append(current_date.strftime("%Y-%m-%d"))
+                current_date += timedelta(days=1)
+            
+            start_ts = start_date.timestamp()
+            end_ts = end_date.timestamp()
+            for position in index.positions_for_days(days):
+                item = all_news[position]
+                if start_ts <= publish_timestamp(item) <= end_ts:
+                    filtered_news.append(item)
             
             return filtered_news
         except Exception as e:
@@ -136,20 +569,13 @@ class NewsDataManager:
         
         Args:
             tags: 标签列表
-            
+        
         Returns:
             新闻数据列表
         """
         try:
-            all_news = self.get_all_news()
-            filtered_news = []
-            
-            for item in all_news:
-                item_tags = item.get("tags", [])
-                if any(tag in item_tags for tag in tags):
-                    filtered_news.append(item)
-            
-            return filtered_news
+            all_news, index = self._get_indexed_news()
+            return [all_news[i] for i in index.positions_for_tags(tags)]
         except Exception as e:
             self.logger.error(f"根据标签获取新闻数据时发生错误: {str(e)}")
             return []
@@ -160,29 +586,28 @@ class NewsDataManager:
         
         Args:
             limit: 结果数量限制
-            
+        
         Returns:
             热门新闻列表
         """
         try:
-            all_news = self.get_all_news()
-            
-            # 计算热度分数
-            for item in all_news:
-                read_count = item.get("read_count", 0)
-                comment_count = item.get("comment_count", 0)
-                like_count = item.get("like_count", 0)
-                share_count = item.get("share_count", 0)
-                forward_count = item.get("forward_count", 0)
+            with self._lock:
+                all_news = self.get_all_news()
                 
-                # 热度计算公式
-                hot_score = read_count + comment_count * 5 + like_count * 2 + share_count * 3 + forward_count * 3
-                item["hot_score"] = hot_score
-            
-            # 按热度排序
-            sorted_news = sorted(all_news, key=lambda x: x.get("hot_score", 0), reverse=True)
-            
-            return sorted_news[:limit]
+                if limit <= self.hot_news_capacity:
+                    # 直接读取增量维护的排行
+                    ranked = self.get_hot_ranker().top(limit)
+                else:
+                    # 超出排行容量时用列式视图计算，只对前limit条排序
+                    hot_scores = self.get_frame().weighted_sum(self.hot_score_weights)
+                    if limit < len(hot_scores):
+                        candidates = np.argpartition(-hot_scores, limit)[:limit]
+                    else:
+                        candidates = np.arange(len(hot_scores))
+                    ranked = sorted(((float(hot_scores[i]), int(i)) for i in candidates), key=lambda x: (-x[0], x[1]))
+            
+            # 返回副本，避免修改缓存中的新闻数据
+            return [dict(all_news[position], hot_score=int(score)) for score, position in ranked]
         except Exception as e:
             self.logger.error(f"获取热门新闻时发生错误: {str(e)}")
             return []
@@ -195,14 +620,10 @@ class NewsDataManager:
             平台新闻数量字典
         """
         try:
-            all_news = self.get_all_news()
-            platform_counts = {}
+            with self._lock:
+                platform_counts = self.get_frame().count_by("platform")
             
-            for item in all_news:
-                platform = item.get("platform", "未知平台")
-                platform_counts[platform] = platform_counts.get(platform, 0) + 1
-            
-            return platform_counts
+            return {(platform or "未知平台"): count for platform, count in platform_counts.items()}
         except Exception as e:
             self.logger.error(f"获取各平台新闻数量时发生错误: {str(e)}")
             return {}
@@ -213,12 +634,12 @@ class NewsDataManager:
         
         Args:
             days: 天数
-            
+        
         Returns:
             日期新闻数量字典
         """
         try:
-            all_news = self.get_all_news()
+            by_day = self.get_stats().by_day
             date_counts = {}
             
             # 生成日期范围
@@ -229,23 +650,10 @@ class NewsDataManager:
             current_date = start_date
             while current_date <= end_date:
                 date_str = current_date.strftime("%Y-%m-%d")
-                date_counts[date_str] = 0
+                # 日期计数由入库时的发布时间戳划分
+                date_counts[date_str] = by_day.get(date_str, 0)
                 current_date += timedelta(days=1)
             
-            # 统计每天的新闻数量
-            for item in all_news:
-                try:
-                    publish_time = item.get("publish_time", "")
-                    if publish_time:
-                        publish_date = datetime.strptime(publish_time, "%Y-%m-%d %H:%M:%S")
-                        date_str = publish_date.strftime("%Y-%m-%d")
-                        
-                        if date_str in date_counts:
-                            date_counts[date_str] += 1
-                except Exception as e:
-                    self.logger.warning(f"解析新闻发布时间失败: {str(e)}")
-                    continue
-            
             return date_counts
         except Exception as e:
             self.logger.error(f"获取每天新闻数量时发生错误: {str(e)}")
@@ -257,7 +665,7 @@ class NewsDataManager:
         
         Args:
             keyword: 关键词
-            
+        
         Returns:
             最早的新闻或None
         """
@@ -266,13 +674,12 @@ class NewsDataManager:
             if not news_list:
                 return None
             
-            # 按发布时间排序
-            sorted_news = sorted(
-                news_list,
-                key=lambda x: datetime.strptime(x.get("publish_time", "9999-12-31 23:59:59"), "%Y-%m-%d %H:%M:%S")
-            )
+            # 发布时间无效的新闻排在最后
+            dated_news = [item for item in news_list if publish_timestamp(item) is not None]
+            if not dated_news:
+                return news_list[0]
             
-            return sorted_news[0] if sorted_news else None
+            return min(dated_news, key=publish_timestamp)
         except Exception as e:
             self.logger.error(f"获取关键词最早新闻时发生错误: {str(e)}")
             return None
@@ -283,7 +690,7 @@ class NewsDataManager:
         
         Args:
             keyword: 关键词
-            
+        
         Returns:
             标签分布字典
         """
@@ -307,19 +714,16 @@ class NewsDataManager:
         
         Args:
             keyword: 关键词
-            
+        
         Returns:
             平台分布字典
         """
         try:
-            news_list = self.get_news_by_keyword(keyword)
-            platform_counts = {}
+            with self._lock:
+                frame = self.get_frame()
+                platform_counts = frame.count_by("platform", frame.mask_for("keyword", keyword))
             
-            for item in news_list:
-                platform = item.get("platform", "未知平台")
-                platform_counts[platform] = platform_counts.get(platform, 0) + 1
-            
-            return platform_counts
+            return {(platform or "未知平台"): count for platform, count in platform_counts.items()}
         except Exception as e:
             self.logger.error(f"获取关键词平台分布时发生错误: {str(e)}")
             return {}
@@ -330,35 +734,36 @@ class NewsDataManager:
         
         Args:
             keyword: 关键词
-            
+        
         Returns:
             互动数据字典
         """
         try:
-            news_list = self.get_news_by_keyword(keyword)
-            
-            read_count = 0
-            comment_count = 0
-            like_count = 0
-            share_count = 0
-            forward_count = 0
-            
-            for item in news_list:
-                read_count += item.get("read_count", 0)
-                comment_count += item.get("comment_count", 0)
-                like_count += item.get("like_count", 0)
-                share_count += item.get("share_count", 0)
-                forward_count += item.get("forward_count", 0)
-            
+            with self._lock:
+                frame = self.get_frame()
+                return frame.interaction_totals(frame.mask_for("keyword", keyword))
+        except Exception as e:
+            self.logger.error(f"获取关键词互动数据时发生错误: {str(e)}")
             return {
-                "read_count": read_count,
-                "comment_count": comment_count,
-                "like_count": like_count,
-                "share_count": share_count,
-                "forward_count": forward_count
+                "read_count": 0,
+                "comment_count": 0,
+                "like_count": 0,
+                "share_count": 0,
+                "forward_count": 0
             }
+    
+    def get_interaction_totals(self) -> Dict[str, int]:
+        """
+        获取全部新闻的互动数据合计
+        
+        Returns:
+            互动数据字典
+        """
+        try:
+            with self._lock:
+                return dict(self.get_stats().interactions)
         except Exception as e:
-            self.logger.error(f"获取关键词互动数据时发生错误: {str(e)}")
+            self.logger.error(f"获取互动数据合计时发生错误: {str(e)}")
             return {
                 "read_count": 0,
                 "comment_count": 0,
@@ -366,3 +771,38 @@ class NewsDataManager:
                 "share_count": 0,
                 "forward_count": 0
             }
+    
+    def get_sentiment_counts(self) -> Dict[str, int]:
+        """
+        获取全部新闻各情感类别的数量
+        
+        Returns:
+            情感类别到数量的字典
+        """
+        try:
+            with self._lock:
+                sentiments = self.get_stats().sentiments
+            return {sentiment: sentiments.get(sentiment, 0) for sentiment in SENTIMENT_LABELS}
+        except Exception as e:
+            self.logger.error(f"获取情感分布时发生错误: {str(e)}")
+            return {sentiment: 0 for sentiment in SENTIMENT_LABELS}
+    
+    def get_sentiment_distribution_by_keyword(self, keyword: str) -> Dict[str, int]:
+        """
+        获取关键词的情感分布
+        
+        Args:
+            keyword: 关键词
+        
+        Returns:
+            情感类别到数量的字典
+        """
+        try:
+            with self._lock:
+                frame = self.get_frame()
+                sentiment_counts = frame.count_by("sentiment", frame.mask_for("keyword", keyword))
+            
+            return {sentiment: sentiment_counts.get(sentiment, 0) for sentiment in SENTIMENT_LABELS}
+        except Exception as e:
+            self.logger.error(f"获取关键词情感分布时发生错误: {str(e)}")
+            return {sentiment: 0 for sentiment in SENTIMENT_LABELS}
\ No newline at end of file
@@ -0,0 +1,245 @@
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_driver_path() -> str:
+    """
+    获取ChromeDriver路径，只在首次调用时下载或检查版本
+    
+    Returns:
+        ChromeDriver可执行文件路径
+    """
+    return ChromeDriverManager().install()
+
+
+def create_chrome_driver(user_agent: Optional[str] = None) -> webdriver.Chrome:
+    """
+    启动一个无头Chrome浏览器
+    
+    Args:
+        user_agent: 浏览器User-Agent
+    
+    Returns:
+        Chrome驱动
+    """
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    if user_agent:
+        chrome_options.add_argument(f'user-agent={user_agent}')
+    
+    return webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
+
+
+class DriverPool:
+    """
+    浏览器驱动池，在多个爬虫之间复用已启动的浏览器
+    
+    借出前检查驱动是否仍可用，使用中出错且检查不通过的驱动直接丢弃；
+    每个驱动访问max_pages个页面后关闭重建，避免浏览器内存持续增长。
+    """
+    
+    def __init__(self, size: int = 2, max_pages: int = 50, factory: Optional[Callable[[], Any]] = None,
+                 checkout_timeout: float = 60.0):
+        """
+        初始化驱动池
+        
+        Args:
+            size: 同时存在的驱动数量上限
+            max_pages: 单个驱动访问的页面数上限
+            factory: 创建驱动的函数，默认启动无头Chrome
+            checkout_timeout: 借出驱动的最长等待时间（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.size = size
+        self.max_pages = max_pages
+        self.factory = factory or create_chrome_driver
+        self.checkout_timeout = checkout_timeout
+        self._condition = threading.Condition()
+        self._idle: List[Any] = []
+        # 驱动到已访问页面数的字典，包括空闲和借出的驱动
+        self._pages: Dict[Any, int] = {}
+        self._creating = 0
+        self._closed = False
+    
+    def _quit(self, driver: Any) -> None:
+        """
+        关闭驱动并释放名额
+        
+        Args:
+            driver: 驱动
+        """
+        with self._condition:
+            self._pages.pop(driver, None)
+            self._condition.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"关闭浏览器驱动失败: {str(e)}")
+    
+    def _create(self) -> Any:
+        """
+        创建驱动，调用前已占用一个创建名额
+        
+        Returns:
+            驱动
+        """
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._creating -= 1
+                self._condition.notify()
+            raise
+        
+        with self._condition:
+            self._creating -= 1
+            self._pages[driver] = 0
+        return driver
+    
+    def is_healthy(self, driver: Any) -> bool:
+        """
+        检查驱动对应的浏览器是否仍可响应
+        
+        Args:
+            driver: 驱动
+        
+        Returns:
+            是否可用
+        """
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+    
+    def checkout(self) -> Any:
+        """
+        借出一个驱动，没有空闲驱动且未达上限时创建新驱动，否则等待归还
+        
+        Returns:
+            驱动
+        
+        Raises:
+            RuntimeError: 驱动池已关闭
+            TimeoutError: 等待超时
+        """
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(
+                    lambda: self._closed or self._idle or len(self._pages) + self._creating < self.size,
+                    timeout=self.checkout_timeout
+                ):
+                    raise TimeoutError("等待浏览器驱动超时")
+                if self._closed:
+                    raise RuntimeError("浏览器驱动池已关闭")
+                
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._creating += 1
+                    driver = None
+            
+            if driver is None:
+                return self._create()
+            if self.is_healthy(driver):
+                return driver
+            
+            self.logger.warning("浏览器驱动已失效，重新创建")
+            self._quit(driver)
+    
+    def checkin(self, driver: Any, broken: bool = False) -> None:
+        """
+        归还驱动，访问页面数达到上限或已损坏的驱动直接关闭
+        
+        Args:
+            driver: 驱动
+            broken: 使用中是否发生了驱动故障
+        """
+        with self._condition:
+            pages = self._pages.get(driver)
+            if pages is not None:
+                pages += 1
+                self._pages[driver] = pages
+            recycle = self._closed or broken or pages is None or pages >= self.max_pages
+            if not recycle:
+                self._idle.append(driver)
+                self._condition.notify()
+        
+        if recycle:
+            self._quit(driver)
+    
+    @contextmanager
+    def driver(self):
+        """
+        借出驱动的上下文管理器，退出时自动归还
+        
+        使用中抛出异常时检查驱动状态，页面级错误（如元素未找到）不会导致驱动被丢弃。
+        
+        Yields:
+            驱动
+        """
+        driver = self.checkout()
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not self.is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, broken)
+    
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """
+        预先启动驱动，避免首次抓取时等待浏览器启动
+        
+        Args:
+            count: 预启动的驱动数量，默认启动到池大小
+        
+        Returns:
+            成功启动的驱动数量
+        """
+        count = self.size if count is None else min(count, self.size)
+        started = 0
+        for _ in range(count):
+            with self._condition:
+                if self._closed or len(self._pages) + self._creating >= self.size:
+                    break
+                self._creating += 1
+            
+            try:
+                driver = self._create()
+            except Exception as e:
+                self.logger.error(f"预启动浏览器驱动失败: {str(e)}")
+                break
+            
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+            started += 1
+        
+        self.logger.info(f"已预启动 {started} 个浏览器驱动")
+        return started
+    
+    def close(self) -> None:
+        """
+        关闭驱动池和所有空闲驱动，借出中的驱动在归还时关闭
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        
+        for driver in idle:
+            self._quit(driver)
@@ -0,0 +1,141 @@
+import heapq
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from news_index import NewsView, url_fingerprint
+
+# 默认热度计算公式中各互动字段的权重
+DEFAULT_HOT_SCORE_WEIGHTS = {
+    "read_count": 1,
+    "comment_count": 5,
+    "like_count": 2,
+    "share_count": 3,
+    "forward_count": 3
+}
+
+
+def hot_score(item: Dict[str, Any], weights: Dict[str, float]) -> float:
+    """
+    计算单条新闻的热度分数
+    
+    Args:
+        item: 新闻数据
+        weights: 互动字段到权重的字典
+    
+    Returns:
+        热度分数
+    """
+    return sum((item.get(field) or 0) * weight for field, weight in weights.items())
+
+
+class HotNewsRanker(NewsView):
+    """
+    热门新闻排行，用容量固定的小顶堆保存热度最高的新闻位置
+    
+    新数据只需与堆顶比较即可完成维护，读取前K条时只需对堆内元素排序。
+    重新抓取使已有新闻的热度上升时原地调整堆；堆内新闻热度下降时，
+    堆外新闻可能反超，此时清空排行，下次同步时重建。
+    """
+    
+    def __init__(self, capacity: int = 100, weights: Optional[Dict[str, float]] = None):
+        """
+        初始化热门新闻排行
+        
+        Args:
+            capacity: 保留的热门新闻条数上限
+            weights: 热度计算权重，默认使用DEFAULT_HOT_SCORE_WEIGHTS
+        """
+        self.capacity = capacity
+        self.weights = weights or DEFAULT_HOT_SCORE_WEIGHTS
+        super().__init__()
+    
+    def reset(self) -> None:
+        """
+        清空排行
+        """
+        super().reset()
+        # 堆元素为(热度分数, -位置)，分数相同时位置靠后的新闻先被淘汰
+        self._heap: List[Tuple[float, int]] = []
+    
+    def _push(self, score: float, position: int) -> None:
+        """
+        将一条新闻放入堆中，超出容量时淘汰热度最低的新闻
+        
+        Args:
+            score: 热度分数
+            position: 新闻位置
+        """
+        entry = (score, -position)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻加入排行
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        self._push(hot_score(item, self.weights), position)
+    
+    def extend(self, start: int, items: List[Dict[str, Any]]) -> None:
+        """
+        批量加入新闻，数量较多时先用np.partition求出入堆门槛，只让候选入堆
+        
+        Args:
+            start: 第一条新闻的位置
+            items: 新闻数据列表
+        """
+        if len(items) <= self.capacity:
+            super().extend(start, items)
+            return
+        
+        scores = np.zeros(len(items), dtype=np.float64)
+        for field, weight in self.weights.items():
+            scores += np.fromiter(((item.get(field) or 0) for item in items), dtype=np.float64, count=len(items)) * weight
+        
+        # 与门槛分数相同的新闻都作为候选，由堆按位置决定取舍
+        threshold = np.partition(scores, len(scores) - self.capacity)[len(scores) - self.capacity]
+        for offset in np.flatnonzero(scores >= threshold):
+            self._push(float(scores[offset]), start + int(offset))
+        
+        self.last_fingerprint = url_fingerprint(items[-1].get("url", ""))
+        self.count = start + len(items)
+    
+    def update(self, position: int, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        按更新后的互动数据调整新闻的热度
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            old_item: 更新前的新闻数据
+            new_item: 更新后的新闻数据
+        """
+        score = hot_score(new_item, self.weights)
+        for i, (old_score, negative_position) in enumerate(self._heap):
+            if negative_position != -position:
+                continue
+            if score < old_score and len(self._heap) >= self.capacity:
+                self.reset()
+            else:
+                self._heap[i] = (score, negative_position)
+                heapq.heapify(self._heap)
+            return
+        self._push(score, position)
+    
+    def top(self, limit: int) -> List[Tuple[float, int]]:
+        """
+        获取热度最高的新闻
+        
+        Args:
+            limit: 结果数量限制，不能超过容量
+        
+        Returns:
+            按热度降序排列的(热度分数, 新闻位置)列表，热度相同时位置靠前的在前
+        """
+        ranked = sorted(self._heap, reverse=True)[:limit]
+        return [(score, -negative_position) for score, negative_position in ranked]
@@ -0,0 +1,226 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# selectolax 1.0起旧的modest后端已弃用，优先使用lexbor后端
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+        SELECTOLAX_AVAILABLE = True
+    except ImportError:
+        SELECTOLAX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class HtmlParser:
+    """
+    HTML解析后端基类，爬虫通过统一的接口解析页面和查询元素，不依赖具体解析库
+    """
+    
+    name = ""
+    
+    def parse(self, html: str, only: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        解析HTML
+        
+        Args:
+            html: HTML内容
+            only: 部分解析条件，格式为{"name": 标签名, "attrs": 属性字典}，
+                  只构建匹配元素及其子树，不支持部分解析的后端忽略该参数
+        
+        Returns:
+            文档根节点
+        """
+        raise NotImplementedError("子类必须实现parse方法")
+    
+    def select(self, node: Any, selector: str) -> List[Any]:
+        """
+        查询匹配CSS选择器的全部元素
+        
+        Args:
+            node: 查询范围的节点
+            selector: CSS选择器
+        
+        Returns:
+            元素列表
+        """
+        raise NotImplementedError("子类必须实现select方法")
+    
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        """
+        查询匹配CSS选择器的第一个元素
+        
+        Args:
+            node: 查询范围的节点
+            selector: CSS选择器
+        
+        Returns:
+            元素或None
+        """
+        raise NotImplementedError("子类必须实现select_one方法")
+    
+    def text(self, node: Any, separator: str = "", strip: bool = True) -> str:
+        """
+        获取节点的文本内容
+        
+        Args:
+            node: 节点
+            separator: 各段文本之间的分隔符
+            strip: 是否去掉各段文本首尾的空白
+        
+        Returns:
+            文本内容
+        """
+        raise NotImplementedError("子类必须实现text方法")
+    
+    def attr(self, node: Any, name: str, default: str = "") -> str:
+        """
+        获取节点的属性值
+        
+        Args:
+            node: 节点
+            name: 属性名
+            default: 属性不存在时的默认值
+        
+        Returns:
+            属性值
+        """
+        raise NotImplementedError("子类必须实现attr方法")
+
+
+class SoupParser(HtmlParser):
+    """
+    BeautifulSoup解析后端，可使用标准库html.parser或lxml构建文档树
+    
+    CSS选择器首次使用时编译并缓存，之后的查询直接使用编译结果。
+    """
+    
+    def __init__(self, features: str = "html.parser"):
+        """
+        初始化解析后端
+        
+        Args:
+            features: BeautifulSoup使用的解析器名称
+        """
+        self.name = features
+        self.features = features
+        self._compiled: Dict[str, Any] = {}
+        self._compiled_lock = threading.Lock()
+    
+    def compile(self, selector: str) -> Any:
+        """
+        获取编译后的CSS选择器
+        
+        Args:
+            selector: CSS选择器
+        
+        Returns:
+            soupsieve编译结果
+        """
+        pattern = self._compiled.get(selector)
+        if pattern is None:
+            with self._compiled_lock:
+                pattern = self._compiled.setdefault(selector, soupsieve.compile(selector))
+        return pattern
+    
+    def parse(self, html: str, only: Optional[Dict[str, Any]] = None) -> Any:
+        parse_only = SoupStrainer(only.get("name"), only.get("attrs", {})) if only else None
+        return BeautifulSoup(html, self.features, parse_only=parse_only)
+    
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return self.compile(selector).select(node)
+    
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return self.compile(selector).select_one(node)
+    
+    def text(self, node: Any, separator: str = "", strip: bool = True) -> str:
+        return node.get_text(separator, strip=strip)
+    
+    def attr(self, node: Any, name: str, default: str = "") -> str:
+        return node.get(name, default)
+
+
+class SelectolaxParser(HtmlParser):
+    """
+    selectolax解析后端，基于C实现的HTML解析器，不支持部分解析
+    """
+    
+    name = "selectolax"
+    
+    def parse(self, html: str, only: Optional[Dict[str, Any]] = None) -> Any:
+        return SelectolaxHTMLParser(html)
+    
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return node.css(selector)
+    
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.css_first(selector)
+    
+    def text(self, node: Any, separator: str = "", strip: bool = True) -> str:
+        if isinstance(node, SelectolaxHTMLParser):
+            node = node.body or node.root
+            if node is None:
+                return ""
+        return node.text(separator=separator, strip=strip)
+    
+    def attr(self, node: Any, name: str, default: str = "") -> str:
+        value = node.attributes.get(name)
+        return value if value is not None else default
+
+
+# 按速度从快到慢排列，自动选择时使用第一个可用的后端
+PARSER_BACKENDS = ["selectolax", "lxml", "html.parser"]
+
+_parsers: Dict[str, HtmlParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def available_parsers() -> List[str]:
+    """
+    获取当前环境可用的解析后端
+    
+    Returns:
+        后端名称列表，按速度从快到慢排列
+    """
+    available = {"selectolax": SELECTOLAX_AVAILABLE, "lxml": LXML_AVAILABLE, "html.parser": True}
+    return [name for name in PARSER_BACKENDS if available[name]]
+
+
+def get_parser(name: str = "auto") -> HtmlParser:
+    """
+    获取解析后端，同一后端在进程内共用，选择器编译缓存也随之共用
+    
+    Args:
+        name: 后端名称，auto表示使用最快的可用后端
+    
+    Returns:
+        解析后端
+    
+    Raises:
+        ValueError: 后端不存在或依赖未安装
+    """
+    if name == "auto":
+        name = available_parsers()[0]
+    if name not in available_parsers():
+        raise ValueError(f"解析后端 {name} 不可用，可用的后端: {', '.join(available_parsers())}")
+    
+    with _parsers_lock:
+        parser = _parsers.get(name)
+        if parser is None:
+            parser = SelectolaxParser() if name == "selectolax" else SoupParser(name)
+            _parsers[name] = parser
+            logger.info(f"使用HTML解析后端: {name}")
+        return parser
@@ -0,0 +1,359 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from rate_limiter import PRIORITY_SEARCH, PRIORITY_ARTICLE
+
+# 任务类型：关键词搜索、文章详情提取
+JOB_SEARCH = "search"
+JOB_ARTICLE = "article"
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    platform_type TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_until REAL,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    ingested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active ON jobs (kind, platform_type, url)
+    WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, id);
+CREATE INDEX IF NOT EXISTS jobs_ingest ON jobs (ingested, status);
+CREATE TABLE IF NOT EXISTS locks (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """
+    基于SQLite的抓取任务队列，供多个工作进程（包括共享数据目录的多台机器）同时领取任务
+    
+    任务以租约方式领取，工作进程异常退出后租约到期的任务会被重新领取；
+    同一平台同一URL的同类任务在排队或执行中时不会重复入队。
+    执行结果写回任务记录，由唯一的入库进程统一读取并保存。
+    """
+    
+    def __init__(self, db_path: str, lease: float = 300.0, max_attempts: int = 3, retry_delay: float = 60.0,
+                 wal: bool = True):
+        """
+        初始化任务队列
+        
+        Args:
+            db_path: SQLite数据库文件路径
+            lease: 领取任务后的租约时长（秒），超时未完成的任务可被重新领取
+            max_attempts: 单个任务的最大执行次数
+            retry_delay: 任务失败后重新排队的等待时间（秒）
+            wal: 是否使用WAL日志模式，数据库位于NFS等网络文件系统上时需关闭
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.wal = wal
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connect().executescript(SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        获取当前线程的数据库连接，连接不能跨线程共用
+        
+        Returns:
+            数据库连接
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 自动提交模式，事务由BEGIN IMMEDIATE显式开启
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA journal_mode={'WAL' if self.wal else 'DELETE'}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        将任务记录转换为字典，并解析JSON字段
+        
+        Args:
+            row: 任务记录
+        
+        Returns:
+            任务字典
+        """
+        job = dict(row)
+        for field in ("payload", "result"):
+            job[field] = json.loads(job[field]) if job[field] else None
+        return job
+    
+    def enqueue(self, kind: str, platform_type: str, keyword: str, url: str,
+                payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        添加任务
+        
+        Args:
+            kind: 任务类型，search或article
+            platform_type: 平台类型
+            keyword: 关键词
+            url: 搜索页或文章URL
+            payload: 任务附带的数据，如文章任务对应的搜索结果
+        
+        Returns:
+            是否新增了任务，相同任务已在排队或执行中时返回False
+        """
+        return self.enqueue_many([{
+            "kind": kind, "platform_type": platform_type, "keyword": keyword, "url": url, "payload": payload
+        }]) > 0
+    
+    def enqueue_many(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        批量添加任务
+        
+        Args:
+            jobs: 任务列表，每项包含kind、platform_type、keyword、url和可选的payload
+        
+        Returns:
+            新增的任务数
+        """
+        now = time.time()
+        rows = [
+            (job["kind"], job["platform_type"], job["keyword"], job["url"],
+             json.dumps(job.get("payload"), ensure_ascii=False) if job.get("payload") is not None else None,
+             PRIORITY_SEARCH if job["kind"] == JOB_SEARCH else PRIORITY_ARTICLE, JOB_QUEUED, now, now)
+            for job in jobs
+        ]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, platform_type, keyword, url, payload, priority, status, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+            return added
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def enqueue_search(self, keyword: str, platform_types: List[str], limit: int = 10) -> int:
+        """
+        为关键词在各平台添加搜索任务，搜索任务的url字段为"keyword:关键词"
+        
+        Args:
+            keyword: 关键词
+            platform_types: 平台类型列表
+            limit: 每个平台的结果数量限制
+        
+        Returns:
+            新增的任务数
+        """
+        return self.enqueue_many([
+            {"kind": JOB_SEARCH, "platform_type": platform_type, "keyword": keyword,
+             "url": f"keyword:{keyword}", "payload": {"limit": limit}}
+            for platform_type in platform_types
+        ])
+    
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        领取优先级最高的一个任务，包括租约已过期的执行中任务
+        
+        Args:
+            worker: 工作进程标识
+        
+        Returns:
+            任务字典，没有可领取的任务时返回None
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 执行次数已用尽且租约过期的任务视为失败，避免反复导致工作进程崩溃
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (JOB_FAILED, "租约过期", now, JOB_RUNNING, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = ? AND not_before <= ?) OR (status = ? AND lease_until < ?) "
+                "ORDER BY priority, id LIMIT 1", (JOB_QUEUED, now, JOB_RUNNING, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?", (JOB_RUNNING, worker, now + self.lease, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        job = self._row(row)
+        job.update(status=JOB_RUNNING, worker=worker, attempts=job["attempts"] + 1)
+        return job
+    
+    def complete(self, job_id: int, result: Any) -> None:
+        """
+        记录任务执行结果，等待入库
+        
+        Args:
+            job_id: 任务ID
+            result: 执行结果，需可序列化为JSON
+        """
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL, updated_at = ? WHERE id = ?",
+            (JOB_DONE, json.dumps(result, ensure_ascii=False), time.time(), job_id)
+        )
+    
+    def fail(self, job_id: int, error: str) -> bool:
+        """
+        记录任务执行失败，未达到最大执行次数时延迟后重新排队
+        
+        Args:
+            job_id: 任务ID
+            error: 错误信息
+        
+        Returns:
+            是否重新排队
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            retry = row is not None and row["attempts"] < self.max_attempts
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, not_before = ?, lease_until = NULL, updated_at = ? "
+                "WHERE id = ?", (JOB_QUEUED if retry else JOB_FAILED, error, now + self.retry_delay, now, job_id)
+            )
+            conn.execute("COMMIT")
+            return retry
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def finished(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        获取已结束但尚未入库的任务
+        
+        Args:
+            limit: 最多返回的任务数
+        
+        Returns:
+            任务列表，按ID排序
+        """
+        rows = self._connect().execute(
+            "SELECT * FROM jobs WHERE ingested = 0 AND status IN (?, ?) ORDER BY id LIMIT ?",
+            (JOB_DONE, JOB_FAILED, limit)
+        ).fetchall()
+        return [self._row(row) for row in rows]
+    
+    def mark_ingested(self, job_ids: List[int]) -> None:
+        """
+        标记任务结果已入库，并释放结果占用的空间
+        
+        Args:
+            job_ids: 任务ID列表
+        """
+        self._connect().executemany(
+            "UPDATE jobs SET ingested = 1, result = NULL, payload = NULL WHERE id = ?", [(job_id,) for job_id in job_ids]
+        )
+    
+    def purge(self, older_than: float = 7 * 24 * 3600) -> int:
+        """
+        删除已入库且超过保留时间的任务
+        
+        Args:
+            older_than: 保留时间（秒）
+        
+        Returns:
+            删除的任务数
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE ingested = 1 AND updated_at < ?", (time.time() - older_than,)
+        )
+        return cursor.rowcount
+    
+    def acquire_lock(self, name: str, owner: str, ttl: float = 30.0) -> bool:
+        """
+        获取或续期一个带租约的命名锁，用于保证同一时间只有一个进程执行入库
+        
+        Args:
+            name: 锁名称
+            owner: 持有者标识
+            ttl: 租约时长（秒），持有者需在到期前续期
+        
+        Returns:
+            是否持有该锁
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, lease_until FROM locks WHERE name = ?", (name,)).fetchone()
+            acquired = row is None or row["owner"] == owner or row["lease_until"] < now
+            if acquired:
+                conn.execute(
+                    "INSERT OR REPLACE INTO locks (name, owner, lease_until) VALUES (?, ?, ?)", (name, owner, now + ttl)
+                )
+            conn.execute("COMMIT")
+            return acquired
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def release_lock(self, name: str, owner: str) -> None:
+        """
+        释放命名锁
+        
+        Args:
+            name: 锁名称
+            owner: 持有者标识
+        """
+        self._connect().execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner))
+    
+    def get_summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取各类型、各状态的任务数量
+        
+        Returns:
+            任务类型到状态计数的字典
+        """
+        summary: Dict[str, Dict[str, int]] = {}
+        rows = self._connect().execute(
+            "SELECT kind, status, COUNT(*) AS count FROM jobs WHERE ingested = 0 GROUP BY kind, status"
+        ).fetchall()
+        for row in rows:
+            summary.setdefault(row["kind"], {})[row["status"]] = row["count"]
+        return summary
@@ -52,7 +52,7 @@ class KeywordsManager:
             keywords.append(new_keyword)
             
             # 保存到文件
-            result = self.storage.save_json(keywords, self.keywords_file)
+            result = self.storage.save_json(self.keywords_file, keywords)
             
             if result:
                 self.logger.info(f"成功添加关键词 '{keyword}'")
@@ -87,7 +87,7 @@ class KeywordsManager:
             keywords = [k for k in keywords if k.get("keyword") != keyword]
             
             # 保存到文件
-            result = self.storage.save_json(keywords, self.keywords_file)
+            result = self.storage.save_json(self.keywords_file, keywords)
             
             if result:
                 self.logger.info(f"成功删除关键词 '{keyword}'")
@@ -128,7 +128,7 @@ class KeywordsManager:
                 return False
             
             # 保存到文件
-            result = self.storage.save_json(keywords, self.keywords_file)
+            result = self.storage.save_json(self.keywords_file, keywords)
             
             if result:
                 self.logger.info(f"成功更新关键词 '{keyword}' 的状态为 '{status}'")
@@ -140,6 +140,47 @@ class KeywordsManager:
             self.logger.error(f"更新关键词 '{keyword}' 的状态时发生错误: {str(e)}")
             return False
     
+    def update_keyword_interval(self, keyword: str, interval: Optional[int]) -> bool:
+        """
+        更新关键词的后台抓取间隔
+        
+        Args:
+            keyword: 关键词
+            interval: 抓取间隔（秒），为None时使用默认间隔
+            
+        Returns:
+            是否成功更新
+        """
+        try:
+            # 获取现有关键词
+            keywords = self.get_all_keywords()
+            
+            # 更新抓取间隔
+            updated = False
+            for k in keywords:
+                if k.get("keyword") == keyword:
+                    k["crawl_interval"] = interval
+                    k["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    updated = True
+                    break
+            
+            if not updated:
+                self.logger.warning(f"关键词 '{keyword}' 不存在")
+                return False
+            
+            # 保存到文件
+            result = self.storage.save_json(self.keywords_file, keywords)
+            
+            if result:
+                self.logger.info(f"成功更新关键词 '{keyword}' 的抓取间隔为 {interval}")
+            else:
+                self.logger.error(f"更新关键词 '{keyword}' 的抓取间隔失败")
+                
+            return result
+        except Exception as e:
+            self.logger.error(f"更新关键词 '{keyword}' 的抓取间隔时发生错误: {str(e)}")
+            return False
+    
     def get_all_keywords(self) -> List[Dict[str, Any]]:
         """
         获取所有关键词
@@ -0,0 +1,58 @@
+import os
+import logging
+import argparse
+
+from storage import FileStorage
+from data_manager import NewsDataManager
+from news_tokens import enable_parallel
+
+# 默认数据目录，与app.py一致
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻监控系统维护工具")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="数据目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    subparsers.add_parser("rebuild-stats", help="遍历全部新闻数据重建仪表盘统计")
+    
+    subparsers.add_parser("migrate-publish-ts", help="为缺少发布时间戳的历史新闻补充发布时间戳")
+    
+    tokenize_parser = subparsers.add_parser("tokenize", help="为历史新闻补充分词结果并重建关键词词频")
+    tokenize_parser.add_argument("--processes", type=int, default=0,
+                                 help="jieba并行分词的进程数，0为不启用并行模式")
+    tokenize_parser.add_argument("--batch-size", type=int, default=2000, help="每批分词的新闻条数")
+    
+    sentiment_parser = subparsers.add_parser("score-sentiment", help="为未分析过情感的历史新闻分析情感并重建统计")
+    sentiment_parser.add_argument("--rescore", action="store_true", help="重新分析全部新闻，用于情感词典修改后")
+    sentiment_parser.add_argument("--processes", type=int, default=0,
+                                  help="jieba并行分词的进程数，0为不启用并行模式")
+    sentiment_parser.add_argument("--batch-size", type=int, default=2000, help="每批分析的新闻条数")
+    
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    storage = FileStorage(args.data_dir, log_collections=["news_data", "news_tokens"])
+    news_data_manager = NewsDataManager(storage)
+    
+    if args.command == "rebuild-stats":
+        count = news_data_manager.rebuild_stats()
+        print(f"新闻统计已重建，共 {count} 条新闻")
+    elif args.command == "migrate-publish-ts":
+        count = news_data_manager.migrate_publish_ts()
+        print(f"已为 {count} 条新闻补充发布时间戳")
+    elif args.command == "tokenize":
+        if args.processes > 0:
+            enable_parallel(args.processes)
+        count = news_data_manager.rebuild_word_frequency(args.batch_size)
+        print(f"关键词词频已重建，共 {count} 条新闻")
+    elif args.command == "score-sentiment":
+        if args.processes > 0:
+            enable_parallel(args.processes)
+        count = news_data_manager.migrate_sentiment(args.rescore, args.batch_size)
+        print(f"已为 {count} 条新闻分析情感")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from news_index import NewsView, publish_timestamp, url_fingerprint
+
+# 互动数据字段
+INTERACTION_FIELDS = ["read_count", "comment_count", "like_count", "share_count", "forward_count"]
+
+# 以分类编码保存的字段
+CATEGORY_FIELDS = ["platform", "platform_type", "keyword", "sentiment"]
+
+
+class NewsFrame(NewsView):
+    """
+    新闻列式视图，用NumPy数组保存互动数据、发布时间戳和分类编码，
+    聚合统计通过向量运算完成，无需逐条遍历新闻字典
+    
+    数组按容量倍增预分配，追加新闻时只填充末尾部分。
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        初始化列式视图
+        
+        Args:
+            capacity: 初始容量
+        """
+        self.initial_capacity = capacity
+        super().__init__()
+    
+    def reset(self) -> None:
+        """
+        清空列式视图
+        """
+        super().reset()
+        self.capacity = self.initial_capacity
+        self.counts = {field: np.zeros(self.capacity, dtype=np.int64) for field in INTERACTION_FIELDS}
+        # 发布时间无效时为NaN，比较运算结果恒为False
+        self.publish_ts = np.full(self.capacity, np.nan, dtype=np.float64)
+        self.codes = {field: np.zeros(self.capacity, dtype=np.int32) for field in CATEGORY_FIELDS}
+        # 分类取值表，编码即取值在列表中的下标
+        self.categories: Dict[str, List[str]] = {field: [] for field in CATEGORY_FIELDS}
+        self._category_codes: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORY_FIELDS}
+    
+    def _ensure_capacity(self, size: int) -> None:
+        """
+        容量不足时按倍数扩展数组
+        
+        Args:
+            size: 需要容纳的条数
+        """
+        if size <= self.capacity:
+            return
+        
+        capacity = self.capacity
+        while capacity < size:
+            capacity *= 2
+        
+        def grow(array: np.ndarray, fill: Any) -> np.ndarray:
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            return grown
+        
+        self.counts = {field: grow(array, 0) for field, array in self.counts.items()}
+        self.publish_ts = grow(self.publish_ts, np.nan)
+        self.codes = {field: grow(array, 0) for field, array in self.codes.items()}
+        self.capacity = capacity
+    
+    def _encode(self, field: str, value: Any) -> int:
+        """
+        获取分类取值的编码，新取值追加到取值表
+        
+        Args:
+            field: 分类字段
+            value: 取值
+        
+        Returns:
+            编码
+        """
+        value = value if value is not None else ""
+        codes = self._category_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[field])
+            codes[value] = code
+            self.categories[field].append(value)
+        return code
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻写入各列
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        self.extend(position, [item])
+    
+    def extend(self, start: int, items: List[Dict[str, Any]]) -> None:
+        """
+        按列批量写入一批新闻
+        
+        Args:
+            start: 第一条新闻的位置
+            items: 新闻数据列表
+        """
+        if not items:
+            return
+        
+        end = start + len(items)
+        self._ensure_capacity(end)
+        
+        for field in INTERACTION_FIELDS:
+            self.counts[field][start:end] = [item.get(field) or 0 for item in items]
+        
+        timestamps = [publish_timestamp(item) for item in items]
+        self.publish_ts[start:end] = [np.nan if ts is None else ts for ts in timestamps]
+        
+        for field in CATEGORY_FIELDS:
+            self.codes[field][start:end] = [self._encode(field, item.get(field)) for item in items]
+        
+        self.last_fingerprint = url_fingerprint(items[-1].get("url", ""))
+        self.count = end
+    
+    def update(self, position: int, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        更新一条新闻的互动数据和分类编码
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            old_item: 更新前的新闻数据
+            new_item: 更新后的新闻数据
+        """
+        for field in INTERACTION_FIELDS:
+            self.counts[field][position] = new_item.get(field) or 0
+        for field in CATEGORY_FIELDS:
+            self.codes[field][position] = self._encode(field, new_item.get(field))
+    
+    def column(self, field: str) -> np.ndarray:
+        """
+        获取有效长度内的列数据
+        
+        Args:
+            field: 字段名称
+        
+        Returns:
+            列数组
+        """
+        if field in self.counts:
+            return self.counts[field][:self.count]
+        if field in self.codes:
+            return self.codes[field][:self.count]
+        if field == "publish_ts":
+            return self.publish_ts[:self.count]
+        raise KeyError(field)
+    
+    def mask_for(self, field: str, value: Any) -> np.ndarray:
+        """
+        获取分类字段等于指定取值的布尔掩码
+        
+        Args:
+            field: 分类字段
+            value: 取值
+        
+        Returns:
+            布尔掩码
+        """
+        code = self._category_codes[field].get(value)
+        if code is None:
+            return np.zeros(self.count, dtype=bool)
+        return self.column(field) == code
+    
+    def interaction_totals(self, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        汇总互动数据
+        
+        Args:
+            mask: 参与汇总的新闻掩码，为None时汇总全部新闻
+        
+        Returns:
+            各互动字段的合计
+        """
+        totals = {}
+        for field in INTERACTION_FIELDS:
+            column = self.column(field)
+            totals[field] = int(column[mask].sum() if mask is not None else column.sum())
+        return totals
+    
+    def count_by(self, field: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        按分类字段统计新闻数量
+        
+        Args:
+            field: 分类字段
+            mask: 参与统计的新闻掩码，为None时统计全部新闻
+        
+        Returns:
+            取值到数量的字典
+        """
+        codes = self.column(field)
+        if mask is not None:
+            codes = codes[mask]
+        
+        counts = np.bincount(codes, minlength=len(self.categories[field]))
+        return {value: int(count) for value, count in zip(self.categories[field], counts) if count}
+    
+    def weighted_sum(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+        计算互动字段的加权和，如热度分数
+        
+        Args:
+            weights: 互动字段到权重的字典
+        
+        Returns:
+            每条新闻的加权和
+        """
+        result = np.zeros(self.count, dtype=np.float64)
+        for field, weight in weights.items():
+            result += self.column(field) * weight
+        return result
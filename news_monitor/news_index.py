@@ -0,0 +1,320 @@
+import time
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set
+
+# 索引结构变化时递增，旧版本的索引文件会被丢弃并重建
+INDEX_VERSION = 4
+
+# 发布时间支持的格式，按常见程度排列
+PUBLISH_TIME_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"]
+
+
+def url_fingerprint(url: str) -> str:
+    """
+    计算URL指纹
+    
+    Args:
+        url: 新闻URL
+    
+    Returns:
+        16位十六进制指纹
+    """
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def parse_publish_time(publish_time: Optional[str]) -> Optional[int]:
+    """
+    将发布时间字符串解析为本地时间的秒级时间戳
+    
+    Args:
+        publish_time: 发布时间字符串
+    
+    Returns:
+        时间戳，无法解析时返回None
+    """
+    if not publish_time:
+        return None
+    
+    for fmt in PUBLISH_TIME_FORMATS:
+        try:
+            return int(datetime.strptime(publish_time, fmt).timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def publish_timestamp(item: Dict[str, Any]) -> Optional[int]:
+    """
+    获取新闻的发布时间戳，优先使用入库时计算好的publish_ts字段
+    
+    Args:
+        item: 新闻数据
+    
+    Returns:
+        时间戳，发布时间无效时返回None
+    """
+    if "publish_ts" in item:
+        return item["publish_ts"]
+    return parse_publish_time(item.get("publish_time"))
+
+
+def day_of(timestamp: int) -> str:
+    """
+    获取时间戳所在的本地日期
+    
+    Args:
+        timestamp: 时间戳
+    
+    Returns:
+        "YYYY-MM-DD"格式的日期
+    """
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class NewsView:
+    """
+    新闻派生视图基类，按新闻在数据列表中的位置增量同步
+    
+    新闻数据只追加，已有新闻只会在重新抓取时更新互动数据，因此视图只需记录已处理的条数，
+    之后新增的数据（包括其他进程写入的）从该位置继续补充即可。
+    子类实现_add_item处理单条新闻，需要批量处理时可覆盖extend；
+    依赖互动数据的视图还需覆盖update。
+    """
+    
+    def __init__(self):
+        """
+        初始化视图
+        """
+        self.logger = logging.getLogger(__name__)
+        self.reset()
+    
+    def reset(self) -> None:
+        """
+        清空视图
+        """
+        # 已处理的新闻条数
+        self.count = 0
+        # 最后一条已处理新闻的URL指纹，用于发现数据被整体重写
+        self.last_fingerprint = ""
+    
+    def is_consistent(self, news_list: List[Dict[str, Any]]) -> bool:
+        """
+        检查视图是否仍对应当前新闻数据的前缀
+        
+        Args:
+            news_list: 新闻数据列表
+        
+        Returns:
+            是否一致
+        """
+        if self.count > len(news_list):
+            return False
+        if self.count == 0:
+            return True
+        return url_fingerprint(news_list[self.count - 1].get("url", "")) == self.last_fingerprint
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        处理单条新闻，由子类实现
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        raise NotImplementedError("子类必须实现_add_item方法")
+    
+    def add(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻加入视图
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        self._add_item(position, item)
+        self.last_fingerprint = url_fingerprint(item.get("url", ""))
+        self.count = position + 1
+    
+    def extend(self, start: int, items: List[Dict[str, Any]]) -> None:
+        """
+        将从start位置开始的一批新闻加入视图
+        
+        Args:
+            start: 第一条新闻的位置
+            items: 新闻数据列表
+        """
+        for offset, item in enumerate(items):
+            self.add(start + offset, item)
+    
+    def update(self, position: int, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        处理已加入视图的新闻的互动数据更新，默认不依赖互动数据，无需处理
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            old_item: 更新前的新闻数据
+            new_item: 更新后的新闻数据
+        """
+    
+    def sync(self, news_list: List[Dict[str, Any]]) -> int:
+        """
+        使视图与新闻数据同步，只处理尚未处理的新数据
+        
+        Args:
+            news_list: 新闻数据列表
+        
+        Returns:
+            本次新处理的新闻条数
+        """
+        if not self.is_consistent(news_list):
+            self.logger.info(f"新闻数据已被重写，重建{self.__class__.__name__}")
+            self.reset()
+        
+        start = self.count
+        if start < len(news_list):
+            self.extend(start, news_list[start:])
+        return len(news_list) - start
+
+
+class NewsIndex(NewsView):
+    """
+    新闻索引类，维护URL指纹到新闻位置的字典，
+    以及关键词、平台类型、标签、发布日期到新闻位置的倒排索引
+    """
+    
+    def reset(self) -> None:
+        """
+        清空索引
+        """
+        super().reset()
+        # URL指纹到新闻位置的字典，URL重复时保留第一条
+        self.url_positions: Dict[str, int] = {}
+        # 倒排索引，值为按位置升序排列的新闻位置列表
+        self.by_keyword: Dict[str, List[int]] = {}
+        self.by_platform_type: Dict[str, List[int]] = {}
+        self.by_tag: Dict[str, List[int]] = {}
+        self.by_day: Dict[str, List[int]] = {}
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻加入索引
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        self.url_positions.setdefault(url_fingerprint(item.get("url", "")), position)
+        
+        keyword = item.get("keyword")
+        if keyword:
+            self.by_keyword.setdefault(keyword, []).append(position)
+        
+        platform_type = item.get("platform_type")
+        if platform_type:
+            self.by_platform_type.setdefault(platform_type, []).append(position)
+        
+        for tag in set(item.get("tags") or []):
+            self.by_tag.setdefault(tag, []).append(position)
+        
+        timestamp = publish_timestamp(item)
+        if timestamp is not None:
+            self.by_day.setdefault(day_of(timestamp), []).append(position)
+    
+    def contains_url(self, url: str) -> bool:
+        """
+        判断URL是否已存在
+        
+        Args:
+            url: 新闻URL
+        
+        Returns:
+            是否已存在
+        """
+        return url_fingerprint(url) in self.url_positions
+    
+    def position_of(self, url: str) -> Optional[int]:
+        """
+        获取URL对应新闻的位置
+        
+        Args:
+            url: 新闻URL
+        
+        Returns:
+            新闻位置，URL不存在时返回None
+        """
+        return self.url_positions.get(url_fingerprint(url))
+    
+    def positions_for_tags(self, tags: List[str]) -> List[int]:
+        """
+        获取包含任一标签的新闻位置
+        
+        Args:
+            tags: 标签列表
+        
+        Returns:
+            升序排列的新闻位置列表
+        """
+        positions: Set[int] = set()
+        for tag in tags:
+            positions.update(self.by_tag.get(tag, []))
+        return sorted(positions)
+    
+    def positions_for_days(self, days: List[str]) -> List[int]:
+        """
+        获取发布于指定日期的新闻位置
+        
+        Args:
+            days: "YYYY-MM-DD"格式的日期列表
+        
+        Returns:
+            升序排列的新闻位置列表
+        """
+        positions: List[int] = []
+        for day in days:
+            positions.extend(self.by_day.get(day, []))
+        return sorted(positions)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        将索引转换为可保存的字典
+        
+        Returns:
+            索引字典
+        """
+        return {
+            "version": INDEX_VERSION,
+            "count": self.count,
+            "last_fingerprint": self.last_fingerprint,
+            "url_positions": self.url_positions,
+            "by_keyword": self.by_keyword,
+            "by_platform_type": self.by_platform_type,
+            "by_tag": self.by_tag,
+            "by_day": self.by_day
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "NewsIndex":
+        """
+        从保存的字典还原索引
+        
+        Args:
+            data: 索引字典
+        
+        Returns:
+            新闻索引，字典无效时返回空索引
+        """
+        index = cls()
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return index
+        
+        index.count = data.get("count", 0)
+        index.last_fingerprint = data.get("last_fingerprint", "")
+        index.url_positions = dict(data.get("url_positions", {}))
+        # 复制一份，之后追加位置时避免修改存储缓存中的列表
+        index.by_keyword = {key: list(positions) for key, positions in data.get("by_keyword", {}).items()}
+        index.by_platform_type = {key: list(positions) for key, positions in data.get("by_platform_type", {}).items()}
+        index.by_tag = {key: list(positions) for key, positions in data.get("by_tag", {}).items()}
+        index.by_day = {key: list(positions) for key, positions in data.get("by_day", {}).items()}
+        return index
@@ -1,32 +1,44 @@
 import os
 import logging
-import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 import random
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import re
+import json
+
+from crawler_runtime import CrawlerRuntime, get_default_runtime, DEFAULT_USER_AGENT
+from driver_pool import create_chrome_driver
+from rate_limiter import PRIORITY_SEARCH, PRIORITY_ARTICLE
 
 class BaseCrawler:
     """
     爬虫基类，定义通用方法
     """
     
-    def __init__(self):
+    # 平台类型，用于统计快速路径和浏览器回退的次数
+    platform_type = ""
+    
+    # 只能通过浏览器完成的方法，调度时放入单独的线程池执行；
+    # 有快速路径的方法只在回退时借用浏览器，仍按普通请求调度
+    selenium_methods = ()
+    
+    def __init__(self, runtime: Optional[CrawlerRuntime] = None):
         """
         初始化爬虫
+        
+        Args:
+            runtime: 爬虫运行时，默认使用进程内共用的运行时
         """
         self.logger = logging.getLogger(__name__)
+        self.runtime = runtime or get_default_runtime()
+        self.parser = self.runtime.parser
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'User-Agent': DEFAULT_USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive',
@@ -34,12 +46,13 @@ class BaseCrawler:
             'Cache-Control': 'max-age=0'
         }
     
-    def get_html(self, url: str) -> Optional[str]:
+    def get_html(self, url: str, priority: int = PRIORITY_ARTICLE) -> Optional[str]:
         """
         获取网页HTML内容
         
         Args:
             url: 网页URL
+            priority: 请求优先级，搜索页使用PRIORITY_SEARCH
             
         Returns:
             HTML内容或None
@@ -50,7 +63,8 @@ class BaseCrawler:
                 url = 'https://' + url
                 
             self.logger.info(f"正在获取URL: {url}")
-            response = requests.get(url, headers=self.headers, timeout=10)
+            # 通过共用会话请求，复用同一域名的已有连接
+            response = self.runtime.get(url, headers=self.headers, priority=priority)
             response.raise_for_status()
             response.encoding = response.apparent_encoding
             return response.text
@@ -58,18 +72,19 @@ class BaseCrawler:
             self.logger.error(f"获取HTML内容失败: {str(e)}")
             return None
     
-    def parse_html(self, html: str) -> Optional[BeautifulSoup]:
+    def parse_html(self, html: str, only: Optional[Dict[str, Any]] = None) -> Optional[Any]:
         """
         解析HTML内容
         
         Args:
             html: HTML内容
+            only: 部分解析条件，只构建匹配元素的子树，如{"name": "div", "attrs": {"class": "vrwrap"}}
             
         Returns:
-            BeautifulSoup对象或None
+            文档根节点或None
         """
         try:
-            return BeautifulSoup(html, 'html.parser')
+            return self.parser.parse(html, only)
         except Exception as e:
             self.logger.error(f"解析HTML内容失败: {str(e)}")
             return None
@@ -99,23 +114,60 @@ class BaseCrawler:
         """
         raise NotImplementedError("子类必须实现extract_news_info方法")
     
+    def run_with_fallback(self, fast_path: Callable[[], Any], browser_path: Callable[[], Any]) -> Any:
+        """
+        先尝试不启动浏览器的快速路径，快速路径没有得到结果时再使用Selenium
+        
+        Args:
+            fast_path: 快速路径，所需元素缺失时返回空结果
+            browser_path: 浏览器路径
+            
+        Returns:
+            快速路径或浏览器路径的结果
+        """
+        try:
+            result = fast_path()
+        except Exception as e:
+            self.logger.warning(f"快速路径抓取失败: {str(e)}")
+            result = None
+        
+        if result:
+            self.runtime.record_fetch(self.platform_type, fallback=False)
+            return result
+        
+        self.logger.info(f"{self.platform_type} 快速路径未获取到内容，使用浏览器抓取")
+        self.runtime.record_fetch(self.platform_type, fallback=True)
+        return browser_path()
+    
+    def extract_embedded_json(self, html: str, pattern: str) -> Optional[Any]:
+        """
+        提取页面脚本中内嵌的JSON数据
+        
+        Args:
+            html: HTML内容
+            pattern: 正则表达式，第一个分组为JSON文本
+            
+        Returns:
+            解析后的数据或None
+        """
+        match = re.search(pattern, html, re.S)
+        if not match:
+            return None
+        try:
+            return json.loads(match.group(1))
+        except ValueError as e:
+            self.logger.warning(f"解析内嵌JSON失败: {str(e)}")
+            return None
+    
     def init_selenium_driver(self) -> Optional[webdriver.Chrome]:
         """
-        初始化Selenium驱动
+        初始化独立的Selenium驱动，由调用方负责关闭；抓取时应使用运行时的驱动池
         
         Returns:
             Chrome驱动或None
         """
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument(f'user-agent={self.headers["User-Agent"]}')
-            
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-            return driver
+            return create_chrome_driver(self.headers["User-Agent"])
         except Exception as e:
             self.logger.error(f"初始化Selenium驱动失败: {str(e)}")
             return None
@@ -180,11 +232,16 @@ class TencentNewsCrawler(BaseCrawler):
     腾讯新闻爬虫
     """
     
-    def __init__(self):
+    platform_type = "tencent"
+    
+    def __init__(self, runtime: Optional[CrawlerRuntime] = None):
         """
         初始化腾讯新闻爬虫
+        
+        Args:
+            runtime: 爬虫运行时，默认使用进程内共用的运行时
         """
-        super().__init__()
+        super().__init__(runtime)
         self.base_url = "https://news.qq.com"
         self.search_url = "https://www.sogou.com/sogou?query={}&ie=utf8&insite=news.qq.com"
     
@@ -204,36 +261,36 @@ class TencentNewsCrawler(BaseCrawler):
             url = self.search_url.format(keyword)
             
             # 获取搜索结果页面
-            html = self.get_html(url)
+            html = self.get_html(url, priority=PRIORITY_SEARCH)
             if not html:
                 return []
                 
-            # 解析HTML
-            soup = self.parse_html(html)
+            # 只解析搜索结果项
+            soup = self.parse_html(html, only={"name": "div", "attrs": {"class": "vrwrap"}})
             if not soup:
                 return []
                 
             # 提取搜索结果
             results = []
-            items = soup.select('.vrwrap')
+            items = self.parser.select(soup, '.vrwrap')
             
             for item in items[:limit]:
                 try:
                     # 提取标题和链接
-                    title_elem = item.select_one('.vr-title a')
+                    title_elem = self.parser.select_one(item, '.vr-title a')
                     if not title_elem:
                         continue
                         
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
+                    title = self.parser.text(title_elem)
+                    link = self.parser.attr(title_elem, 'href')
                     
                     # 提取摘要
-                    summary_elem = item.select_one('.vr-summary')
-                    summary = summary_elem.get_text(strip=True) if summary_elem else ""
+                    summary_elem = self.parser.select_one(item, '.vr-summary')
+                    summary = self.parser.text(summary_elem) if summary_elem else ""
                     
                     # 提取时间
-                    time_elem = item.select_one('.fz-mid.c-color-gray2')
-                    publish_time = time_elem.get_text(strip=True) if time_elem else ""
+                    time_elem = self.parser.select_one(item, '.fz-mid.c-color-gray2')
+                    publish_time = self.parser.text(time_elem) if time_elem else ""
                     
                     # 规范化URL
                     if link and not link.startswith('http'):
@@ -281,20 +338,20 @@ class TencentNewsCrawler(BaseCrawler):
                 return None
                 
             # 提取标题
-            title_elem = soup.select_one('.LEFT h1') or soup.select_one('h1')
-            title = title_elem.get_text(strip=True) if title_elem else ""
+            title_elem = self.parser.select_one(soup, '.LEFT h1') or self.parser.select_one(soup, 'h1')
+            title = self.parser.text(title_elem) if title_elem else ""
             
             # 提取内容
-            content_elems = soup.select('.content-article p')
-            content = '\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
+            content_elems = self.parser.select(soup, '.content-article p')
+            content = '\n'.join([self.parser.text(p) for p in content_elems if self.parser.text(p)])
             
             # 提取时间
-            time_elem = soup.select_one('.LEFT .article-info .time') or soup.select_one('.time')
-            publish_time = time_elem.get_text(strip=True) if time_elem else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            time_elem = self.parser.select_one(soup, '.LEFT .article-info .time') or self.parser.select_one(soup, '.time')
+            publish_time = self.parser.text(time_elem) if time_elem else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # 提取标签
-            tag_elems = soup.select('.LEFT .tags a') or soup.select('.tags a')
-            tags = [tag.get_text(strip=True) for tag in tag_elems if tag.get_text(strip=True)]
+            tag_elems = self.parser.select(soup, '.LEFT .tags a') or self.parser.select(soup, '.tags a')
+            tags = [self.parser.text(tag) for tag in tag_elems if self.parser.text(tag)]
             
             # 提取阅读量、评论数等
             read_count = random.randint(1000, 10000)  # 模拟数据
@@ -326,11 +383,16 @@ class ToutiaoNewsCrawler(BaseCrawler):
     今日头条爬虫
     """
     
-    def __init__(self):
+    platform_type = "toutiao"
+    
+    def __init__(self, runtime: Optional[CrawlerRuntime] = None):
         """
         初始化今日头条爬虫
+        
+        Args:
+            runtime: 爬虫运行时，默认使用进程内共用的运行时
         """
-        super().__init__()
+        super().__init__(runtime)
         self.base_url = "https://www.toutiao.com"
         self.search_url = "https://www.sogou.com/sogou?query={}&ie=utf8&insite=www.toutiao.com"
     
@@ -350,36 +412,36 @@ class ToutiaoNewsCrawler(BaseCrawler):
             url = self.search_url.format(keyword)
             
             # 获取搜索结果页面
-            html = self.get_html(url)
+            html = self.get_html(url, priority=PRIORITY_SEARCH)
             if not html:
                 return []
                 
-            # 解析HTML
-            soup = self.parse_html(html)
+            # 只解析搜索结果项
+            soup = self.parse_html(html, only={"name": "div", "attrs": {"class": "vrwrap"}})
             if not soup:
                 return []
                 
             # 提取搜索结果
             results = []
-            items = soup.select('.vrwrap')
+            items = self.parser.select(soup, '.vrwrap')
             
             for item in items[:limit]:
                 try:
                     # 提取标题和链接
-                    title_elem = item.select_one('.vr-title a')
+                    title_elem = self.parser.select_one(item, '.vr-title a')
                     if not title_elem:
                         continue
                         
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
+                    title = self.parser.text(title_elem)
+                    link = self.parser.attr(title_elem, 'href')
                     
                     # 提取摘要
-                    summary_elem = item.select_one('.vr-summary')
-                    summary = summary_elem.get_text(strip=True) if summary_elem else ""
+                    summary_elem = self.parser.select_one(item, '.vr-summary')
+                    summary = self.parser.text(summary_elem) if summary_elem else ""
                     
                     # 提取时间
-                    time_elem = item.select_one('.fz-mid.c-color-gray2')
-                    publish_time = time_elem.get_text(strip=True) if time_elem else ""
+                    time_elem = self.parser.select_one(item, '.fz-mid.c-color-gray2')
+                    publish_time = self.parser.text(time_elem) if time_elem else ""
                     
                     # 规范化URL
                     if link and not link.startswith('http'):
@@ -407,7 +469,78 @@ class ToutiaoNewsCrawler(BaseCrawler):
     
     def extract_news_info(self, url: str) -> Optional[Dict[str, Any]]:
         """
-        提取新闻信息
+        提取新闻信息，文章正文在服务端渲染的HTML中时无需启动浏览器
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息或None
+        """
+        return self.run_with_fallback(
+            lambda: self._extract_news_info_http(url),
+            lambda: self._extract_news_info_browser(url)
+        )
+    
+    def _extract_news_info_http(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过HTTP请求提取新闻信息
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息，页面缺少标题或正文时返回None
+        """
+        html = self.get_html(url)
+        if not html:
+            return None
+        
+        soup = self.parse_html(html)
+        if not soup:
+            return None
+        
+        # 标题和正文由脚本渲染时页面中没有这些元素，需要回退到浏览器
+        title_elem = self.parser.select_one(soup, 'h1')
+        content_elems = self.parser.select(soup, '.article-content p')
+        if not title_elem or not content_elems:
+            return None
+        
+        title = self.parser.text(title_elem)
+        content = '\n'.join([self.parser.text(p) for p in content_elems if self.parser.text(p)])
+        
+        time_elem = self.parser.select_one(soup, '.article-meta .time')
+        publish_time = self.parser.text(time_elem) if time_elem else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        tags = [self.parser.text(tag) for tag in self.parser.select(soup, '.tag-list .tag') if self.parser.text(tag)]
+        
+        read_count_elem = self.parser.select_one(soup, '.read-count')
+        read_count = self.extract_number(self.parser.text(read_count_elem, strip=False)) if read_count_elem else random.randint(1000, 10000)
+        
+        comment_count_elem = self.parser.select_one(soup, '.comment-count')
+        comment_count = self.extract_number(self.parser.text(comment_count_elem, strip=False)) if comment_count_elem else random.randint(10, 500)
+        
+        like_count = random.randint(50, 1000)  # 模拟数据
+        share_count = random.randint(5, 100)  # 模拟数据
+        
+        return {
+            "title": title,
+            "content": content,
+            "url": url,
+            "publish_time": publish_time,
+            "platform": "今日头条",
+            "platform_type": "toutiao",
+            "tags": tags,
+            "read_count": read_count,
+            "comment_count": comment_count,
+            "like_count": like_count,
+            "share_count": share_count,
+            "forward_count": 0
+        }
+    
+    def _extract_news_info_browser(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过Selenium提取新闻信息
         
         Args:
             url: 新闻URL
@@ -416,13 +549,9 @@ class ToutiaoNewsCrawler(BaseCrawler):
             新闻信息或None
         """
         try:
-            # 今日头条需要使用Selenium
-            driver = self.init_selenium_driver()
-            if not driver:
-                return None
-                
-            try:
-                # 访问URL
+            with self.runtime.driver_pool.driver() as driver:
+                # 访问URL，浏览器请求同样受域名限速
+                self.runtime.rate_limiter.acquire(url)
                 driver.get(url)
                 
                 # 等待页面加载
@@ -470,8 +599,6 @@ class ToutiaoNewsCrawler(BaseCrawler):
                     "share_count": share_count,
                     "forward_count": 0
                 }
-            finally:
-                driver.quit()
         except Exception as e:
             self.logger.error(f"提取新闻信息失败: {str(e)}")
             return None
@@ -482,11 +609,16 @@ class WeixinCrawler(BaseCrawler):
     微信公众号爬虫
     """
     
-    def __init__(self):
+    platform_type = "weixin"
+    
+    def __init__(self, runtime: Optional[CrawlerRuntime] = None):
         """
         初始化微信公众号爬虫
+        
+        Args:
+            runtime: 爬虫运行时，默认使用进程内共用的运行时
         """
-        super().__init__()
+        super().__init__(runtime)
         self.base_url = "https://mp.weixin.qq.com"
         self.search_url = "https://weixin.sogou.com/weixin?type=2&query={}"
     
@@ -506,40 +638,40 @@ class WeixinCrawler(BaseCrawler):
             url = self.search_url.format(keyword)
             
             # 获取搜索结果页面
-            html = self.get_html(url)
+            html = self.get_html(url, priority=PRIORITY_SEARCH)
             if not html:
                 return []
                 
-            # 解析HTML
-            soup = self.parse_html(html)
+            # 只解析搜索结果列表
+            soup = self.parse_html(html, only={"name": "ul", "attrs": {"class": "news-list"}})
             if not soup:
                 return []
                 
             # 提取搜索结果
             results = []
-            items = soup.select('.news-box .news-list li')
+            items = self.parser.select(soup, '.news-list li')
             
             for item in items[:limit]:
                 try:
                     # 提取标题和链接
-                    title_elem = item.select_one('h3 a')
+                    title_elem = self.parser.select_one(item, 'h3 a')
                     if not title_elem:
                         continue
                         
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
+                    title = self.parser.text(title_elem)
+                    link = self.parser.attr(title_elem, 'href')
                     
                     # 提取摘要
-                    summary_elem = item.select_one('.txt-info')
-                    summary = summary_elem.get_text(strip=True) if summary_elem else ""
+                    summary_elem = self.parser.select_one(item, '.txt-info')
+                    summary = self.parser.text(summary_elem) if summary_elem else ""
                     
                     # 提取公众号名称
-                    account_elem = item.select_one('.account')
-                    account = account_elem.get_text(strip=True) if account_elem else ""
+                    account_elem = self.parser.select_one(item, '.account')
+                    account = self.parser.text(account_elem) if account_elem else ""
                     
                     # 提取时间
-                    time_elem = item.select_one('.s2')
-                    publish_time = time_elem.get_text(strip=True) if time_elem else ""
+                    time_elem = self.parser.select_one(item, '.s2')
+                    publish_time = self.parser.text(time_elem) if time_elem else ""
                     
                     # 规范化URL
                     if link and not link.startswith('http'):
@@ -568,7 +700,77 @@ class WeixinCrawler(BaseCrawler):
     
     def extract_news_info(self, url: str) -> Optional[Dict[str, Any]]:
         """
-        提取新闻信息
+        提取新闻信息，公众号文章正文在服务端渲染的HTML中时无需启动浏览器
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息或None
+        """
+        return self.run_with_fallback(
+            lambda: self._extract_news_info_http(url),
+            lambda: self._extract_news_info_browser(url)
+        )
+    
+    def _extract_news_info_http(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过HTTP请求提取新闻信息
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息，页面缺少标题或正文时返回None
+        """
+        html = self.get_html(url)
+        if not html:
+            return None
+        
+        soup = self.parse_html(html)
+        if not soup:
+            return None
+        
+        # 验证页面或已删除的文章没有这些元素，需要回退到浏览器
+        title_elem = self.parser.select_one(soup, '#activity-name')
+        content_elem = self.parser.select_one(soup, '#js_content')
+        if not title_elem or not content_elem:
+            return None
+        
+        title = self.parser.text(title_elem)
+        content = self.parser.text(content_elem, '\n')
+        
+        author_elem = self.parser.select_one(soup, '#js_name')
+        author = self.parser.text(author_elem) if author_elem else ""
+        
+        # 发布时间通常由脚本填充，HTML中可能为空
+        time_elem = self.parser.select_one(soup, '#publish_time')
+        publish_time = self.parser.text(time_elem) if time_elem else ""
+        if not publish_time:
+            publish_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        read_count = random.randint(1000, 50000)  # 模拟数据
+        like_count = random.randint(100, 5000)  # 模拟数据
+        
+        return {
+            "title": title,
+            "content": content,
+            "url": url,
+            "author": author,
+            "publish_time": publish_time,
+            "platform": "微信公众号",
+            "platform_type": "weixin",
+            "tags": [],
+            "read_count": read_count,
+            "comment_count": 0,  # 微信公众号不显示评论数
+            "like_count": like_count,
+            "share_count": 0,
+            "forward_count": 0
+        }
+    
+    def _extract_news_info_browser(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过Selenium提取新闻信息
         
         Args:
             url: 新闻URL
@@ -577,13 +779,9 @@ class WeixinCrawler(BaseCrawler):
             新闻信息或None
         """
         try:
-            # 微信公众号需要使用Selenium
-            driver = self.init_selenium_driver()
-            if not driver:
-                return None
-                
-            try:
-                # 访问URL
+            with self.runtime.driver_pool.driver() as driver:
+                # 访问URL，浏览器请求同样受域名限速
+                self.runtime.rate_limiter.acquire(url)
                 driver.get(url)
                 
                 # 等待页面加载
@@ -626,8 +824,6 @@ class WeixinCrawler(BaseCrawler):
                     "share_count": 0,
                     "forward_count": 0
                 }
-            finally:
-                driver.quit()
         except Exception as e:
             self.logger.error(f"提取新闻信息失败: {str(e)}")
             return None
@@ -638,17 +834,22 @@ class WeiboCrawler(BaseCrawler):
     微博爬虫
     """
     
-    def __init__(self):
+    platform_type = "weibo"
+    
+    def __init__(self, runtime: Optional[CrawlerRuntime] = None):
         """
         初始化微博爬虫
+        
+        Args:
+            runtime: 爬虫运行时，默认使用进程内共用的运行时
         """
-        super().__init__()
+        super().__init__(runtime)
         self.base_url = "https://weibo.com"
         self.search_url = "https://s.weibo.com/weibo?q={}"
     
     def search_keyword(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        搜索关键词
+        搜索关键词，搜索结果在服务端渲染的HTML中时无需启动浏览器
         
         Args:
             keyword: 关键词
@@ -657,17 +858,96 @@ class WeiboCrawler(BaseCrawler):
         Returns:
             搜索结果列表
         """
-        try:
-            # 微博需要使用Selenium
-            driver = self.init_selenium_driver()
-            if not driver:
-                return []
-                
+        return self.run_with_fallback(
+            lambda: self._search_keyword_http(keyword, limit),
+            lambda: self._search_keyword_browser(keyword, limit)
+        )
+    
+    def _search_keyword_http(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        通过HTTP请求搜索关键词
+        
+        Args:
+            keyword: 关键词
+            limit: 结果数量限制
+            
+        Returns:
+            搜索结果列表，页面没有搜索结果卡片时返回空列表
+        """
+        html = self.get_html(self.search_url.format(keyword), priority=PRIORITY_SEARCH)
+        if not html:
+            return []
+        
+        # 只解析搜索结果卡片
+        soup = self.parse_html(html, only={"name": "div", "attrs": {"class": "card-wrap"}})
+        if not soup:
+            return []
+        
+        results = []
+        for item in self.parser.select(soup, '.card-wrap')[:limit]:
             try:
+                content_elem = self.parser.select_one(item, '.content p.txt')
+                content = self.parser.text(content_elem) if content_elem else ""
+                
+                user_elem = self.parser.select_one(item, '.content .name')
+                user = self.parser.text(user_elem) if user_elem else ""
+                
+                # 时间链接同时也是微博详情页链接
+                time_elem = self.parser.select_one(item, '.content .from a')
+                publish_time = self.parser.text(time_elem) if time_elem else ""
+                link = self.parser.attr(time_elem, 'href') if time_elem else ""
+                if link and not link.startswith('http'):
+                    link = "https:" + link if link.startswith('//') else self.normalize_url(link, self.base_url)
+                
+                like_elem = self.parser.select_one(item, '.card-act .pos')
+                like_count = self.extract_number(self.parser.text(like_elem, strip=False)) if like_elem else 0
+                
+                forward_elem = self.parser.select_one(item, '.card-act ul li:nth-child(2)')
+                forward_count = self.extract_number(self.parser.text(forward_elem, strip=False)) if forward_elem else 0
+                
+                comment_elem = self.parser.select_one(item, '.card-act ul li:nth-child(3)')
+                comment_count = self.extract_number(self.parser.text(comment_elem, strip=False)) if comment_elem else 0
+                
+                if content:
+                    results.append({
+                        "title": content[:30] + "..." if len(content) > 30 else content,
+                        "content": content,
+                        "url": link,
+                        "user": user,
+                        "publish_time": publish_time,
+                        "platform": "微博",
+                        "platform_type": "weibo",
+                        "keyword": keyword,
+                        "like_count": like_count,
+                        "forward_count": forward_count,
+                        "comment_count": comment_count,
+                        "read_count": random.randint(1000, 100000),  # 模拟数据
+                        "share_count": random.randint(10, 1000)  # 模拟数据
+                    })
+            except Exception as e:
+                self.logger.error(f"解析搜索结果项失败: {str(e)}")
+                continue
+        
+        return results
+    
+    def _search_keyword_browser(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        通过Selenium搜索关键词
+        
+        Args:
+            keyword: 关键词
+            limit: 结果数量限制
+            
+        Returns:
+            搜索结果列表
+        """
+        try:
+            with self.runtime.driver_pool.driver() as driver:
                 # 构建搜索URL
                 url = self.search_url.format(keyword)
                 
-                # 访问URL
+                # 访问URL，浏览器请求同样受域名限速
+                self.runtime.rate_limiter.acquire(url, PRIORITY_SEARCH)
                 driver.get(url)
                 
                 # 等待页面加载
@@ -729,15 +1009,13 @@ class WeiboCrawler(BaseCrawler):
                         continue
                 
                 return results
-            finally:
-                driver.quit()
         except Exception as e:
             self.logger.error(f"搜索关键词 '{keyword}' 失败: {str(e)}")
             return []
     
     def extract_news_info(self, url: str) -> Optional[Dict[str, Any]]:
         """
-        提取新闻信息
+        提取新闻信息，优先读取页面内嵌的$render_data数据，无需启动浏览器
         
         Args:
             url: 新闻URL
@@ -745,14 +1023,72 @@ class WeiboCrawler(BaseCrawler):
         Returns:
             新闻信息或None
         """
+        return self.run_with_fallback(
+            lambda: self._extract_news_info_http(url),
+            lambda: self._extract_news_info_browser(url)
+        )
+    
+    def _extract_news_info_http(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过HTTP请求提取页面内嵌的微博数据
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息，页面没有内嵌数据时返回None
+        """
+        html = self.get_html(url)
+        if not html:
+            return None
+        
+        render_data = self.extract_embedded_json(html, r'var \$render_data = (\[.*?\])\[0\]')
+        status = render_data[0].get("status") if render_data else None
+        if not status:
+            return None
+        
+        # 正文为HTML片段，去掉表情图片和链接标签
+        content = self.parser.text(self.parser.parse(status.get("text", "")))
+        if not content:
+            return None
+        
+        user = (status.get("user") or {}).get("screen_name", "")
+        
         try:
-            # 微博需要使用Selenium
-            driver = self.init_selenium_driver()
-            if not driver:
-                return None
-                
-            try:
-                # 访问URL
+            publish_time = datetime.strptime(status.get("created_at", ""), "%a %b %d %H:%M:%S %z %Y").strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            publish_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        return {
+            "title": content[:30] + "..." if len(content) > 30 else content,
+            "content": content,
+            "url": url,
+            "user": user,
+            "publish_time": publish_time,
+            "platform": "微博",
+            "platform_type": "weibo",
+            "tags": [],
+            "read_count": random.randint(1000, 100000),  # 模拟数据
+            "comment_count": self.extract_number(str(status.get("comments_count", 0))),
+            "like_count": self.extract_number(str(status.get("attitudes_count", 0))),
+            "share_count": random.randint(10, 1000),  # 模拟数据
+            "forward_count": self.extract_number(str(status.get("reposts_count", 0)))
+        }
+    
+    def _extract_news_info_browser(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过Selenium提取新闻信息
+        
+        Args:
+            url: 新闻URL
+            
+        Returns:
+            新闻信息或None
+        """
+        try:
+            with self.runtime.driver_pool.driver() as driver:
+                # 访问URL，浏览器请求同样受域名限速
+                self.runtime.rate_limiter.acquire(url)
                 driver.get(url)
                 
                 # 等待页面加载
@@ -797,8 +1133,6 @@ class WeiboCrawler(BaseCrawler):
                     "share_count": random.randint(10, 1000),  # 模拟数据
                     "forward_count": forward_count
                 }
-            finally:
-                driver.quit()
         except Exception as e:
             self.logger.error(f"提取新闻信息失败: {str(e)}")
             return None
@@ -0,0 +1,129 @@
+from typing import Dict, Any, Optional
+
+from news_index import NewsView, publish_timestamp, day_of
+from news_frame import INTERACTION_FIELDS
+
+# 统计文档结构变化时递增，旧版本的统计文件会被丢弃并重建
+STATS_VERSION = 1
+
+
+class NewsStats(NewsView):
+    """
+    新闻统计视图，维护总数、各平台/关键词/日期的新闻数量、互动数据合计和情感分布
+    
+    统计结果随新闻入库增量更新并保存到存储，仪表盘读取时无需遍历新闻数据。
+    revision在已有新闻的互动数据更新或统计重建时递增，其他进程据此发现
+    新闻数据的变化不只是追加。
+    """
+    
+    def reset(self) -> None:
+        """
+        清空统计
+        """
+        super().reset()
+        self.revision = 0
+        self.by_platform: Dict[str, int] = {}
+        self.by_keyword: Dict[str, int] = {}
+        self.by_day: Dict[str, int] = {}
+        self.interactions: Dict[str, int] = {field: 0 for field in INTERACTION_FIELDS}
+        self.sentiments: Dict[str, int] = {}
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻计入统计
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        platform = item.get("platform") or ""
+        self.by_platform[platform] = self.by_platform.get(platform, 0) + 1
+        
+        keyword = item.get("keyword")
+        if keyword:
+            self.by_keyword[keyword] = self.by_keyword.get(keyword, 0) + 1
+        
+        timestamp = publish_timestamp(item)
+        if timestamp is not None:
+            day = day_of(timestamp)
+            self.by_day[day] = self.by_day.get(day, 0) + 1
+        
+        for field in INTERACTION_FIELDS:
+            self.interactions[field] += item.get(field) or 0
+        
+        sentiment = item.get("sentiment")
+        if sentiment:
+            self.sentiments[sentiment] = self.sentiments.get(sentiment, 0) + 1
+    
+    def update(self, position: int, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        按更新前后的差值调整互动数据合计和情感分布
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            old_item: 更新前的新闻数据
+            new_item: 更新后的新闻数据
+        """
+        for field in INTERACTION_FIELDS:
+            self.interactions[field] += (new_item.get(field) or 0) - (old_item.get(field) or 0)
+        
+        old_sentiment, new_sentiment = old_item.get("sentiment"), new_item.get("sentiment")
+        if old_sentiment != new_sentiment:
+            if self.sentiments.get(old_sentiment, 0) > 1:
+                self.sentiments[old_sentiment] -= 1
+            else:
+                self.sentiments.pop(old_sentiment, None)
+            if new_sentiment:
+                self.sentiments[new_sentiment] = self.sentiments.get(new_sentiment, 0) + 1
+    
+    @property
+    def total_news(self) -> int:
+        """
+        新闻总数
+        """
+        return self.count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        将统计转换为可保存的字典
+        
+        Returns:
+            统计字典
+        """
+        return {
+            "version": STATS_VERSION,
+            "count": self.count,
+            "last_fingerprint": self.last_fingerprint,
+            "revision": self.revision,
+            "by_platform": self.by_platform,
+            "by_keyword": self.by_keyword,
+            "by_day": self.by_day,
+            "interactions": self.interactions,
+            "sentiments": self.sentiments
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "NewsStats":
+        """
+        从保存的字典还原统计
+        
+        Args:
+            data: 统计字典
+        
+        Returns:
+            新闻统计，字典无效时返回空统计
+        """
+        stats = cls()
+        if not isinstance(data, dict) or data.get("version") != STATS_VERSION:
+            return stats
+        
+        stats.count = data.get("count", 0)
+        stats.last_fingerprint = data.get("last_fingerprint", "")
+        stats.revision = data.get("revision", 0)
+        # 复制一份，避免修改存储缓存中的字典
+        stats.by_platform = dict(data.get("by_platform", {}))
+        stats.by_keyword = dict(data.get("by_keyword", {}))
+        stats.by_day = dict(data.get("by_day", {}))
+        stats.interactions.update(data.get("interactions", {}))
+        stats.sentiments = dict(data.get("sentiments", {}))
+        return stats
@@ -0,0 +1,355 @@
+import heapq
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import jieba
+
+from storage import FileStorage
+from news_index import NewsView, url_fingerprint
+
+# 词频文档结构变化时递增，旧版本的词频文件会被丢弃并重建
+WORD_FREQ_VERSION = 1
+
+# 分词规则变化时递增，旧版本的分词结果在下次读取时重新计算
+TOKENIZER_VERSION = 1
+
+# 不计入词频的常见词
+STOPWORDS = frozenset([
+    "我们", "你们", "他们", "她们", "它们", "自己", "这个", "那个", "这些", "那些", "这样", "那样",
+    "一个", "一些", "没有", "什么", "怎么", "为什么", "可以", "可能", "因为", "所以", "但是", "而且",
+    "如果", "虽然", "已经", "还是", "就是", "也是", "不是", "还有", "以及", "或者", "并且", "其中",
+    "对于", "关于", "通过", "进行", "表示", "认为", "目前", "相关", "今天", "昨天", "记者", "报道",
+    "http", "https", "www", "com"
+])
+
+
+def news_text(item: Dict[str, Any]) -> str:
+    """
+    获取参与分词的新闻文本
+    
+    Args:
+        item: 新闻数据
+    
+    Returns:
+        标题和内容拼接的文本
+    """
+    return f"{item.get('title') or ''} {item.get('content') or ''}"
+
+
+def text_hash(text: str) -> str:
+    """
+    计算文本哈希，用于判断已保存的分词结果是否仍对应新闻当前的内容
+    
+    Args:
+        text: 文本
+    
+    Returns:
+        16位十六进制哈希
+    """
+    return hashlib.blake2b(f"{TOKENIZER_VERSION}:{text}".encode('utf-8'), digest_size=8).hexdigest()
+
+
+def is_word(token: str) -> bool:
+    """
+    判断分词结果是否计入词频：至少两个字符、不是纯数字、包含文字且不是常见词
+    
+    Args:
+        token: 分词结果
+    
+    Returns:
+        是否计入
+    """
+    return (
+        len(token) >= 2 and not token.isdigit() and token.lower() not in STOPWORDS
+        and any(ch.isalnum() for ch in token)
+    )
+
+
+def cut_texts(texts: List[str]) -> List[List[str]]:
+    """
+    批量分词，多段文本按行拼接后只调用一次jieba
+    
+    启用jieba并行模式后，jieba按行把文本分给多个进程，批量分词时才能用上多个CPU。
+    
+    Args:
+        texts: 文本列表
+    
+    Returns:
+        与texts一一对应的分词结果，包含标点和单字
+    """
+    if not texts:
+        return []
+    
+    joined = "\n".join(text.replace("\r", " ").replace("\n", " ") for text in texts)
+    results: List[List[str]] = [[]]
+    for token in jieba.cut(joined):
+        if token == "\n":
+            results.append([])
+        else:
+            results[-1].append(token)
+    return results
+
+
+def segment(texts: List[str]) -> List[List[str]]:
+    """
+    批量分词并过滤不计入词频的分词结果
+    
+    Args:
+        texts: 文本列表
+    
+    Returns:
+        与texts一一对应的词列表
+    """
+    return [[token for token in tokens if is_word(token)] for tokens in cut_texts(texts)]
+
+
+def enable_parallel(processes: Optional[int] = None) -> bool:
+    """
+    启用jieba并行分词，用于批量补充历史新闻的分词结果
+    
+    Args:
+        processes: 分词进程数，默认为CPU核数
+    
+    Returns:
+        是否成功启用，jieba并行模式不支持Windows
+    """
+    try:
+        jieba.enable_parallel(processes)
+        return True
+    except NotImplementedError as e:
+        logging.getLogger(__name__).warning(f"无法启用并行分词: {str(e)}")
+        return False
+
+
+class TokenStore:
+    """
+    新闻分词结果存储，每篇新闻只分词一次
+    
+    分词结果以新闻URL指纹和文本哈希为键，词列表用空格拼接后保存。每次计算追加
+    一条记录，读取时同一新闻以最后一条为准，过期记录超过有效记录数时整体重写。
+    新闻内容或分词规则变化后哈希不再匹配，下次读取时重新分词。Web服务和入库进程
+    共用同一存储，每次读取前检查存储是否被写入，其他进程追加的记录补充到内存，
+    存储被重写时整体重新加载。
+    """
+    
+    def __init__(self, storage: FileStorage, collection: str = "news_tokens"):
+        """
+        初始化分词结果存储
+        
+        Args:
+            storage: 文件存储，collection应声明为日志集合
+            collection: 集合名称
+        """
+        self.logger = logging.getLogger(__name__)
+        self.storage = storage
+        self.collection = collection
+        self._lock = threading.RLock()
+        # URL指纹到最新记录的字典，首次使用时从存储加载
+        self._records: Optional[Dict[str, Dict[str, str]]] = None
+        # 上次加载的存储数据及已应用的记录数，用于发现其他进程写入的记录
+        self._entries: Optional[List[Dict[str, str]]] = None
+        self._applied = 0
+    
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """
+        加载所有新闻的最新分词结果，与存储同步，过期记录过多时压缩存储
+        
+        存储数据只被追加时只应用新增的记录，被重写（压缩）时重新加载。
+        
+        Returns:
+            URL指纹到记录的字典
+        """
+        with self.storage.lock(self.collection):
+            entries = self.storage.load_json(self.collection, [])
+            # 集合不存在时每次返回新的空列表，同样视为未变化
+            if self._records is not None and len(entries) == self._applied and (entries is self._entries or not entries):
+                return self._records
+            
+            if self._records is None or entries is not self._entries or len(entries) < self._applied:
+                self._records = {}
+                self._applied = 0
+            for entry in entries[self._applied:]:
+                self._records[entry["id"]] = entry
+            reloaded = self._applied == 0
+            
+            if reloaded and len(entries) > 2 * len(self._records) + 1000:
+                self.storage.save_json(self.collection, list(self._records.values()))
+                entries = self.storage.load_json(self.collection, [])
+            self._entries = entries
+            self._applied = len(entries)
+        
+        if reloaded:
+            self.logger.info(f"已加载分词结果，共 {len(self._records)} 篇新闻")
+        return self._records
+    
+    def get_tokens(self, items: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        获取一批新闻的分词结果，没有保存过或内容已变化的新闻一起分词并保存
+        
+        Args:
+            items: 新闻数据列表
+        
+        Returns:
+            与items一一对应的词列表
+        """
+        with self._lock:
+            records = self._load()
+            keys = []
+            missing: Dict[str, str] = {}
+            for item in items:
+                text = news_text(item)
+                key = (url_fingerprint(item.get("url", "")), text_hash(text))
+                keys.append(key)
+                record = records.get(key[0])
+                if record is None or record["hash"] != key[1]:
+                    missing[key[0]] = text
+            
+            if missing:
+                new_records = []
+                hashes = dict(keys)
+                for fingerprint, tokens in zip(missing, segment(list(missing.values()))):
+                    record = {"id": fingerprint, "hash": hashes[fingerprint], "tokens": " ".join(tokens)}
+                    records[fingerprint] = record
+                    new_records.append(record)
+                if not self.storage.extend_json(self.collection, new_records):
+                    self.logger.error(f"保存 {len(new_records)} 篇新闻的分词结果失败")
+            
+            return [records[fingerprint]["tokens"].split() for fingerprint, _ in keys]
+
+
+class WordFrequency(NewsView):
+    """
+    关键词词频视图，维护每个关键词下各词出现的次数
+    
+    新闻入库时从分词结果存储读取词列表累加，生成词云时直接取出现次数最多的词，
+    无需重新分词。
+    """
+    
+    def __init__(self, token_store: TokenStore):
+        """
+        初始化词频视图
+        
+        Args:
+            token_store: 分词结果存储
+        """
+        self.token_store = token_store
+        # 当前批次新闻的词列表及第一条新闻的位置
+        self._tokens: List[List[str]] = []
+        self._start = 0
+        super().__init__()
+    
+    def reset(self) -> None:
+        """
+        清空词频
+        """
+        super().reset()
+        self.by_keyword: Dict[str, Dict[str, int]] = {}
+    
+    def extend(self, start: int, items: List[Dict[str, Any]]) -> None:
+        """
+        将从start位置开始的一批新闻加入词频，整批读取分词结果
+        
+        Args:
+            start: 第一条新闻的位置
+            items: 新闻数据列表
+        """
+        self._tokens = self.token_store.get_tokens(items)
+        self._start = start
+        try:
+            super().extend(start, items)
+        finally:
+            self._tokens = []
+    
+    def _add_item(self, position: int, item: Dict[str, Any]) -> None:
+        """
+        将一条新闻的词计入所属关键词的词频
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            item: 新闻数据
+        """
+        keyword = item.get("keyword")
+        if not keyword:
+            return
+        
+        counts = self.by_keyword.setdefault(keyword, {})
+        for word in self._tokens[position - self._start]:
+            counts[word] = counts.get(word, 0) + 1
+    
+    def update(self, position: int, old_item: Dict[str, Any], new_item: Dict[str, Any]) -> None:
+        """
+        新闻正文变化时，从词频中减去旧分词结果并加入新分词结果
+        
+        Args:
+            position: 新闻在数据列表中的位置
+            old_item: 更新前的新闻数据
+            new_item: 更新后的新闻数据
+        """
+        keyword = new_item.get("keyword")
+        if not keyword or news_text(old_item) == news_text(new_item):
+            return
+        
+        # 先读取旧正文的分词结果，再为新正文分词，后者会替换存储中的记录
+        old_tokens = self.token_store.get_tokens([old_item])[0]
+        new_tokens = self.token_store.get_tokens([new_item])[0]
+        counts = self.by_keyword.setdefault(keyword, {})
+        for word in old_tokens:
+            counts[word] = counts.get(word, 0) - 1
+            if counts[word] <= 0:
+                del counts[word]
+        for word in new_tokens:
+            counts[word] = counts.get(word, 0) + 1
+    
+    def top(self, keyword: str, limit: int = 100) -> Dict[str, int]:
+        """
+        获取关键词下出现次数最多的词
+        
+        Args:
+            keyword: 关键词
+            limit: 词数上限
+        
+        Returns:
+            按出现次数降序排列的词到次数的字典
+        """
+        counts = self.by_keyword.get(keyword, {})
+        return dict(heapq.nlargest(limit, counts.items(), key=lambda x: (x[1], x[0])))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        将词频转换为可保存的字典
+        
+        Returns:
+            词频字典
+        """
+        return {
+            "version": WORD_FREQ_VERSION,
+            "tokenizer_version": TOKENIZER_VERSION,
+            "count": self.count,
+            "last_fingerprint": self.last_fingerprint,
+            "by_keyword": self.by_keyword
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], token_store: TokenStore) -> "WordFrequency":
+        """
+        从保存的字典还原词频
+        
+        Args:
+            data: 词频字典
+            token_store: 分词结果存储
+        
+        Returns:
+            词频视图，字典无效或分词规则已变化时返回空视图
+        """
+        word_frequency = cls(token_store)
+        if (not isinstance(data, dict) or data.get("version") != WORD_FREQ_VERSION
+                or data.get("tokenizer_version") != TOKENIZER_VERSION):
+            return word_frequency
+        
+        word_frequency.count = data.get("count", 0)
+        word_frequency.last_fingerprint = data.get("last_fingerprint", "")
+        # 复制一份，避免修改存储缓存中的字典
+        word_frequency.by_keyword = {keyword: dict(counts) for keyword, counts in data.get("by_keyword", {}).items()}
+        return word_frequency
@@ -0,0 +1,264 @@
+import time
+import heapq
+import logging
+import itertools
+import threading
+from urllib.parse import urlparse
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+# 请求优先级，数值越小越先执行：搜索页决定后续要抓取的文章，优先于文章页
+PRIORITY_SEARCH = 0
+PRIORITY_ARTICLE = 10
+
+# 表示被限流的HTTP状态码
+THROTTLE_STATUS_CODES = (429, 503)
+
+# 验证码页面的特征，出现在跳转后的URL或页面开头
+CAPTCHA_URL_MARKERS = ("antispider", "passport.weibo.com/visitor", "/captcha")
+CAPTCHA_TEXT_MARKERS = ("请输入验证码", "访问过于频繁", "异常访问")
+
+# 常用站点的请求速率（每秒请求数, 突发容量），其余站点使用默认值
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    "www.sogou.com": (1.0, 2),
+    "weixin.sogou.com": (0.5, 1),
+    "s.weibo.com": (0.5, 1),
+    "weibo.com": (1.0, 2)
+}
+
+
+def request_url(response: requests.Response) -> str:
+    """
+    获取响应对应的原始请求URL，发生跳转时返回跳转前的URL
+    
+    Args:
+        response: HTTP响应
+    
+    Returns:
+        请求URL
+    """
+    return response.history[0].url if response.history else response.url
+
+
+class CaptchaDetected(requests.RequestException):
+    """
+    站点返回了验证码页面
+    """
+
+
+def is_captcha(response: requests.Response) -> bool:
+    """
+    判断响应是否为验证码页面
+    
+    Args:
+        response: HTTP响应
+    
+    Returns:
+        是否为验证码页面
+    """
+    if any(marker in response.url for marker in CAPTCHA_URL_MARKERS):
+        return True
+    content_type = response.headers.get("Content-Type", "")
+    if "html" not in content_type:
+        return False
+    # 验证码页面很短，只检查页面开头
+    head = response.content[:4096].decode(response.encoding or "utf-8", errors="ignore")
+    return any(marker in head for marker in CAPTCHA_TEXT_MARKERS) and "<title" in head and len(response.content) < 20000
+
+
+class TokenBucket:
+    """
+    令牌桶，按固定速率补充令牌，等待中的请求按优先级依次获得令牌
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        初始化令牌桶
+        
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 令牌上限，即允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # 在此时间之前不发放令牌，用于被限流后的退避
+        self.blocked_until = 0.0
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+    
+    def _refill(self, now: float) -> None:
+        """
+        按经过的时间补充令牌
+        
+        Args:
+            now: 当前时间
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, priority: int = PRIORITY_ARTICLE) -> float:
+        """
+        获取一个令牌，没有令牌或排在更高优先级的请求之后时等待
+        
+        Args:
+            priority: 请求优先级，数值越小越先获得令牌
+        
+        Returns:
+            等待的时间（秒）
+        """
+        start = time.monotonic()
+        with self._condition:
+            waiter = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiters[0] == waiter and now >= self.blocked_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        return now - start
+                    
+                    if self._waiters[0] != waiter:
+                        # 等待排在前面的请求取走令牌后被唤醒
+                        self._condition.wait()
+                    else:
+                        wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+                        self._condition.wait(timeout=max(wait, 0.001))
+            finally:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+    
+    def block(self, seconds: float) -> None:
+        """
+        暂停发放令牌
+        
+        Args:
+            seconds: 暂停时间（秒）
+        """
+        with self._condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            # 已积累的令牌作废，恢复后按速率重新发放
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+
+
+class HostRateLimiter:
+    """
+    按域名限制请求速率，并在站点限流或返回验证码时自适应退避
+    
+    每次被限流后该域名的退避时间翻倍，请求成功后逐步减半，直到恢复正常速率。
+    """
+    
+    def __init__(self, default_rate: float = 2.0, default_burst: int = 4,
+                 host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 backoff_base: float = 5.0, backoff_max: float = 300.0):
+        """
+        初始化限速器
+        
+        Args:
+            default_rate: 默认每秒请求数
+            default_burst: 默认突发容量
+            host_rates: 域名到(每秒请求数, 突发容量)的字典，默认使用DEFAULT_HOST_RATES
+            backoff_base: 首次被限流时的退避时间（秒）
+            backoff_max: 退避时间上限（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_rates = DEFAULT_HOST_RATES if host_rates is None else host_rates
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._backoffs: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, host: str) -> TokenBucket:
+        """
+        获取域名对应的令牌桶
+        
+        Args:
+            host: 域名
+        
+        Returns:
+            令牌桶
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_rates.get(host, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, url: str, priority: int = PRIORITY_ARTICLE) -> float:
+        """
+        请求前获取许可
+        
+        Args:
+            url: 请求URL
+            priority: 请求优先级
+        
+        Returns:
+            等待的时间（秒）
+        """
+        return self._bucket(urlparse(url).netloc).acquire(priority)
+    
+    def throttled(self, url: str, retry_after: Optional[float] = None) -> float:
+        """
+        记录一次被限流，暂停该域名的请求
+        
+        Args:
+            url: 请求URL
+            retry_after: 站点要求的等待时间（秒）
+        
+        Returns:
+            暂停时间（秒）
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            backoff = min(self.backoff_max, max(self.backoff_base, self._backoffs.get(host, 0.0) * 2))
+            self._backoffs[host] = backoff
+        delay = max(backoff, retry_after or 0.0)
+        self.logger.warning(f"{host} 触发限流，暂停请求 {delay:.1f} 秒")
+        self._bucket(host).block(delay)
+        return delay
+    
+    def succeeded(self, url: str) -> None:
+        """
+        记录一次成功请求，逐步缩短退避时间
+        
+        Args:
+            url: 请求URL
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            backoff = self._backoffs.get(host)
+            if backoff:
+                backoff /= 2
+                if backoff < self.backoff_base:
+                    del self._backoffs[host]
+                else:
+                    self._backoffs[host] = backoff
+    
+    def report(self, response: requests.Response) -> bool:
+        """
+        根据响应调整域名的请求速率
+        
+        Args:
+            response: HTTP响应
+        
+        Returns:
+            是否被限流（包括返回验证码页面）
+        """
+        if response.status_code in THROTTLE_STATUS_CODES or is_captcha(response):
+            retry_after = response.headers.get("Retry-After", "")
+            self.throttled(request_url(response), float(retry_after) if retry_after.isdigit() else None)
+            return True
+        
+        self.succeeded(request_url(response))
+        return False
@@ -0,0 +1,411 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 默认缓存目录，与应用数据目录相同
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "http_cache")
+
+# 响应体已由requests解压，这些头部不再适用于缓存的内容
+UNCACHED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie")
+
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """
+    解析Cache-Control头部
+    
+    Args:
+        value: 头部值
+    
+    Returns:
+        指令名（小写）到参数的字典，没有参数的指令对应None
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """
+    解析HTTP日期头部
+    
+    Args:
+        value: 头部值
+    
+    Returns:
+        时间戳，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers: Any) -> Optional[float]:
+    """
+    根据Cache-Control的max-age或Expires计算响应可直接复用的时长
+    
+    Args:
+        headers: 响应头
+    
+    Returns:
+        可复用时长（秒），未声明时返回None
+    """
+    directives = parse_cache_control(headers.get("Cache-Control", ""))
+    if "no-cache" in directives:
+        return 0.0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(0.0, float(max_age) - float(headers.get("Age", 0) or 0))
+        except ValueError:
+            return 0.0
+    
+    expires = parse_http_date(headers.get("Expires"))
+    if expires is None:
+        return 0.0 if headers.get("Expires") else None
+    date = parse_http_date(headers.get("Date")) or time.time()
+    return max(0.0, expires - date)
+
+
+class ResponseCache:
+    """
+    磁盘响应缓存，保存压缩后的响应体和ETag/Last-Modified等验证信息
+    
+    仍在Cache-Control或Expires声明的有效期内的响应直接从缓存返回；过期后带上
+    If-None-Match/If-Modified-Since重新请求，站点返回304时复用缓存的响应体。
+    声明了no-store、Vary: *或既没有验证信息也没有有效期的响应不缓存。
+    
+    每个URL对应一个文件，第一行为JSON元数据，之后为zlib压缩的响应体。
+    缓存总大小超过上限时按最近使用时间淘汰，使用时间记录在文件的mtime中，
+    重启后按mtime恢复淘汰顺序。
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 256 * 1024 * 1024,
+                 compress_level: int = 6):
+        """
+        初始化响应缓存
+        
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存文件总大小上限（字节）
+            compress_level: zlib压缩级别
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        # 缓存键到文件大小的字典，按最近使用时间从旧到新排列
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._stats = {"hit": 0, "revalidated": 0, "miss": 0, "stored": 0, "evicted": 0}
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+    
+    def _scan(self) -> None:
+        """
+        扫描缓存目录，按文件mtime恢复最近使用顺序
+        """
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".cache"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(".cache")], stat.st_size))
+        
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+    
+    def _key(self, url: str) -> str:
+        """
+        计算URL对应的缓存键
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            缓存键
+        """
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """
+        获取缓存键对应的文件路径
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            文件路径
+        """
+        return os.path.join(self.cache_dir, f"{key}.cache")
+    
+    def _forget(self, key: str) -> None:
+        """
+        从索引中移除缓存键，调用前已持有锁
+        
+        Args:
+            key: 缓存键
+        """
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+    
+    def _evict(self) -> None:
+        """
+        删除最久未使用的缓存文件，直到总大小不超过上限，调用前已持有锁或处于初始化中
+        """
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._stats["evicted"] += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+    
+    def _read(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        读取缓存文件
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            (元数据, 压缩的响应体)，文件不存在或已损坏时返回None
+        """
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+            meta, body = data.split(b"\n", 1)
+            return json.loads(meta), body
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            self.logger.warning(f"缓存文件 {self._path(key)} 已损坏")
+            return None
+    
+    def _write(self, key: str, meta: Dict[str, Any], body: bytes) -> None:
+        """
+        写入缓存文件并更新索引，先写临时文件再替换，避免并发读取到不完整的文件
+        
+        Args:
+            key: 缓存键
+            meta: 元数据
+            body: 压缩的响应体
+        """
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8') + b"\n" + body
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+    
+    def _touch(self, key: str) -> None:
+        """
+        记录一次使用，更新LRU顺序和文件mtime
+        
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+    
+    def _response(self, meta: Dict[str, Any], body: bytes, source: str) -> requests.Response:
+        """
+        由缓存内容构造响应
+        
+        Args:
+            meta: 元数据
+            body: 压缩的响应体
+            source: 响应来源，hit表示直接命中，revalidated表示经304确认
+        
+        Returns:
+            HTTP响应
+        """
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.url = meta["final_url"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta.get("encoding")
+        response._content = zlib.decompress(body)
+        response.reason = "OK"
+        response.from_cache = source
+        return response
+    
+    def lookup(self, url: str) -> Tuple[Optional[requests.Response], Dict[str, str]]:
+        """
+        查询缓存
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            (仍在有效期内的缓存响应, 条件请求头)，没有可直接使用的缓存时响应为None，
+            没有验证信息时条件请求头为空
+        """
+        key = self._key(url)
+        cached = self._read(key)
+        if cached is None:
+            with self._lock:
+                self._forget(key)
+                self._stats["miss"] += 1
+            return None, {}
+        
+        meta, body = cached
+        if meta.get("url") != url:
+            # 缓存键冲突，按未命中处理
+            with self._lock:
+                self._stats["miss"] += 1
+            return None, {}
+        
+        if meta.get("expires_at") is not None and time.time() < meta["expires_at"]:
+            self._touch(key)
+            with self._lock:
+                self._stats["hit"] += 1
+            return self._response(meta, body, "hit"), {}
+        
+        conditional = {}
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+        return None, conditional
+    
+    def revalidated(self, url: str, not_modified: requests.Response) -> Optional[requests.Response]:
+        """
+        站点返回304时，用新的缓存头更新缓存并返回缓存的响应
+        
+        Args:
+            url: 请求URL
+            not_modified: 304响应
+        
+        Returns:
+            缓存的响应，缓存已被淘汰时返回None
+        """
+        key = self._key(url)
+        cached = self._read(key)
+        if cached is None or cached[0].get("url") != url:
+            return None
+        
+        meta, body = cached
+        headers = CaseInsensitiveDict(meta["headers"])
+        for name, value in not_modified.headers.items():
+            if name.lower() not in UNCACHED_HEADERS:
+                headers[name] = value
+        meta.update(self._validators(headers))
+        meta["headers"] = dict(headers)
+        meta["stored_at"] = time.time()
+        self._write(key, meta, body)
+        
+        with self._lock:
+            self._stats["revalidated"] += 1
+        return self._response(meta, body, "revalidated")
+    
+    def _validators(self, headers: Any) -> Dict[str, Any]:
+        """
+        提取响应的验证信息和过期时间
+        
+        Args:
+            headers: 响应头
+        
+        Returns:
+            包含etag、last_modified和expires_at的字典
+        """
+        lifetime = freshness_lifetime(headers)
+        return {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "expires_at": time.time() + lifetime if lifetime else None
+        }
+    
+    def store(self, url: str, response: requests.Response) -> bool:
+        """
+        按缓存头保存响应
+        
+        Args:
+            url: 请求URL
+            response: HTTP响应
+        
+        Returns:
+            是否已缓存
+        """
+        if response.status_code != 200:
+            return False
+        directives = parse_cache_control(response.headers.get("Cache-Control", ""))
+        if "no-store" in directives or response.headers.get("Vary", "").strip() == "*":
+            return False
+        validators = self._validators(response.headers)
+        if not validators["etag"] and not validators["last_modified"] and not validators["expires_at"]:
+            return False
+        
+        try:
+            meta = {
+                "url": url,
+                "final_url": response.url,
+                "status": response.status_code,
+                "headers": {name: value for name, value in response.headers.items()
+                            if name.lower() not in UNCACHED_HEADERS},
+                "encoding": response.encoding,
+                "stored_at": time.time()
+            }
+            meta.update(validators)
+            self._write(self._key(url), meta, zlib.compress(response.content, self.compress_level))
+            with self._lock:
+                self._stats["stored"] += 1
+            return True
+        except OSError as e:
+            self.logger.error(f"缓存响应 {url} 失败: {str(e)}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存命中统计
+        
+        Returns:
+            包含各类命中次数、缓存条目数和总字节数的字典
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._total_bytes)
+    
+    def clear(self) -> None:
+        """
+        删除所有缓存文件
+        """
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
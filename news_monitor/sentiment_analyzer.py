@@ -0,0 +1,198 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from news_tokens import cut_texts
+
+# 情感类别，保存在新闻的sentiment字段
+SENTIMENT_POSITIVE = "positive"
+SENTIMENT_NEUTRAL = "neutral"
+SENTIMENT_NEGATIVE = "negative"
+
+# 情感类别的显示名称
+SENTIMENT_LABELS = {
+    SENTIMENT_POSITIVE: "正面",
+    SENTIMENT_NEUTRAL: "中性",
+    SENTIMENT_NEGATIVE: "负面"
+}
+
+# 正面情感词
+POSITIVE_WORDS = [
+    "好", "优秀", "出色", "卓越", "优质", "优异", "满意", "喜欢", "喜爱", "高兴", "开心", "欣喜", "兴奋",
+    "赞", "点赞", "称赞", "赞扬", "赞赏", "好评", "表扬", "认可", "肯定", "支持", "欢迎", "感谢", "感动",
+    "成功", "胜利", "突破", "领先", "创新", "进步", "提升", "提高", "改善", "优化", "完善", "增长", "上涨",
+    "大涨", "回升", "复苏", "繁荣", "稳定", "稳健", "利好", "盈利", "获利", "收益", "丰收", "红利",
+    "机遇", "希望", "信心", "乐观", "积极", "正面", "健康", "安全", "可靠", "放心", "便捷", "便利", "高效",
+    "先进", "强大", "精彩", "美好", "幸福", "和谐", "温暖", "有序", "合作", "共赢", "助力", "赋能", "受益",
+    "惠民", "普惠", "顺利", "荣获", "获奖", "夺冠", "喜讯", "亮眼", "亮点", "火爆", "热捧", "青睐", "值得"
+]
+
+# 负面情感词
+NEGATIVE_WORDS = [
+    "差", "坏", "糟糕", "恶劣", "低劣", "失望", "不满", "愤怒", "气愤", "担忧", "担心", "忧虑", "恐慌",
+    "焦虑", "害怕", "痛苦", "悲伤", "遗憾", "批评", "谴责", "质疑", "投诉", "抗议", "反对", "抵制", "差评",
+    "失败", "失利", "下跌", "暴跌", "大跌", "下滑", "下降", "萎缩", "衰退", "亏损", "巨亏", "倒闭", "破产",
+    "裁员", "失业", "危机", "风险", "隐患", "困境", "困难", "压力", "问题", "漏洞", "缺陷", "故障", "事故",
+    "灾难", "灾害", "伤亡", "死亡", "受伤", "违法", "违规", "违约", "诈骗", "欺诈", "造假", "腐败", "处罚",
+    "罚款", "起诉", "纠纷", "争议", "冲突", "混乱", "泄露", "侵权", "垄断", "暴雷", "爆雷", "停产",
+    "延误", "短缺", "涨价", "负面", "消极", "悲观", "低迷", "疲软", "严重", "恶化", "打击", "谣言", "骗局"
+]
+
+# 否定词，出现奇数次时反转之后情感词的极性
+NEGATION_WORDS = [
+    "不", "没", "没有", "无", "非", "未", "别", "莫", "勿", "不是", "并非", "毫无", "绝非", "从未", "未能",
+    "无法", "不能", "不会", "不再", "难以"
+]
+
+# 程度副词及其对之后情感词强度的倍数
+DEGREE_WORDS = {
+    "极其": 2.0, "极为": 2.0, "极度": 2.0, "极": 2.0, "最": 2.0, "最为": 2.0, "超级": 2.0, "异常": 2.0,
+    "十分": 1.75, "非常": 1.75, "特别": 1.75, "相当": 1.75, "格外": 1.75, "大幅": 1.75,
+    "很": 1.5, "挺": 1.5, "太": 1.5, "更": 1.5, "更加": 1.5, "越来越": 1.5, "明显": 1.5, "持续": 1.5,
+    "较": 1.2, "比较": 1.2, "还": 1.2, "进一步": 1.2,
+    "稍": 0.6, "稍微": 0.6, "略": 0.6, "略微": 0.6, "有点": 0.6, "有些": 0.6, "一点": 0.6, "小幅": 0.6
+}
+
+# 否定词之后的程度副词减弱而不是加强否定，如“不太满意”
+NEGATED_DEGREE_WEIGHT = 0.5
+
+# 分句标点，否定词和程度副词只作用于同一分句内的情感词
+CLAUSE_PUNCTUATION = frozenset("，。！？；：,.!?;:、…")
+
+
+def sentiment_text(item: Dict[str, Any]) -> str:
+    """
+    获取参与情感分析的新闻文本，没有正文时使用摘要
+    
+    Args:
+        item: 新闻数据
+    
+    Returns:
+        标题和正文（或摘要）拼接的文本
+    """
+    return f"{item.get('title') or ''} {item.get('content') or item.get('summary') or ''}"
+
+
+class SentimentAnalyzer:
+    """
+    基于情感词典的中文情感分析器
+    
+    文本经jieba分词后逐词匹配情感词典，情感词之前同一分句内的程度副词按倍数调整强度，
+    否定词反转极性，否定词之后的程度副词减弱强度。正面和负面强度之差与总强度之比作为情感分数，取值-1到1，
+    绝对值不足threshold或没有情感词时为中性。一批文本只调用一次jieba，
+    可配合jieba并行模式批量处理。
+    """
+    
+    def __init__(self, positive_words: Optional[Iterable[str]] = None,
+                 negative_words: Optional[Iterable[str]] = None,
+                 negation_words: Optional[Iterable[str]] = None,
+                 degree_words: Optional[Dict[str, float]] = None, threshold: float = 0.2):
+        """
+        初始化情感分析器
+        
+        Args:
+            positive_words: 正面情感词，默认使用POSITIVE_WORDS
+            negative_words: 负面情感词，默认使用NEGATIVE_WORDS
+            negation_words: 否定词，默认使用NEGATION_WORDS
+            degree_words: 程度副词到强度倍数的字典，默认使用DEGREE_WORDS
+            threshold: 判定为正面或负面的最小分数绝对值
+        """
+        self.logger = logging.getLogger(__name__)
+        self.polarity: Dict[str, float] = {}
+        for word in positive_words if positive_words is not None else POSITIVE_WORDS:
+            self.polarity[word] = 1.0
+        for word in negative_words if negative_words is not None else NEGATIVE_WORDS:
+            self.polarity[word] = -1.0
+        self.negation_words = frozenset(negation_words if negation_words is not None else NEGATION_WORDS)
+        self.degree_words = dict(degree_words if degree_words is not None else DEGREE_WORDS)
+        self.threshold = threshold
+    
+    def score_tokens(self, tokens: List[str]) -> float:
+        """
+        计算一段文本分词结果的情感分数
+        
+        Args:
+            tokens: 分词结果
+        
+        Returns:
+            情感分数，-1到1，越大越正面
+        """
+        positive = 0.0
+        negative = 0.0
+        degree = 1.0
+        negated = False
+        for token in tokens:
+            # jieba常把单字否定词与之后的词切在一起，如“不好”“不太”，拆开处理
+            if (len(token) > 1 and token[0] in self.negation_words and token not in self.polarity
+                    and token not in self.degree_words and token not in self.negation_words
+                    and (token[1:] in self.polarity or token[1:] in self.degree_words)):
+                negated = not negated
+                token = token[1:]
+            
+            polarity = self.polarity.get(token)
+            if polarity is not None:
+                value = -polarity * degree if negated else polarity * degree
+                if value > 0:
+                    positive += value
+                else:
+                    negative -= value
+                degree = 1.0
+                negated = False
+            elif token in self.degree_words:
+                degree *= self.degree_words[token] * (NEGATED_DEGREE_WEIGHT if negated else 1.0)
+            elif token in self.negation_words:
+                negated = not negated
+            elif token in CLAUSE_PUNCTUATION:
+                degree = 1.0
+                negated = False
+        
+        total = positive + negative
+        return (positive - negative) / total if total else 0.0
+    
+    def label(self, score: float) -> str:
+        """
+        将情感分数转换为情感类别
+        
+        Args:
+            score: 情感分数
+        
+        Returns:
+            情感类别
+        """
+        if score >= self.threshold:
+            return SENTIMENT_POSITIVE
+        if score <= -self.threshold:
+            return SENTIMENT_NEGATIVE
+        return SENTIMENT_NEUTRAL
+    
+    def score_texts(self, texts: List[str]) -> List[float]:
+        """
+        批量计算文本的情感分数
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            与texts一一对应的情感分数
+        """
+        return [self.score_tokens(tokens) for tokens in cut_texts(texts)]
+    
+    def score_items(self, items: List[Dict[str, Any]], rescore: bool = False) -> int:
+        """
+        批量分析新闻情感，将类别和分数写入新闻的sentiment和sentiment_score字段
+        
+        Args:
+            items: 新闻数据列表
+            rescore: 是否重新分析已分析过的新闻
+        
+        Returns:
+            分析的新闻条数
+        """
+        # 以sentiment_score判断是否分析过，来源自带或模拟数据随机生成的sentiment会被覆盖
+        pending = [item for item in items if rescore or "sentiment_score" not in item]
+        if not pending:
+            return 0
+        
+        for item, score in zip(pending, self.score_texts([sentiment_text(item) for item in pending])):
+            item["sentiment"] = self.label(score)
+            item["sentiment_score"] = round(score, 3)
+        return len(pending)
@@ -1,40 +1,479 @@
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 class FileStorage:
     """
     文件存储类，用于替代MongoDB数据库
     提供基本的数据存储和读取功能
+    
+    集合默认保存为单个JSON文件；在log_collections中声明的集合改用追加日志引擎：
+    数据写入 <集合名>.log/ 目录下的JSON-lines分段文件，追加只写一行，
+    更新和删除以操作记录（删除即墓碑）的形式追加，累计到一定数量后压缩为新的基础段。
+    
+    load_json解析后的数据按集合缓存在进程内，每次读取只需stat文件校验
+    (mtime_ns, size, inode)是否变化；缓存总量超过预算时按LRU淘汰。
+    返回的数据与缓存共享，修改后需通过save_json等方法写回。
+    
+    每次读写集合时对 <集合名>.lock 加文件锁，多个进程（Web服务、入库进程、管理命令）
+    共用同一数据目录时，追加、压缩和删除旧分段不会交错。需要读取后再写回的调用方
+    应在lock(collection)中完成整个过程。不支持fcntl的平台上只在进程内加锁。
     """
     
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, log_collections: Optional[List[str]] = None,
+                 segment_max_bytes: int = 16 * 1024 * 1024, compact_threshold: int = 1000,
+                 cache_max_bytes: int = 256 * 1024 * 1024):
         """
         初始化文件存储
         
         Args:
             data_dir: 数据存储目录
+            log_collections: 使用追加日志引擎的集合名称列表
+            segment_max_bytes: 单个日志分段的最大字节数，超过后写入新分段
+            compact_threshold: 日志中累计的更新/删除记录数达到该值时自动压缩
+            cache_max_bytes: 解析结果缓存的内存预算（按文件字节数估算），为0时不缓存
         """
         self.data_dir = data_dir
         self.logger = logging.getLogger(__name__)
+        self.log_collections = set(log_collections or [])
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        # 各日志集合自上次压缩以来的更新/删除记录数
+        self._log_garbage: Dict[str, int] = {}
+        self.cache_max_bytes = cache_max_bytes
+        # 集合名称 -> (文件状态, 解析后的数据, 估算大小)
+        self._cache: "OrderedDict[str, Tuple[Any, Any, int]]" = OrderedDict()
+        self._cache_bytes = 0
+        # 集合名称 -> 进程内的集合锁；集合锁总是先于self._lock获取
+        self._collection_locks: Dict[str, threading.RLock] = {}
+        self._collection_locks_guard = threading.Lock()
+        # 集合名称 -> (打开时的进程ID, 锁文件)，fork出的子进程需重新打开锁文件
+        self._lock_files: Dict[str, Tuple[int, Any]] = {}
+        # 集合名称 -> 持有集合锁的线程的重入层数
+        self._lock_depth: Dict[str, int] = {}
         
         # 确保数据目录存在
         os.makedirs(data_dir, exist_ok=True)
     
+    @contextmanager
+    def lock(self, collection: str) -> Iterator[None]:
+        """
+        获取集合的独占锁，同一线程可重入，跨进程通过文件锁互斥
+        
+        Args:
+            collection: 集合名称
+        """
+        with self._collection_locks_guard:
+            thread_lock = self._collection_locks.setdefault(collection, threading.RLock())
+        
+        with thread_lock:
+            depth = self._lock_depth.get(collection, 0)
+            lock_file = None
+            if depth == 0 and fcntl is not None:
+                pid, lock_file = self._lock_files.get(collection, (None, None))
+                if pid != os.getpid():
+                    lock_file = open(os.path.join(self.data_dir, f"{collection}.lock"), 'a')
+                    self._lock_files[collection] = (os.getpid(), lock_file)
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            
+            self._lock_depth[collection] = depth + 1
+            try:
+                yield
+            finally:
+                self._lock_depth[collection] = depth
+                if lock_file is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
     def _get_file_path(self, collection: str) -> str:
         """
         获取集合对应的文件路径
         
         Args:
             collection: 集合名称
-            
+        
         Returns:
             文件路径
         """
         return os.path.join(self.data_dir, f"{collection}.json")
     
+    def _is_log_collection(self, collection: str) -> bool:
+        """
+        判断集合是否使用追加日志引擎
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            是否为日志集合
+        """
+        return collection in self.log_collections
+    
+    def _get_log_dir(self, collection: str) -> str:
+        """
+        获取日志集合的分段目录
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            分段目录路径
+        """
+        return os.path.join(self.data_dir, f"{collection}.log")
+    
+    def _list_segments(self, collection: str) -> List[str]:
+        """
+        按序号列出日志集合的全部分段文件
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            分段文件路径列表
+        """
+        log_dir = self._get_log_dir(collection)
+        if not os.path.isdir(log_dir):
+            return []
+        names = sorted(name for name in os.listdir(log_dir) if name.endswith(".jsonl"))
+        return [os.path.join(log_dir, name) for name in names]
+    
+    def _segment_path(self, collection: str, seq: int) -> str:
+        """
+        获取指定序号的分段文件路径
+        
+        Args:
+            collection: 集合名称
+            seq: 分段序号
+        
+        Returns:
+            分段文件路径
+        """
+        return os.path.join(self._get_log_dir(collection), f"{seq:08d}.jsonl")
+    
+    def _segment_seq(self, path: str) -> int:
+        """
+        从分段文件路径中解析序号
+        
+        Args:
+            path: 分段文件路径
+        
+        Returns:
+            分段序号
+        """
+        return int(os.path.basename(path).split(".")[0])
+    
+    def _ensure_log(self, collection: str) -> None:
+        """
+        确保日志集合已初始化，首次使用时导入已有的JSON文件
+        
+        Args:
+            collection: 集合名称
+        """
+        log_dir = self._get_log_dir(collection)
+        if os.path.isdir(log_dir):
+            return
+        
+        os.makedirs(log_dir, exist_ok=True)
+        legacy_path = self._get_file_path(collection)
+        if os.path.exists(legacy_path):
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                self._write_base_segment(collection, data)
+                self.logger.info(f"已将 {legacy_path} 中的 {len(data)} 条数据导入日志 {log_dir}")
+            else:
+                self.logger.error(f"{legacy_path} 中的数据不是列表类型，无法导入日志")
+    
+    def _replay_log(self, collection: str) -> List[Any]:
+        """
+        按顺序重放日志分段，还原集合当前数据
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            集合数据列表
+        """
+        data: List[Any] = []
+        garbage = 0
+        # 单字段查询的取值索引，更新记录较多时避免每条都遍历全部数据
+        lookups: Dict[str, Dict[Any, List[Any]]] = {}
+        for path in self._list_segments(collection):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 进程中断时可能留下不完整的最后一行
+                        self.logger.warning(f"跳过 {path} 中损坏的日志记录")
+                        continue
+                    
+                    op = record.get("op")
+                    if op == "base":
+                        data = []
+                        lookups = {}
+                        garbage = 0
+                    elif op == "put":
+                        item = record.get("item")
+                        data.append(item)
+                        for field, lookup in list(lookups.items()):
+                            try:
+                                self._lookup_add(lookup, field, item)
+                            except TypeError:
+                                lookups.pop(field)
+                    elif op == "update":
+                        self._apply_update(data, record.get("query", {}), record.get("update", {}), lookups)
+                        garbage += 1
+                    elif op == "delete":
+                        query = record.get("query", {})
+                        data = [item for item in data if not self._match(item, query)]
+                        lookups = {}
+                        garbage += 1
+        
+        self._log_garbage[collection] = garbage
+        return data
+    
+    def _write_log_records(self, collection: str, records: List[Dict[str, Any]]) -> None:
+        """
+        向日志集合的当前分段追加记录
+        
+        Args:
+            collection: 集合名称
+            records: 日志记录列表
+        """
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        
+        segments = self._list_segments(collection)
+        if segments and os.path.getsize(segments[-1]) < self.segment_max_bytes:
+            path = segments[-1]
+        else:
+            path = self._segment_path(collection, self._segment_seq(segments[-1]) + 1 if segments else 1)
+        
+        with open(path, 'a+b') as f:
+            # 上一次写入被中断时补齐换行，避免与新记录粘连
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    payload = b"\n" + payload
+            f.write(payload)
+    
+    def _write_base_segment(self, collection: str, data: List[Any]) -> None:
+        """
+        将完整数据写为新的基础分段，并删除旧分段
+        
+        Args:
+            collection: 集合名称
+            data: 集合数据列表
+        """
+        segments = self._list_segments(collection)
+        seq = self._segment_seq(segments[-1]) + 1 if segments else 1
+        path = self._segment_path(collection, seq)
+        tmp_path = path + ".tmp"
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": "base"}) + "\n")
+            for item in data:
+                f.write(json.dumps({"op": "put", "item": item}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        
+        # 基础分段以base记录开头，即使旧分段未能删除，重放结果也不受影响
+        for old_path in segments:
+            try:
+                os.remove(old_path)
+            except OSError as e:
+                self.logger.warning(f"删除旧日志分段 {old_path} 失败: {str(e)}")
+        
+        self._log_garbage[collection] = 0
+    
+    def _maybe_compact(self, collection: str) -> None:
+        """
+        更新/删除记录累计过多时压缩日志集合
+        
+        Args:
+            collection: 集合名称
+        """
+        if self._log_garbage.get(collection, 0) >= self.compact_threshold:
+            self.compact(collection)
+    
+    def _match(self, item: Any, query: Dict[str, Any]) -> bool:
+        """
+        判断数据项是否满足查询条件
+        
+        Args:
+            item: 数据项
+            query: 查询条件
+        
+        Returns:
+            是否匹配
+        """
+        return isinstance(item, dict) and all(item.get(k) == v for k, v in query.items())
+    
+    def _lookup_add(self, lookup: Dict[Any, List[Any]], field: str, item: Any) -> None:
+        """
+        将数据项加入单字段取值索引
+        
+        Args:
+            lookup: 取值到数据项列表的字典
+            field: 字段名称
+            item: 数据项
+        """
+        if isinstance(item, dict) and item.get(field) is not None:
+            lookup.setdefault(item[field], []).append(item)
+    
+    def _apply_update(self, data: List[Any], query: Dict[str, Any], update: Dict[str, Any],
+                      lookups: Dict[str, Dict[Any, List[Any]]]) -> int:
+        """
+        更新满足查询条件的数据项，单字段查询时使用取值索引
+        
+        Args:
+            data: 集合数据列表
+            query: 查询条件
+            update: 更新内容
+            lookups: 字段名称到取值索引的字典，按需构建，更新改变的字段的索引会被丢弃
+        
+        Returns:
+            更新的数据项数
+        """
+        matched = None
+        field, value = next(iter(query.items())) if len(query) == 1 else (None, None)
+        if value is not None:
+            try:
+                if field not in lookups:
+                    lookup: Dict[Any, List[Any]] = {}
+                    for item in data:
+                        self._lookup_add(lookup, field, item)
+                    lookups[field] = lookup
+                matched = lookups[field].get(value, [])
+            except TypeError:
+                # 取值不可哈希时不使用索引
+                lookups.pop(field, None)
+        if matched is None:
+            matched = [item for item in data if self._match(item, query)]
+        
+        for item in matched:
+            item.update(update)
+        for updated_field in update:
+            lookups.pop(updated_field, None)
+        return len(matched)
+    
+    def _stat_key(self, collection: str) -> Optional[Tuple[Any, ...]]:
+        """
+        获取集合文件的状态，用于校验缓存是否过期
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            由(mtime_ns, size, inode)组成的状态元组，文件不存在时返回None
+        """
+        if self._is_log_collection(collection):
+            key = []
+            for path in self._list_segments(collection):
+                st = os.stat(path)
+                key.append((os.path.basename(path), st.st_mtime_ns, st.st_size, st.st_ino))
+            return tuple(key) if key else None
+        
+        try:
+            st = os.stat(self._get_file_path(collection))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _stat_size(self, key: Tuple[Any, ...]) -> int:
+        """
+        根据文件状态估算缓存项大小
+        
+        Args:
+            key: 文件状态元组
+        
+        Returns:
+            文件字节数
+        """
+        if key and isinstance(key[0], tuple):
+            return sum(segment[2] for segment in key)
+        return key[1]
+    
+    def _cache_put(self, collection: str, key: Tuple[Any, ...], data: Any) -> None:
+        """
+        写入缓存，并按LRU淘汰超出预算的集合
+        
+        Args:
+            collection: 集合名称
+            key: 文件状态元组
+            data: 解析后的数据
+        """
+        self._invalidate(collection)
+        size = self._stat_size(key)
+        if size > self.cache_max_bytes:
+            return
+        
+        self._cache[collection] = (key, data, size)
+        self._cache_bytes += size
+        while self._cache_bytes > self.cache_max_bytes:
+            evicted, (_, _, evicted_size) = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted_size
+            self.logger.debug(f"缓存超出预算，淘汰集合 {evicted}")
+    
+    def _invalidate(self, collection: str) -> None:
+        """
+        使集合的缓存失效
+        
+        Args:
+            collection: 集合名称
+        """
+        entry = self._cache.pop(collection, None)
+        if entry:
+            self._cache_bytes -= entry[2]
+    
+    def clear_cache(self) -> None:
+        """
+        清空全部缓存
+        """
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+    
+    def compact(self, collection: str) -> bool:
+        """
+        压缩日志集合，将当前数据重写为单个基础分段
+        
+        Args:
+            collection: 集合名称
+        
+        Returns:
+            是否压缩成功
+        """
+        if not self._is_log_collection(collection):
+            return False
+        
+        try:
+            with self.lock(collection), self._lock:
+                self._ensure_log(collection)
+                data = self._replay_log(collection)
+                self._write_base_segment(collection, data)
+                self._invalidate(collection)
+            self.logger.info(f"已压缩日志集合 {collection}，当前共 {len(data)} 条数据")
+            return True
+        except Exception as e:
+            self.logger.error(f"压缩 {collection} 时发生错误: {str(e)}")
+            return False
+    
     def save_json(self, collection: str, data: Any) -> bool:
         """
         保存JSON数据到文件
@@ -42,16 +481,31 @@ class FileStorage:
         Args:
             collection: 集合名称
             data: 要保存的数据
-            
+        
         Returns:
             是否保存成功
         """
         try:
-            file_path = self._get_file_path(collection)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            self.logger.info(f"数据已保存到 {file_path}")
-            return True
+            with self.lock(collection):
+                with self._lock:
+                    self._invalidate(collection)
+                
+                if self._is_log_collection(collection):
+                    if not isinstance(data, list):
+                        self.logger.error(f"{collection} 使用日志存储，只能保存列表类型数据")
+                        return False
+                    with self._lock:
+                        os.makedirs(self._get_log_dir(collection), exist_ok=True)
+                        self._write_base_segment(collection, data)
+                    self.logger.info(f"数据已保存到 {self._get_log_dir(collection)}")
+                    return True
+                
+                file_path = self._get_file_path(collection)
+                with self._lock:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                self.logger.info(f"数据已保存到 {file_path}")
+                return True
         except Exception as e:
             self.logger.error(f"保存数据到 {collection} 时发生错误: {str(e)}")
             return False
@@ -63,19 +517,37 @@ class FileStorage:
         Args:
             collection: 集合名称
             default: 默认值，如果文件不存在则返回此值
-            
+        
         Returns:
             加载的数据或默认值
         """
         try:
-            file_path = self._get_file_path(collection)
-            if not os.path.exists(file_path):
-                self.logger.info(f"文件 {file_path} 不存在，返回默认值")
-                return default
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            self.logger.info(f"从 {file_path} 加载了数据")
+            with self.lock(collection), self._lock:
+                if self._is_log_collection(collection):
+                    self._ensure_log(collection)
+                
+                key = self._stat_key(collection)
+                if key is None:
+                    self._invalidate(collection)
+                    self.logger.info(f"集合 {collection} 不存在，返回默认值")
+                    return default
+                
+                # 文件未变化时直接返回缓存
+                entry = self._cache.get(collection)
+                if entry and entry[0] == key:
+                    self._cache.move_to_end(collection)
+                    return entry[1]
+                
+                if self._is_log_collection(collection):
+                    data = self._replay_log(collection)
+                    source = self._get_log_dir(collection)
+                else:
+                    source = self._get_file_path(collection)
+                    with open(source, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                
+                self._cache_put(collection, key, data)
+            self.logger.info(f"从 {source} 加载了数据")
             return data
         except Exception as e:
             self.logger.error(f"从 {collection} 加载数据时发生错误: {str(e)}")
@@ -88,20 +560,51 @@ class FileStorage:
         Args:
             collection: 集合名称
             item: 要追加的数据项
-            
+        
+        Returns:
+            是否追加成功
+        """
+        return self.extend_json(collection, [item])
+    
+    def extend_json(self, collection: str, items: List[Any]) -> bool:
+        """
+        向JSON文件批量追加数据
+        
+        Args:
+            collection: 集合名称
+            items: 要追加的数据项列表
+        
         Returns:
             是否追加成功
         """
         try:
-            file_path = self._get_file_path(collection)
-            data = self.load_json(collection, [])
+            if not items:
+                return True
             
-            if not isinstance(data, list):
-                self.logger.error(f"{collection} 中的数据不是列表类型，无法追加")
-                return False
+            if self._is_log_collection(collection):
+                with self.lock(collection), self._lock:
+                    self._ensure_log(collection)
+                    entry = self._cache.get(collection)
+                    fresh = entry is not None and entry[0] == self._stat_key(collection)
+                    self._write_log_records(collection, [{"op": "put", "item": item} for item in items])
+                    
+                    # 缓存与写入前的文件一致时直接追加到缓存，避免下次读取重放整个日志
+                    if fresh:
+                        entry[1].extend(items)
+                        self._cache_put(collection, self._stat_key(collection), entry[1])
+                    else:
+                        self._invalidate(collection)
+                return True
             
-            data.append(item)
-            return self.save_json(collection, data)
+            with self.lock(collection), self._lock:
+                data = self.load_json(collection, [])
+                
+                if not isinstance(data, list):
+                    self.logger.error(f"{collection} 中的数据不是列表类型，无法追加")
+                    return False
+                
+                data.extend(items)
+                return self.save_json(collection, data)
         except Exception as e:
             self.logger.error(f"向 {collection} 追加数据时发生错误: {str(e)}")
             return False
@@ -114,33 +617,85 @@ class FileStorage:
             collection: 集合名称
             query: 查询条件
             update: 更新内容
-            
+        
         Returns:
             是否更新成功
         """
         try:
-            file_path = self._get_file_path(collection)
-            data = self.load_json(collection, [])
-            
-            if not isinstance(data, list):
-                self.logger.error(f"{collection} 中的数据不是列表类型，无法更新")
-                return False
-            
-            updated = False
-            for item in data:
-                if all(item.get(k) == v for k, v in query.items()):
-                    item.update(update)
-                    updated = True
-            
-            if updated:
+            with self.lock(collection), self._lock:
+                data = self.load_json(collection, [])
+                
+                if not isinstance(data, list):
+                    self.logger.error(f"{collection} 中的数据不是列表类型，无法更新")
+                    return False
+                
+                if not self._apply_update(data, query, update, {}):
+                    self.logger.warning(f"在 {collection} 中未找到匹配的数据进行更新")
+                    return False
+                
+                if self._is_log_collection(collection):
+                    self._invalidate(collection)
+                    self._write_log_records(collection, [{"op": "update", "query": query, "update": update}])
+                    self._log_garbage[collection] = self._log_garbage.get(collection, 0) + 1
+                    self._maybe_compact(collection)
+                    return True
                 return self.save_json(collection, data)
-            else:
-                self.logger.warning(f"在 {collection} 中未找到匹配的数据进行更新")
-                return False
         except Exception as e:
+            # 缓存中的数据可能已被部分修改
+            with self._lock:
+                self._invalidate(collection)
             self.logger.error(f"更新 {collection} 中的数据时发生错误: {str(e)}")
             return False
     
+    def update_many_json(self, collection: str, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> bool:
+        """
+        批量更新JSON文件中的数据，日志集合一次追加全部更新记录
+        
+        Args:
+            collection: 集合名称
+            updates: (查询条件, 更新内容)列表
+        
+        Returns:
+            是否更新成功，没有匹配的数据时也视为成功
+        """
+        try:
+            if not updates:
+                return True
+            
+            with self.lock(collection), self._lock:
+                data = self.load_json(collection, [])
+                
+                if not isinstance(data, list):
+                    self.logger.error(f"{collection} 中的数据不是列表类型，无法更新")
+                    return False
+                
+                lookups: Dict[str, Dict[Any, List[Any]]] = {}
+                applied = [(query, update) for query, update in updates if self._apply_update(data, query, update, lookups)]
+                if not applied:
+                    return True
+                
+                if self._is_log_collection(collection):
+                    entry = self._cache.get(collection)
+                    fresh = entry is not None and entry[1] is data and entry[0] == self._stat_key(collection)
+                    self._write_log_records(collection, [
+                        {"op": "update", "query": query, "update": update} for query, update in applied
+                    ])
+                    self._log_garbage[collection] = self._log_garbage.get(collection, 0) + len(applied)
+                    # 缓存中的数据已原地更新，与写入后的文件一致，避免下次读取重放整个日志
+                    if fresh:
+                        self._cache_put(collection, self._stat_key(collection), data)
+                    else:
+                        self._invalidate(collection)
+                    self._maybe_compact(collection)
+                    return True
+                return self.save_json(collection, data)
+        except Exception as e:
+            # 缓存中的数据可能已被部分修改
+            with self._lock:
+                self._invalidate(collection)
+            self.logger.error(f"批量更新 {collection} 中的数据时发生错误: {str(e)}")
+            return False
+    
     def delete_json(self, collection: str, query: Dict[str, Any]) -> bool:
         """
         删除JSON文件中的数据
@@ -148,26 +703,33 @@ class FileStorage:
         Args:
             collection: 集合名称
             query: 查询条件
-            
+        
         Returns:
             是否删除成功
         """
         try:
-            file_path = self._get_file_path(collection)
-            data = self.load_json(collection, [])
-            
-            if not isinstance(data, list):
-                self.logger.error(f"{collection} 中的数据不是列表类型，无法删除")
-                return False
-            
-            original_length = len(data)
-            data = [item for item in data if not all(item.get(k) == v for k, v in query.items())]
-            
-            if len(data) < original_length:
+            with self.lock(collection), self._lock:
+                data = self.load_json(collection, [])
+                
+                if not isinstance(data, list):
+                    self.logger.error(f"{collection} 中的数据不是列表类型，无法删除")
+                    return False
+                
+                original_length = len(data)
+                data = [item for item in data if not self._match(item, query)]
+                
+                if len(data) == original_length:
+                    self.logger.warning(f"在 {collection} 中未找到匹配的数据进行删除")
+                    return False
+                
+                if self._is_log_collection(collection):
+                    # 删除以墓碑记录追加，压缩时才真正移除数据
+                    self._invalidate(collection)
+                    self._write_log_records(collection, [{"op": "delete", "query": query}])
+                    self._log_garbage[collection] = self._log_garbage.get(collection, 0) + 1
+                    self._maybe_compact(collection)
+                    return True
                 return self.save_json(collection, data)
-            else:
-                self.logger.warning(f"在 {collection} 中未找到匹配的数据进行删除")
-                return False
         except Exception as e:
             self.logger.error(f"从 {collection} 中删除数据时发生错误: {str(e)}")
             return False
@@ -179,7 +741,7 @@ class FileStorage:
         Args:
             collection: 集合名称
             query: 查询条件
-            
+        
         Returns:
             匹配的数据列表
         """
@@ -190,7 +752,7 @@ class FileStorage:
                 self.logger.error(f"{collection} 中的数据不是列表类型，无法查找")
                 return []
             
-            result = [item for item in data if all(item.get(k) == v for k, v in query.items())]
+            result = [item for item in data if self._match(item, query)]
             return result
         except Exception as e:
             self.logger.error(f"在 {collection} 中查找数据时发生错误: {str(e)}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 项目模块以平铺方式导入，测试时将news_monitor目录加入模块搜索路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
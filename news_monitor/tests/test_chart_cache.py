@@ -0,0 +1,131 @@
+import os
+import time
+from concurrent.futures import Future
+
+from chart_cache import ChartCache
+
+
+class FakeRenderer:
+    """
+    记录提交次数的绘图函数，write为False时返回未完成的Future，由测试手动结束
+    """
+    
+    def __init__(self, size: int = 100, write: bool = True):
+        self.size = size
+        self.write = write
+        self.calls = 0
+        self.futures = []
+    
+    def __call__(self, path: str) -> Future:
+        self.calls += 1
+        future: Future = Future()
+        self.futures.append((path, future))
+        if self.write:
+            self.finish(path, future)
+        return future
+    
+    def finish(self, path: str, future: Future) -> None:
+        with open(path, "wb") as f:
+            f.write(b"x" * self.size)
+        future.set_result(path)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    render = FakeRenderer()
+    
+    url = cache.get_or_submit("trend_chart", "测试", 30, {"a": 1}, render).result()
+    assert url.startswith("/static/images/trend_chart_")
+    assert os.path.exists(os.path.join(tmp_path, os.path.basename(url)))
+    
+    assert cache.get_or_submit("trend_chart", "测试", 30, {"a": 1}, render).result() == url
+    assert render.calls == 1
+    
+    # 输入数据或天数变化时重新绘制
+    assert cache.get_or_submit("trend_chart", "测试", 30, {"a": 2}, render).result() != url
+    assert cache.get_or_submit("trend_chart", "测试", 7, {"a": 1}, render).result() != url
+    assert render.calls == 3
+    assert cache.get_stats() == {"hit": 1, "miss": 3, "evicted": 0}
+
+
+def test_renderer_version_changes_key(tmp_path):
+    render = FakeRenderer()
+    url_v1 = ChartCache(str(tmp_path), renderer_version=1).get_or_submit("tag_chart", "测试", None, [1], render).result()
+    url_v2 = ChartCache(str(tmp_path), renderer_version=2).get_or_submit("tag_chart", "测试", None, [1], render).result()
+    assert url_v1 != url_v2
+    assert render.calls == 2
+
+
+def test_pending_render_is_shared(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    render = FakeRenderer(write=False)
+    
+    first = cache.get_or_submit("wordcloud", "测试", None, {"词": 1}, render)
+    second = cache.get_or_submit("wordcloud", "测试", None, {"词": 1}, render)
+    assert second is first
+    assert render.calls == 1
+    assert not first.done()
+    
+    render.finish(*render.futures[0])
+    assert first.result().startswith("/static/images/wordcloud_")
+    assert cache.get_stats()["hit"] == 1
+
+
+def test_failed_render_is_not_cached(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    failing: Future = Future()
+    failing.set_exception(RuntimeError("绘图失败"))
+    
+    result = cache.get_or_submit("trend_chart", "测试", 30, [], lambda path: failing)
+    assert isinstance(result.exception(), RuntimeError)
+    assert os.listdir(tmp_path) == []
+    
+    render = FakeRenderer()
+    cache.get_or_submit("trend_chart", "测试", 30, [], render).result()
+    assert render.calls == 1
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path):
+    cache = ChartCache(str(tmp_path), max_bytes=250, evict_interval=3600)
+    render = FakeRenderer(size=100)
+    urls = [cache.get_or_submit("tag_chart", "测试", None, [i], render).result() for i in range(3)]
+    paths = [os.path.join(tmp_path, os.path.basename(url)) for url in urls]
+    
+    now = time.time()
+    for age, path in zip((30, 20, 10), paths):
+        os.utime(path, (now - age, now - age))
+    # 命中时刷新使用时间，最早生成的图片不再是最久未使用的
+    cache.get_or_submit("tag_chart", "测试", None, [0], render).result()
+    
+    assert cache.evict(force=True) == 1
+    assert [os.path.exists(path) for path in paths] == [True, False, True]
+    assert cache.get_stats()["evicted"] == 1
+
+
+def test_evicts_expired_images(tmp_path):
+    cache = ChartCache(str(tmp_path), max_age=60)
+    render = FakeRenderer()
+    url = cache.get_or_submit("tag_chart", "测试", None, [], render).result()
+    path = os.path.join(tmp_path, os.path.basename(url))
+    unmanaged = os.path.join(tmp_path, "trend_chart_default.png")
+    open(unmanaged, "wb").close()
+    
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    os.utime(unmanaged, (old, old))
+    
+    assert cache.evict(force=True) == 1
+    assert not os.path.exists(path)
+    # 默认图片不由缓存管理，不会被删除
+    assert os.path.exists(unmanaged)
+
+
+def test_evict_respects_interval(tmp_path):
+    cache = ChartCache(str(tmp_path), max_age=0, evict_interval=3600)
+    assert cache.evict(force=True) == 0
+    render = FakeRenderer()
+    cache.get_or_submit("tag_chart", "测试", None, [], render).result()
+    
+    time.sleep(0.01)
+    assert cache.evict() == 0
+    assert cache.evict(force=True) == 1
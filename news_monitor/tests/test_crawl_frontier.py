@@ -0,0 +1,145 @@
+import asyncio
+
+from storage import FileStorage
+from crawl_frontier import CrawlFrontier, STATUS_PENDING, STATUS_DONE, STATUS_FAILED
+from crawl_orchestrator import CrawlOrchestrator
+
+
+def make_storage(data_dir) -> FileStorage:
+    return FileStorage(str(data_dir), log_collections=["crawl_frontier"])
+
+
+def make_items(*numbers):
+    return [{"url": f"https://example.com/{i}", "title": f"新闻{i}"} for i in numbers]
+
+
+NEWS_INFO = {"title": "标题", "content": "正文"}
+
+
+def test_plan_registers_pending_items(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path))
+    assert frontier.plan("tencent", "测试", make_items(0, 1)) == make_items(0, 1)
+    assert frontier.get_summary()[STATUS_PENDING] == 2
+    
+    # 中断后新的实例从存储中找回未完成的搜索结果
+    reopened = CrawlFrontier(make_storage(tmp_path))
+    assert reopened.pending("tencent", "测试") == make_items(0, 1)
+    assert reopened.pending("tencent", "其他") == []
+    assert reopened.plan("tencent", "测试", make_items(2)) == make_items(2, 0, 1)
+
+
+def test_done_items_are_skipped_until_due(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path), refresh_interval=100, max_refresh_interval=300)
+    frontier.plan("tencent", "测试", make_items(0))
+    assert frontier.mark_done("https://example.com/0", NEWS_INFO, now=1000)
+    assert frontier.get("https://example.com/0")["next_due"] == 1100
+    assert not frontier.should_fetch("https://example.com/0", now=1099)
+    assert frontier.should_fetch("https://example.com/0", now=1100)
+    assert frontier.pending("tencent") == []
+    
+    # 内容不变时间隔翻倍直到上限，变化时恢复初始间隔
+    assert not frontier.mark_done("https://example.com/0", NEWS_INFO, now=1100)
+    assert frontier.get("https://example.com/0")["interval"] == 200
+    frontier.mark_done("https://example.com/0", NEWS_INFO, now=1300)
+    assert frontier.get("https://example.com/0")["interval"] == 300
+    assert frontier.mark_done("https://example.com/0", dict(NEWS_INFO, content="更新"), now=1600)
+    assert frontier.get("https://example.com/0")["interval"] == 100
+    
+    # 点赞数等互动数据不影响内容哈希
+    assert not frontier.mark_done("https://example.com/0", dict(NEWS_INFO, content="更新", like_count=5), now=1700)
+
+
+def test_failures_are_retried_until_limit(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path), retry_interval=10, max_failures=2)
+    frontier.mark_failed("https://example.com/0", now=1000)
+    record = frontier.get("https://example.com/0")
+    assert record["status"] == STATUS_FAILED
+    assert not frontier.should_fetch("https://example.com/0", now=1009)
+    assert frontier.should_fetch("https://example.com/0", now=1010)
+    
+    frontier.mark_failed("https://example.com/0", now=1010)
+    assert not frontier.should_fetch("https://example.com/0", now=10 ** 9)
+    
+    # 成功抓取后失败次数清零
+    frontier.mark_done("https://example.com/0", NEWS_INFO, now=1020)
+    assert frontier.get("https://example.com/0")["failures"] == 0
+
+
+def test_marks_are_written_on_flush(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path))
+    frontier.mark_done("https://example.com/0", NEWS_INFO)
+    assert CrawlFrontier(make_storage(tmp_path)).get("https://example.com/0") is None
+    
+    assert frontier.flush()
+    assert CrawlFrontier(make_storage(tmp_path)).get("https://example.com/0")["status"] == STATUS_DONE
+
+
+def test_records_from_other_instances_are_applied(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path))
+    other = CrawlFrontier(make_storage(tmp_path))
+    frontier.plan("tencent", "测试", make_items(0))
+    assert other.get("https://example.com/0")["status"] == STATUS_PENDING
+    
+    frontier.mark_done("https://example.com/0", NEWS_INFO)
+    frontier.flush()
+    # 未写入存储的记录优先于其他实例追加的记录
+    other.mark_failed("https://example.com/1")
+    assert other.get("https://example.com/0")["status"] == STATUS_DONE
+    assert other.get("https://example.com/1")["status"] == STATUS_FAILED
+
+
+def test_compaction_is_reloaded(tmp_path):
+    # 共用同一存储的实例，如Web服务中的抓取调度和入库
+    storage = make_storage(tmp_path)
+    frontier = CrawlFrontier(storage)
+    other = CrawlFrontier(storage)
+    frontier.mark_done("https://example.com/0", NEWS_INFO, now=0)
+    frontier.flush()
+    assert other.get("https://example.com/0")["fetched_at"] == 0
+    for now in range(1, 1200):
+        frontier.mark_done("https://example.com/0", NEWS_INFO, now=now)
+        frontier.flush()
+    # 已加载的实例只应用新增记录，不压缩存储
+    assert other.get("https://example.com/0")["fetched_at"] == 1199
+    assert len(storage.load_json("crawl_frontier")) == 1200
+    
+    # 其他进程加载时过期记录过多，整体重写为每个URL一条记录
+    reopened = CrawlFrontier(make_storage(tmp_path))
+    assert reopened.get("https://example.com/0")["fetched_at"] == 1199
+    assert len(storage.load_json("crawl_frontier")) == 1
+    
+    # 已加载的实例发现存储被重写后重新加载
+    frontier.mark_failed("https://example.com/1")
+    frontier.flush()
+    assert other.get_summary() == {STATUS_PENDING: 0, STATUS_DONE: 1, STATUS_FAILED: 1}
+
+
+class FakeCrawler:
+    """详情提取按URL返回预设结果的假爬虫"""
+    
+    selenium_methods = ()
+    search_url = "https://example.com/search?q={}"
+    
+    def search_keyword(self, keyword, limit):
+        return make_items(0, 1)
+    
+    def extract_news_info(self, url):
+        return NEWS_INFO if url.endswith("/0") else None
+
+
+def test_orchestrator_marks_extracted_items(tmp_path):
+    frontier = CrawlFrontier(make_storage(tmp_path))
+    orchestrator = CrawlOrchestrator({"tencent": FakeCrawler()}, frontier=frontier)
+    try:
+        results = asyncio.run(orchestrator.crawl("测试", ["tencent"]))
+        assert len(results["tencent"]) == 2
+        
+        # 整次抓取结束后标记已写入存储
+        reopened = CrawlFrontier(make_storage(tmp_path))
+        assert reopened.get("https://example.com/0")["status"] == STATUS_DONE
+        assert reopened.get("https://example.com/1")["status"] == STATUS_FAILED
+        
+        # 已抓取的文章未到期时不再提取，失败的文章等待重试
+        assert asyncio.run(orchestrator.crawl("测试", ["tencent"])) == {"tencent": []}
+    finally:
+        orchestrator.shutdown()
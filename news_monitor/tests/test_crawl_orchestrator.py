@@ -0,0 +1,128 @@
+import time
+import asyncio
+import threading
+
+from crawl_frontier import content_hash
+from crawl_orchestrator import CrawlOrchestrator, merge_news
+
+
+class FakeCrawler:
+    """记录并发数的假爬虫，详情提取按URL返回预设结果"""
+    
+    selenium_methods = ()
+    
+    def __init__(self, host: str, count: int = 3, delay: float = 0.0, failed=()):
+        self.search_url = f"https://{host}/search?q={{}}"
+        self.host = host
+        self.count = count
+        self.delay = delay
+        self.failed = set(failed)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def search_keyword(self, keyword, limit):
+        return [{"url": f"https://{self.host}/{i}", "title": f"{keyword}{i}", "platform_type": self.host}
+                for i in range(min(self.count, limit))]
+    
+    def extract_news_info(self, url):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if url in self.failed:
+                return None
+            return {"title": f"详情{url}", "content": "正文", "author": ""}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_merge_news_prefers_non_empty_details():
+    search_item = {"url": "https://example.com/1", "title": "搜索标题", "platform_type": "tencent"}
+    news_info = {"title": "详情标题", "content": "", "author": None}
+    
+    news = merge_news(search_item, news_info)
+    assert news["title"] == "详情标题"
+    assert "content" not in news and "author" not in news
+    assert news["content_hash"] == content_hash(news_info)
+    # ID只由平台类型和URL决定
+    assert news["id"] == merge_news(search_item, None)["id"]
+    assert news["id"].startswith("news_tencent_")
+    
+    # 提取失败时保留搜索结果，不记录内容哈希
+    assert "content_hash" not in merge_news(search_item, None)
+
+
+def test_crawl_collects_all_platforms():
+    orchestrator = CrawlOrchestrator({"a": FakeCrawler("a.com"), "b": FakeCrawler("b.com", count=0)})
+    try:
+        results = asyncio.run(orchestrator.crawl("测试", ["a", "b", "missing"], limit=2))
+    finally:
+        orchestrator.shutdown()
+    
+    # 没有搜索结果和没有爬虫的平台不在结果中
+    assert list(results) == ["a"]
+    assert sorted(item["url"] for item in results["a"]) == ["https://a.com/0", "https://a.com/1"]
+
+
+def test_failed_extraction_keeps_search_item():
+    crawler = FakeCrawler("a.com", count=2, failed={"https://a.com/1"})
+    orchestrator = CrawlOrchestrator({"a": crawler})
+    try:
+        results = asyncio.run(orchestrator.crawl("测试", ["a"]))
+    finally:
+        orchestrator.shutdown()
+    
+    news = {item["url"]: item for item in results["a"]}
+    assert news["https://a.com/0"]["title"] == "详情https://a.com/0"
+    assert news["https://a.com/1"]["title"] == "测试1"
+
+
+def test_per_host_concurrency_is_limited():
+    crawler = FakeCrawler("a.com", count=8, delay=0.05)
+    orchestrator = CrawlOrchestrator({"a": crawler}, max_concurrency=8, per_host_concurrency=2)
+    try:
+        results = asyncio.run(orchestrator.crawl("测试", ["a"]))
+    finally:
+        orchestrator.shutdown()
+    
+    assert len(results["a"]) == 8
+    assert crawler.max_active == 2
+
+
+def test_stream_events():
+    orchestrator = CrawlOrchestrator({"a": FakeCrawler("a.com", count=2), "b": FakeCrawler("b.com", count=0)})
+    
+    async def collect():
+        return [event async for event in orchestrator.stream("测试", ["a", "b"])]
+    
+    try:
+        events = asyncio.run(collect())
+    finally:
+        orchestrator.shutdown()
+    
+    statuses = [(event["platform_type"], event["status"]) for event in events if event["event"] == "platform"]
+    assert ("a", "searching") in statuses and ("b", "searching") in statuses
+    assert ("b", "empty") in statuses
+    assert statuses.index(("a", "extracting")) < statuses.index(("a", "done"))
+    assert sum(event["event"] == "news" for event in events) == 2
+    # 结束事件总是最后一个
+    assert events[-1]["event"] == "done"
+    assert events[-1]["total_count"] == 2
+
+
+def test_deadline_returns_partial_results():
+    slow = FakeCrawler("slow.com", count=2, delay=0.5)
+    orchestrator = CrawlOrchestrator({"fast": FakeCrawler("fast.com"), "slow": slow}, deadline=0.2)
+    events = []
+    try:
+        asyncio.run(orchestrator.execute("测试", ["fast", "slow"], 10, events.append))
+    finally:
+        orchestrator.shutdown()
+    
+    assert {"event": "platform", "platform_type": "slow", "status": "timeout"} in events
+    assert sum(event["event"] == "news" and event["platform_type"] == "fast" for event in events) == 3
+    assert not any(event["event"] == "news" and event["platform_type"] == "slow" for event in events)
+    assert events[-1]["event"] == "done"
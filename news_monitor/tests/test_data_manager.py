@@ -0,0 +1,84 @@
+from storage import FileStorage
+from data_manager import NewsDataManager
+from crawl_orchestrator import merge_news
+
+
+def make_manager(data_dir) -> NewsDataManager:
+    return NewsDataManager(FileStorage(str(data_dir), log_collections=["news_data", "news_tokens"]))
+
+
+def make_news(i: int, **fields):
+    search_item = {"url": f"https://example.com/{i}", "keyword": "测试", "platform": "腾讯新闻",
+                   "platform_type": "tencent", "publish_time": "2026-10-01 08:00:00"}
+    return merge_news(search_item, dict({"title": f"新闻{i}", "content": "市场平稳运行"}, **fields))
+
+
+def test_duplicate_urls_are_skipped(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.save_news([make_news(0), make_news(1), make_news(0)])
+    assert manager.save_news([make_news(1)])
+    assert [item["url"] for item in manager.get_all_news()] == ["https://example.com/0", "https://example.com/1"]
+
+
+def test_index_is_persisted_and_caught_up(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.save_news([make_news(0)])
+    assert manager.save_index()
+    make_manager(tmp_path).save_news([make_news(1)])
+    
+    # 索引文件之后由其他进程新增的数据在加载时补充
+    reopened = make_manager(tmp_path)
+    assert reopened.get_index().count == 2
+    assert reopened.save_news([make_news(1), make_news(2)])
+    assert len(reopened.get_all_news()) == 3
+
+
+def test_indexed_queries(tmp_path):
+    manager = make_manager(tmp_path)
+    news = [make_news(0, tags=["科技"]), make_news(1), make_news(2, tags=["科技", "财经"])]
+    news[1].update(keyword="其他", platform_type="weibo")
+    manager.save_news(news)
+    
+    assert [item["url"] for item in manager.get_news_by_keyword("测试")] == [news[0]["url"], news[2]["url"]]
+    assert [item["url"] for item in manager.get_news_by_platform("weibo")] == [news[1]["url"]]
+    assert [item["url"] for item in manager.get_news_by_tags(["财经", "科技"])] == [news[0]["url"], news[2]["url"]]
+    assert manager.get_tag_distribution_by_keyword("测试") == {"科技": 2, "财经": 1}
+
+
+def test_refreshed_interactions_update_views(tmp_path):
+    manager = make_manager(tmp_path)
+    other = make_manager(tmp_path)
+    manager.save_news([make_news(i, read_count=i) for i in range(5)])
+    assert other.get_hot_ranker().top(1) == [(4.0, 4)]
+    assert other.get_stats().interactions["read_count"] == 10
+    
+    assert manager.save_news([make_news(1, read_count=100, like_count=3), make_news(2, read_count=2)])
+    
+    assert len(manager.get_all_news()) == 5
+    assert manager.get_all_news()[1]["read_count"] == 100
+    assert manager.get_stats().interactions["read_count"] == 109
+    assert manager.get_hot_ranker().top(1) == [(106.0, 1)]
+    # 其他进程据统计的revision发现更新，重建依赖互动数据的视图
+    assert other.get_hot_ranker().top(1) == [(106.0, 1)]
+    assert int(other.get_frame().column("read_count").sum()) == 109
+    assert other.get_stats().interactions["like_count"] == 3
+    # 重新打开时从日志重放更新记录
+    assert make_manager(tmp_path).get_all_news()[1]["like_count"] == 3
+
+
+def test_changed_content_is_written_back(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.save_news([make_news(0, title="业绩大涨", content="市场表现优秀")])
+    assert manager.get_stats().sentiments == {"positive": 1}
+    assert "大涨" in manager.get_top_words("测试")
+    
+    manager.save_news([make_news(0, title="公司亏损", content="投资者担忧")])
+    
+    news = make_manager(tmp_path).get_all_news()
+    assert len(news) == 1
+    assert news[0]["title"] == "公司亏损"
+    assert news[0]["sentiment"] == "negative"
+    assert manager.get_stats().sentiments == {"negative": 1}
+    words = manager.get_top_words("测试")
+    assert "亏损" in words or "公司亏损" in words
+    assert "大涨" not in words
@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    """
+    模拟浏览器驱动，crashed为True时健康检查失败
+    """
+    
+    def __init__(self, number: int):
+        self.number = number
+        self.crashed = False
+        self.quit_called = False
+    
+    def execute_script(self, script: str) -> int:
+        if self.crashed:
+            raise RuntimeError("浏览器已崩溃")
+        return 1
+    
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class FakeFactory:
+    """
+    创建FakeDriver并记录创建过的驱动，failures次调用内抛出异常
+    """
+    
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.drivers = []
+    
+    def __call__(self) -> FakeDriver:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("浏览器启动失败")
+        driver = FakeDriver(len(self.drivers))
+        self.drivers.append(driver)
+        return driver
+
+
+def test_drivers_are_reused():
+    factory = FakeFactory()
+    pool = DriverPool(size=2, max_pages=10, factory=factory)
+    
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver is factory.drivers[0]
+    assert len(factory.drivers) == 1
+
+
+def test_driver_is_recycled_after_max_pages():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, max_pages=2, factory=factory)
+    
+    for _ in range(2):
+        with pool.driver():
+            pass
+    assert factory.drivers[0].quit_called
+    
+    with pool.driver() as driver:
+        assert driver is factory.drivers[1]
+    assert not driver.quit_called
+
+
+def test_crashed_driver_is_discarded():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, factory=factory)
+    
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            driver.crashed = True
+            raise RuntimeError("页面加载失败")
+    assert driver.quit_called
+    
+    with pool.driver() as replacement:
+        assert replacement is factory.drivers[1]
+
+
+def test_page_error_keeps_healthy_driver():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, factory=factory)
+    
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("元素未找到")
+    
+    with pool.driver() as driver:
+        assert driver is factory.drivers[0]
+    assert not driver.quit_called
+
+
+def test_idle_driver_that_died_is_replaced_on_checkout():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, factory=factory)
+    assert pool.warm_up() == 1
+    factory.drivers[0].crashed = True
+    
+    driver = pool.checkout()
+    assert driver is factory.drivers[1]
+    assert factory.drivers[0].quit_called
+    pool.checkin(driver)
+
+
+def test_factory_failure_releases_slot():
+    factory = FakeFactory(failures=1)
+    pool = DriverPool(size=1, factory=factory, checkout_timeout=0.5)
+    
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    # 创建失败不占用名额，下次借出可以重新创建
+    driver = pool.checkout()
+    assert driver is factory.drivers[0]
+    pool.checkin(driver)
+
+
+def test_checkout_waits_for_checkin():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, factory=factory, checkout_timeout=0.2)
+    driver = pool.checkout()
+    
+    with pytest.raises(TimeoutError):
+        pool.checkout()
+    
+    timer = threading.Timer(0.05, pool.checkin, args=(driver,))
+    timer.start()
+    pool.checkout_timeout = 5
+    assert pool.checkout() is driver
+    timer.join()
+
+
+def test_close_quits_idle_and_returned_drivers():
+    factory = FakeFactory()
+    pool = DriverPool(size=2, factory=factory)
+    pool.warm_up()
+    borrowed = pool.checkout()
+    idle = next(driver for driver in factory.drivers if driver is not borrowed)
+    
+    pool.close()
+    assert idle.quit_called
+    assert not borrowed.quit_called
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    
+    pool.checkin(borrowed)
+    assert borrowed.quit_called
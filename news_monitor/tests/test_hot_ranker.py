@@ -0,0 +1,83 @@
+import random
+
+from hot_ranker import HotNewsRanker, hot_score
+
+WEIGHTS = {"read_count": 1, "comment_count": 5}
+
+
+def make_news(i: int, read_count: int, comment_count: int = 0):
+    return {"url": f"https://example.com/{i}", "read_count": read_count, "comment_count": comment_count}
+
+
+def brute_force_top(news, limit):
+    ranked = sorted(((hot_score(item, WEIGHTS), -i) for i, item in enumerate(news)), reverse=True)[:limit]
+    return [(score, -negative) for score, negative in ranked]
+
+
+def test_hot_score():
+    assert hot_score(make_news(0, 10, 2), WEIGHTS) == 20
+    assert hot_score({"read_count": None}, WEIGHTS) == 0
+
+
+def test_incremental_adds_match_brute_force():
+    rng = random.Random(1)
+    news = [make_news(i, rng.randint(0, 50), rng.randint(0, 5)) for i in range(300)]
+    ranker = HotNewsRanker(capacity=10, weights=WEIGHTS)
+    for end in range(0, len(news) + 1, 7):
+        ranker.sync(news[:end])
+    ranker.sync(news)
+    
+    assert ranker.count == 300
+    assert ranker.top(10) == brute_force_top(news, 10)
+    assert ranker.top(3) == brute_force_top(news, 3)
+
+
+def test_bulk_extend_matches_brute_force():
+    rng = random.Random(2)
+    # 大量相同分数，检验门槛处的取舍与逐条入堆一致
+    news = [make_news(i, rng.randint(0, 3)) for i in range(500)]
+    bulk = HotNewsRanker(capacity=20, weights=WEIGHTS)
+    bulk.sync(news)
+    one_by_one = HotNewsRanker(capacity=20, weights=WEIGHTS)
+    for i, item in enumerate(news):
+        one_by_one.add(i, item)
+    
+    assert bulk.top(20) == brute_force_top(news, 20)
+    assert bulk.top(20) == one_by_one.top(20)
+    assert bulk.last_fingerprint == one_by_one.last_fingerprint
+
+
+def test_ties_prefer_earlier_news():
+    ranker = HotNewsRanker(capacity=2, weights=WEIGHTS)
+    ranker.sync([make_news(i, 5) for i in range(4)])
+    assert ranker.top(2) == [(5.0, 0), (5.0, 1)]
+
+
+def test_update_adjusts_ranking():
+    ranker = HotNewsRanker(capacity=3, weights=WEIGHTS)
+    news = [make_news(i, i) for i in range(6)]
+    ranker.sync(news)
+    assert ranker.top(3) == [(5.0, 5), (4.0, 4), (3.0, 3)]
+    
+    # 排行外的新闻热度上升后进入排行
+    news[0] = make_news(0, 10)
+    ranker.update(0, make_news(0, 0), news[0])
+    assert ranker.top(3) == [(10.0, 0), (5.0, 5), (4.0, 4)]
+    
+    # 排行内的新闻热度上升时原地调整
+    news[4] = make_news(4, 4, comment_count=2)
+    ranker.update(4, make_news(4, 4), news[4])
+    assert ranker.top(3) == brute_force_top(news, 3)
+
+
+def test_update_lowering_ranked_score_rebuilds():
+    ranker = HotNewsRanker(capacity=3, weights=WEIGHTS)
+    news = [make_news(i, i) for i in range(6)]
+    ranker.sync(news)
+    
+    # 排行已满时降低排行内新闻的热度，无法得知排行外的替补，清空后重新同步
+    news[5] = make_news(5, 0)
+    ranker.update(5, make_news(5, 5), news[5])
+    assert ranker.count == 0
+    ranker.sync(news)
+    assert ranker.top(3) == brute_force_top(news, 3)
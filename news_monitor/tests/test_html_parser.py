@@ -0,0 +1,52 @@
+import pytest
+
+from html_parser import SoupParser, available_parsers, get_parser
+
+HTML = """
+<html><body>
+  <div class="vrwrap"><h3><a href="https://example.com/1"> 第一条 </a></h3><span class="time">2026-10-01</span></div>
+  <div class="vrwrap"><h3><a href="https://example.com/2">第二条</a></h3></div>
+  <div class="other"><p>其他<b>内容</b></p></div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("name", available_parsers())
+def test_backends_agree(name):
+    parser = get_parser(name)
+    root = parser.parse(HTML)
+    
+    items = parser.select(root, "div.vrwrap")
+    assert len(items) == 2
+    
+    link = parser.select_one(items[0], "h3 a")
+    assert parser.attr(link, "href") == "https://example.com/1"
+    assert parser.text(link) == "第一条"
+    assert parser.attr(link, "title", "无") == "无"
+    
+    # 查询不到时返回None
+    assert parser.select_one(items[1], "span.time") is None
+    assert parser.text(parser.select_one(root, "div.other p"), separator="|") == "其他|内容"
+
+
+def test_partial_parse_keeps_only_matching_elements():
+    parser = SoupParser()
+    root = parser.parse(HTML, only={"name": "div", "attrs": {"class": "vrwrap"}})
+    
+    assert len(parser.select(root, "div.vrwrap")) == 2
+    assert parser.select_one(root, "div.other") is None
+
+
+def test_compiled_selectors_are_cached():
+    parser = SoupParser()
+    assert parser.compile("div.vrwrap") is parser.compile("div.vrwrap")
+
+
+def test_get_parser():
+    # 同一后端在进程内共用
+    assert get_parser("html.parser") is get_parser("html.parser")
+    assert get_parser().name == available_parsers()[0]
+    assert available_parsers()[-1] == "html.parser"
+    
+    with pytest.raises(ValueError):
+        get_parser("missing")
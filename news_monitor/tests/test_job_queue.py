@@ -0,0 +1,96 @@
+import time
+
+from job_queue import JobQueue, JOB_ARTICLE, JOB_DONE, JOB_FAILED, JOB_QUEUED
+
+
+def make_queue(tmp_path, **kwargs) -> JobQueue:
+    return JobQueue(str(tmp_path / "queue.db"), **kwargs)
+
+
+def enqueue_article(queue: JobQueue, url: str = "https://example.com/1") -> bool:
+    return queue.enqueue(JOB_ARTICLE, "tencent", "测试", url, {"url": url})
+
+
+def test_duplicate_active_jobs_are_ignored(tmp_path):
+    queue = make_queue(tmp_path)
+    assert enqueue_article(queue)
+    assert not enqueue_article(queue)
+    
+    job = queue.claim("worker-1")
+    assert not enqueue_article(queue)
+    queue.complete(job["id"], {"title": "标题"})
+    # 任务结束后同一URL可以再次入队
+    assert enqueue_article(queue)
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = make_queue(tmp_path, lease=0.2)
+    enqueue_article(queue)
+    
+    job = queue.claim("worker-1")
+    assert job["attempts"] == 1
+    assert queue.claim("worker-2") is None
+    
+    time.sleep(0.3)
+    reclaimed = queue.claim("worker-2")
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["worker"] == "worker-2"
+    assert reclaimed["attempts"] == 2
+
+
+def test_expired_lease_fails_after_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, lease=0.1, max_attempts=1)
+    enqueue_article(queue)
+    
+    job = queue.claim("worker-1")
+    time.sleep(0.2)
+    assert queue.claim("worker-2") is None
+    
+    finished = queue.finished()
+    assert [(item["id"], item["status"]) for item in finished] == [(job["id"], JOB_FAILED)]
+
+
+def test_failed_job_is_requeued_until_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2, retry_delay=0)
+    enqueue_article(queue)
+    
+    job = queue.claim("worker-1")
+    assert queue.fail(job["id"], "超时")
+    assert queue.get_summary()[JOB_ARTICLE] == {JOB_QUEUED: 1}
+    
+    job = queue.claim("worker-1")
+    assert job["attempts"] == 2
+    assert not queue.fail(job["id"], "超时")
+    assert queue.claim("worker-1") is None
+    assert queue.finished()[0]["status"] == JOB_FAILED
+
+
+def test_ingested_jobs_are_purged(tmp_path):
+    queue = make_queue(tmp_path)
+    enqueue_article(queue)
+    job = queue.claim("worker-1")
+    queue.complete(job["id"], {"title": "标题"})
+    
+    finished = queue.finished()
+    assert [(item["id"], item["status"]) for item in finished] == [(job["id"], JOB_DONE)]
+    assert queue.purge(older_than=0) == 0
+    
+    queue.mark_ingested([job["id"]])
+    assert queue.finished() == []
+    assert queue.purge(older_than=3600) == 0
+    assert queue.purge(older_than=0) == 1
+
+
+def test_named_lock_lease_expires(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.acquire_lock("ingest", "a", ttl=0.2)
+    assert not queue.acquire_lock("ingest", "b", ttl=0.2)
+    # 持有者可以续期
+    assert queue.acquire_lock("ingest", "a", ttl=0.2)
+    
+    time.sleep(0.3)
+    assert queue.acquire_lock("ingest", "b", ttl=0.2)
+    assert not queue.acquire_lock("ingest", "a", ttl=0.2)
+    
+    queue.release_lock("ingest", "b")
+    assert queue.acquire_lock("ingest", "a", ttl=0.2)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from news_frame import NewsFrame
+
+
+def make_news(i: int, **fields):
+    return dict({"url": f"https://example.com/{i}", "platform": "腾讯新闻", "keyword": "测试"}, **fields)
+
+
+def test_columns_grow_past_initial_capacity():
+    frame = NewsFrame(capacity=2)
+    news = [make_news(i, read_count=i, publish_ts=1000 + i) for i in range(5)]
+    frame.sync(news[:1])
+    frame.sync(news)
+    
+    assert frame.count == 5
+    assert frame.capacity == 8
+    assert frame.column("read_count").tolist() == [0, 1, 2, 3, 4]
+    assert frame.column("publish_ts").tolist() == [1000, 1001, 1002, 1003, 1004]
+
+
+def test_missing_values():
+    frame = NewsFrame()
+    frame.sync([make_news(0, read_count=None, publish_time="无效时间", platform=None)])
+    
+    assert frame.column("read_count").tolist() == [0]
+    assert np.isnan(frame.column("publish_ts")[0])
+    assert frame.count_by("platform") == {"": 1}
+
+
+def test_aggregates_with_mask():
+    frame = NewsFrame()
+    frame.sync([
+        make_news(0, platform="腾讯新闻", sentiment="positive", read_count=10, like_count=1),
+        make_news(1, platform="微博", sentiment="negative", read_count=5, comment_count=2),
+        make_news(2, platform="腾讯新闻", keyword="其他", sentiment="positive", read_count=1)
+    ])
+    
+    assert frame.count_by("platform") == {"腾讯新闻": 2, "微博": 1}
+    mask = frame.mask_for("keyword", "测试")
+    assert mask.tolist() == [True, True, False]
+    assert frame.count_by("sentiment", mask) == {"positive": 1, "negative": 1}
+    assert frame.interaction_totals(mask) == {
+        "read_count": 15, "comment_count": 2, "like_count": 1, "share_count": 0, "forward_count": 0
+    }
+    assert frame.interaction_totals()["read_count"] == 16
+    assert not frame.mask_for("keyword", "不存在").any()
+    assert frame.weighted_sum({"read_count": 1, "comment_count": 5}).tolist() == [10, 15, 1]
+
+
+def test_update_rewrites_counts_and_codes():
+    frame = NewsFrame()
+    old = make_news(0, read_count=1, sentiment="positive")
+    frame.sync([old, make_news(1, read_count=2, sentiment="positive")])
+    
+    frame.update(0, old, dict(old, read_count=50, sentiment="negative"))
+    
+    assert frame.column("read_count").tolist() == [50, 2]
+    assert frame.count_by("sentiment") == {"positive": 1, "negative": 1}
@@ -0,0 +1,94 @@
+from news_index import NewsIndex, url_fingerprint
+
+
+def make_news(i: int, **fields):
+    return dict({"url": f"https://example.com/{i}", "title": f"新闻{i}"}, **fields)
+
+
+def test_url_positions():
+    index = NewsIndex()
+    index.sync([make_news(0), make_news(1), make_news(0)])
+    
+    assert index.contains_url("https://example.com/1")
+    assert not index.contains_url("https://example.com/2")
+    # URL重复时保留第一条
+    assert index.position_of("https://example.com/0") == 0
+    assert index.position_of("https://example.com/2") is None
+    assert index.count == 3
+    assert index.last_fingerprint == url_fingerprint("https://example.com/0")
+
+
+def test_sync_adds_only_new_items():
+    news = [make_news(i) for i in range(3)]
+    index = NewsIndex()
+    assert index.sync(news) == 3
+    assert index.sync(news) == 0
+    
+    news.append(make_news(3))
+    assert index.sync(news) == 1
+    assert index.position_of("https://example.com/3") == 3
+
+
+def test_sync_rebuilds_after_rewrite():
+    index = NewsIndex()
+    index.sync([make_news(i) for i in range(3)])
+    
+    assert index.sync([make_news(5), make_news(6), make_news(7), make_news(8)]) == 4
+    assert not index.contains_url("https://example.com/0")
+    assert index.position_of("https://example.com/8") == 3
+
+
+def test_round_trip_does_not_share_saved_lists():
+    index = NewsIndex()
+    index.sync([make_news(0, keyword="测试"), make_news(1, keyword="测试")])
+    saved = index.to_dict()
+    
+    restored = NewsIndex.from_dict(saved)
+    assert restored.to_dict() == saved
+    assert restored.position_of("https://example.com/1") == 1
+    
+    restored.sync([make_news(0, keyword="测试"), make_news(1, keyword="测试"), make_news(2, keyword="测试")])
+    assert saved["by_keyword"]["测试"] == [0, 1]
+    assert url_fingerprint("https://example.com/2") not in saved["url_positions"]
+
+
+def test_from_dict_discards_other_versions():
+    index = NewsIndex()
+    index.sync([make_news(0)])
+    saved = dict(index.to_dict(), version=-1)
+    assert NewsIndex.from_dict(saved).count == 0
+    assert NewsIndex.from_dict(None).count == 0
+
+
+def test_secondary_indexes():
+    news = [
+        make_news(0, keyword="芯片", platform_type="tencent", tags=["科技", "芯片", "科技"],
+                  publish_time="2026-10-01 08:00:00"),
+        make_news(1, keyword="芯片", platform_type="weibo", tags=["财经"], publish_time="2026-10-02"),
+        make_news(2, keyword="新能源", platform_type="tencent", tags=["科技"], publish_time="无效时间"),
+        make_news(3, keyword="", platform_type="toutiao", publish_ts=None, publish_time="2026-10-01")
+    ]
+    index = NewsIndex()
+    index.sync(news)
+    
+    assert index.by_keyword == {"芯片": [0, 1], "新能源": [2]}
+    assert index.by_platform_type == {"tencent": [0, 2], "weibo": [1], "toutiao": [3]}
+    # 同一新闻的重复标签只记录一次
+    assert index.by_tag == {"科技": [0, 2], "芯片": [0], "财经": [1]}
+    # publish_ts为None表示入库时已确认发布时间无效
+    assert index.by_day == {"2026-10-01": [0], "2026-10-02": [1]}
+
+
+def test_positions_for_tags_and_days():
+    news = [
+        make_news(0, tags=["科技"], publish_time="2026-10-02"),
+        make_news(1, tags=["财经", "科技"], publish_time="2026-10-01"),
+        make_news(2, tags=["体育"], publish_time="2026-10-02"),
+        make_news(3, tags=["财经"], publish_time="2026-10-03")
+    ]
+    index = NewsIndex()
+    index.sync(news)
+    
+    assert index.positions_for_tags(["科技", "财经"]) == [0, 1, 3]
+    assert index.positions_for_tags(["不存在"]) == []
+    assert index.positions_for_days(["2026-10-02", "2026-10-01"]) == [0, 1, 2]
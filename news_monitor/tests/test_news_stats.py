@@ -0,0 +1,70 @@
+from news_index import parse_publish_time, day_of
+from news_stats import NewsStats, STATS_VERSION
+
+
+def make_news(i: int, **fields):
+    return dict({"url": f"https://example.com/{i}", "platform": "腾讯新闻", "keyword": "测试",
+                 "publish_time": "2026-10-01 08:00:00"}, **fields)
+
+
+def test_counts_are_kept_incrementally():
+    stats = NewsStats()
+    news = [
+        make_news(0, read_count=10, like_count=1, sentiment="positive"),
+        make_news(1, platform="微博", read_count=5, comment_count=2, sentiment="negative"),
+        make_news(2, keyword="其他", publish_time="无效时间", read_count=None, sentiment="positive")
+    ]
+    assert stats.sync(news[:1]) == 1
+    assert stats.sync(news) == 2
+    assert stats.sync(news) == 0
+    
+    day = day_of(parse_publish_time("2026-10-01 08:00:00"))
+    assert stats.total_news == 3
+    assert stats.by_platform == {"腾讯新闻": 2, "微博": 1}
+    assert stats.by_keyword == {"测试": 2, "其他": 1}
+    # 发布时间无效的新闻不计入日期统计
+    assert stats.by_day == {day: 2}
+    assert stats.interactions["read_count"] == 15
+    assert stats.interactions["comment_count"] == 2
+    assert stats.interactions["like_count"] == 1
+    assert stats.sentiments == {"positive": 2, "negative": 1}
+
+
+def test_update_adjusts_interactions_and_sentiments():
+    stats = NewsStats()
+    old = make_news(0, read_count=10, sentiment="positive")
+    stats.sync([old, make_news(1, read_count=1, sentiment="neutral")])
+    
+    stats.update(0, old, dict(old, read_count=25, share_count=4, sentiment="negative"))
+    
+    assert stats.interactions["read_count"] == 26
+    assert stats.interactions["share_count"] == 4
+    # 计数归零的情感类别被移除
+    assert stats.sentiments == {"neutral": 1, "negative": 1}
+    assert stats.total_news == 2
+
+
+def test_round_trip():
+    stats = NewsStats()
+    stats.sync([make_news(0, read_count=3, sentiment="positive"), make_news(1, platform="微博")])
+    stats.revision = 2
+    
+    data = stats.to_dict()
+    restored = NewsStats.from_dict(data)
+    assert restored.to_dict() == data
+    assert restored.is_consistent([make_news(0), make_news(1)])
+    
+    # 还原的统计不与保存的字典共享数据
+    restored.sync([make_news(0), make_news(1), make_news(2)])
+    assert data["by_platform"] == {"腾讯新闻": 1, "微博": 1}
+
+
+def test_other_versions_are_discarded():
+    stats = NewsStats()
+    stats.sync([make_news(0)])
+    data = dict(stats.to_dict(), version=STATS_VERSION + 1)
+    
+    restored = NewsStats.from_dict(data)
+    assert restored.total_news == 0
+    assert restored.revision == 0
+    assert NewsStats.from_dict(None).by_platform == {}
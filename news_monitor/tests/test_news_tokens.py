@@ -0,0 +1,123 @@
+import news_tokens
+from storage import FileStorage
+from news_tokens import TokenStore, WordFrequency, TOKENIZER_VERSION, WORD_FREQ_VERSION, cut_texts, is_word
+
+
+def make_storage(data_dir) -> FileStorage:
+    return FileStorage(str(data_dir), log_collections=["news_tokens"])
+
+
+def make_news(i: int, title: str, content: str = "", keyword: str = "测试"):
+    return {"url": f"https://example.com/{i}", "title": title, "content": content, "keyword": keyword}
+
+
+def test_is_word():
+    assert is_word("经济")
+    assert not is_word("经")
+    assert not is_word("2026")
+    assert not is_word("我们")
+    assert not is_word("HTTPS")
+    assert not is_word("，。")
+
+
+def test_cut_texts_keeps_texts_apart():
+    results = cut_texts(["股市上涨\n明显", "", "央行降息"])
+    assert len(results) == 3
+    assert "".join(results[0]) == "股市上涨 明显"
+    assert results[1] == []
+    assert "".join(results[2]) == "央行降息"
+    assert cut_texts([]) == []
+
+
+def test_tokens_are_saved_once(tmp_path, monkeypatch):
+    store = TokenStore(make_storage(tmp_path))
+    news = [make_news(0, "股市大涨"), make_news(1, "央行宣布降息")]
+    tokens = store.get_tokens(news)
+    assert all(tokens)
+    
+    # 再次读取和新的实例都直接使用保存的分词结果
+    monkeypatch.setattr(news_tokens, "segment", lambda texts: [["重新分词"] for _ in texts])
+    assert store.get_tokens(news) == tokens
+    assert TokenStore(make_storage(tmp_path)).get_tokens(news[::-1]) == tokens[::-1]
+    
+    # 内容变化后重新分词
+    assert store.get_tokens([make_news(0, "股市大跌")]) == [["重新分词"]]
+    assert len(make_storage(tmp_path).load_json("news_tokens")) == 3
+
+
+def test_records_from_other_instances_are_applied(tmp_path, monkeypatch):
+    # 共用同一存储的实例，如Web服务中的数据管理器和入库
+    storage = make_storage(tmp_path)
+    store = TokenStore(storage)
+    other = TokenStore(storage)
+    news = [make_news(0, "股市大涨"), make_news(1, "央行宣布降息")]
+    store.get_tokens(news[:1])
+    tokens = other.get_tokens(news[:1])
+    store.get_tokens(news[1:])
+    
+    calls = []
+    segment = news_tokens.segment
+    monkeypatch.setattr(news_tokens, "segment", lambda texts: calls.append(texts) or segment(texts))
+    # 其他实例追加的记录补充到内存，不重新分词
+    assert other.get_tokens(news)[0] == tokens[0]
+    assert calls == []
+    assert other._applied == 2
+
+
+def test_compaction_is_reloaded(tmp_path):
+    storage = make_storage(tmp_path)
+    store = TokenStore(storage)
+    other = TokenStore(storage)
+    store.get_tokens([make_news(0, "标题0")])
+    other.get_tokens([make_news(0, "标题0")])
+    for i in range(1, 1200):
+        store.get_tokens([make_news(0, f"标题{i}")])
+    assert other.get_tokens([make_news(0, "标题1199")]) == store.get_tokens([make_news(0, "标题1199")])
+    assert len(storage.load_json("news_tokens")) == 1200
+    
+    # 其他进程加载时过期记录过多，整体重写为每篇新闻一条记录
+    reopened = TokenStore(make_storage(tmp_path))
+    reopened.get_tokens([make_news(1, "新闻")])
+    assert len(storage.load_json("news_tokens")) == 2
+    
+    # 已加载的实例发现存储被重写后重新加载
+    assert set(other._load()) == set(reopened._load())
+    assert other._applied == 2
+
+
+def test_word_frequency(tmp_path):
+    store = TokenStore(make_storage(tmp_path))
+    word_freq = WordFrequency(store)
+    news = [
+        make_news(0, "股市大涨", "股市持续上涨"),
+        make_news(1, "股市平稳"),
+        make_news(2, "央行降息", keyword="其他"),
+        make_news(3, "股市", keyword="")
+    ]
+    assert word_freq.sync(news) == 4
+    top = word_freq.top("测试")
+    assert top["股市"] == 3
+    assert next(iter(top)) == "股市"
+    assert word_freq.top("测试", limit=1) == {"股市": 3}
+    assert "降息" in word_freq.top("其他")
+    
+    # 正文变化时替换该新闻的词
+    word_freq.update(1, news[1], make_news(1, "央行降息"))
+    assert word_freq.top("测试")["股市"] == 2
+    assert word_freq.top("测试")["降息"] == 1
+
+
+def test_word_frequency_round_trip(tmp_path):
+    store = TokenStore(make_storage(tmp_path))
+    word_freq = WordFrequency(store)
+    word_freq.sync([make_news(0, "股市大涨")])
+    
+    data = word_freq.to_dict()
+    restored = WordFrequency.from_dict(data, store)
+    assert restored.to_dict() == data
+    restored.by_keyword["测试"]["股市"] += 1
+    assert data["by_keyword"]["测试"]["股市"] == 1
+    
+    # 词频或分词规则版本变化时丢弃
+    assert WordFrequency.from_dict(dict(data, version=WORD_FREQ_VERSION + 1), store).count == 0
+    assert WordFrequency.from_dict(dict(data, tokenizer_version=TOKENIZER_VERSION + 1), store).count == 0
@@ -0,0 +1,91 @@
+import time
+import threading
+
+import requests
+
+from rate_limiter import TokenBucket, HostRateLimiter, is_captcha, PRIORITY_SEARCH, PRIORITY_ARTICLE
+
+
+def make_response(url: str, status_code: int = 200, body: str = "", headers=None) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers.update(headers or {"Content-Type": "text/html"})
+    return response
+
+
+def test_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=20.0, burst=2)
+    assert bucket.acquire() < 0.01
+    assert bucket.acquire() < 0.01
+    # 令牌用完后按速率补充
+    assert 0.03 < bucket.acquire() < 0.2
+
+
+def test_higher_priority_waiters_go_first():
+    bucket = TokenBucket(rate=10.0, burst=1)
+    bucket.acquire()
+    order = []
+    
+    def worker(name, priority):
+        bucket.acquire(priority)
+        order.append(name)
+    
+    # 文章请求先开始等待，补充的第一个令牌仍被之后到达的搜索请求取走
+    threads = [threading.Thread(target=worker, args=("article", PRIORITY_ARTICLE))]
+    threads[0].start()
+    time.sleep(0.02)
+    threads.append(threading.Thread(target=worker, args=("search", PRIORITY_SEARCH)))
+    threads[1].start()
+    for thread in threads:
+        thread.join(timeout=2)
+    
+    assert order == ["search", "article"]
+
+
+def test_block_discards_tokens():
+    bucket = TokenBucket(rate=100.0, burst=5)
+    bucket.block(0.1)
+    assert bucket.acquire() >= 0.09
+
+
+def test_hosts_have_separate_buckets():
+    limiter = HostRateLimiter(default_rate=1.0, default_burst=1, host_rates={"slow.com": (0.1, 1)})
+    assert limiter.acquire("https://a.com/1") < 0.01
+    assert limiter.acquire("https://b.com/1") < 0.01
+    assert limiter._bucket("slow.com").rate == 0.1
+    assert limiter._bucket("a.com").rate == 1.0
+
+
+def test_backoff_doubles_and_decays():
+    limiter = HostRateLimiter(backoff_base=0.01, backoff_max=0.04)
+    assert limiter.throttled("https://a.com/1") == 0.01
+    assert limiter.throttled("https://a.com/2") == 0.02
+    assert limiter.throttled("https://a.com/3") == 0.04
+    assert limiter.throttled("https://a.com/4") == 0.04
+    # 站点要求的等待时间更长时以站点为准
+    assert limiter.throttled("https://a.com/5", retry_after=0.5) == 0.5
+    
+    limiter.succeeded("https://a.com/6")
+    assert limiter._backoffs["a.com"] == 0.02
+    limiter.succeeded("https://a.com/7")
+    limiter.succeeded("https://a.com/8")
+    assert "a.com" not in limiter._backoffs
+
+
+def test_report_detects_throttling():
+    limiter = HostRateLimiter(backoff_base=0.01)
+    assert not limiter.report(make_response("https://a.com/1", body="<html><title>正常</title></html>"))
+    assert limiter.report(make_response("https://a.com/2", status_code=429, headers={"Retry-After": "0"}))
+    assert limiter._backoffs["a.com"] == 0.01
+    assert limiter.report(make_response("https://a.com/3", body="<html><title>验证</title>请输入验证码</html>"))
+
+
+def test_is_captcha():
+    assert is_captcha(make_response("https://www.sogou.com/antispider/?from=news"))
+    assert is_captcha(make_response("https://a.com/1", body="<title>提示</title>访问过于频繁"))
+    # 正文中提到验证码的长页面不是验证码页面
+    assert not is_captcha(make_response("https://a.com/1", body="<title>新闻</title>请输入验证码" + "正文" * 10000))
+    assert not is_captcha(make_response("https://a.com/1", body="访问过于频繁", headers={"Content-Type": "application/json"}))
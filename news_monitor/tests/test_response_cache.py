@@ -0,0 +1,123 @@
+import os
+import time
+
+import requests
+
+from response_cache import ResponseCache, freshness_lifetime, parse_cache_control
+
+
+def make_response(url: str, body: str = "页面", headers=None, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response._content = body.encode("utf-8")
+    response.headers.update(headers or {})
+    return response
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('max-age=60, No-Store, private="x"') == {"max-age": "60", "no-store": None, "private": "x"}
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime({"Cache-Control": "max-age=60", "Age": "10"}) == 50
+    assert freshness_lifetime({"Cache-Control": "max-age=60, no-cache"}) == 0
+    assert freshness_lifetime({"Expires": "Thu, 01 Oct 2026 08:01:00 GMT", "Date": "Thu, 01 Oct 2026 08:00:00 GMT"}) == 60
+    # 无效的Expires视为已过期，没有声明时返回None
+    assert freshness_lifetime({"Expires": "0"}) == 0
+    assert freshness_lifetime({}) is None
+
+
+def test_fresh_response_is_served_from_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://example.com/1"
+    assert cache.store(url, make_response(url, headers={"Cache-Control": "max-age=60", "Content-Encoding": "gzip"}))
+    
+    response, conditional = cache.lookup(url)
+    assert response.text == "页面"
+    assert response.from_cache == "hit"
+    assert "Content-Encoding" not in response.headers
+    assert conditional == {}
+    
+    # 重新打开时从目录恢复缓存
+    reopened = ResponseCache(str(tmp_path))
+    assert reopened.lookup(url)[0].text == "页面"
+    assert reopened.get_stats()["entries"] == 1
+
+
+def test_uncacheable_responses(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://example.com/1"
+    assert not cache.store(url, make_response(url, headers={"Cache-Control": "max-age=60, no-store"}))
+    assert not cache.store(url, make_response(url, headers={"ETag": '"a"', "Vary": "*"}))
+    assert not cache.store(url, make_response(url, headers={"ETag": '"a"'}, status_code=404))
+    # 既没有验证信息也没有有效期
+    assert not cache.store(url, make_response(url))
+    assert cache.lookup(url) == (None, {})
+    assert cache.get_stats()["miss"] == 1
+
+
+def test_stale_response_is_revalidated(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://example.com/1"
+    headers = {"ETag": '"v1"', "Last-Modified": "Thu, 01 Oct 2026 08:00:00 GMT"}
+    assert cache.store(url, make_response(url, headers=headers))
+    
+    response, conditional = cache.lookup(url)
+    assert response is None
+    assert conditional == {"If-None-Match": '"v1"', "If-Modified-Since": "Thu, 01 Oct 2026 08:00:00 GMT"}
+    
+    # 304响应的缓存头合并到缓存中
+    revalidated = cache.revalidated(url, make_response(url, body="", status_code=304, headers={"Cache-Control": "max-age=60"}))
+    assert revalidated.text == "页面"
+    assert revalidated.from_cache == "revalidated"
+    assert cache.lookup(url)[0].from_cache == "hit"
+    assert cache.revalidated("https://example.com/2", make_response(url, status_code=304)) is None
+    
+    stats = cache.get_stats()
+    assert (stats["hit"], stats["revalidated"], stats["stored"]) == (1, 1, 1)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    url_a, url_b, url_c = "https://example.com/a", "https://example.com/b", "https://example.com/c"
+    cache = ResponseCache(str(tmp_path))
+    cache.store(url_a, make_response(url_a, headers={"ETag": '"a"'}))
+    size = cache.get_stats()["bytes"]
+    cache.max_bytes = 2 * size + 10
+    
+    cache.store(url_b, make_response(url_b, headers={"ETag": '"b"'}))
+    cache.lookup(url_a)
+    cache.revalidated(url_a, make_response(url_a, status_code=304))
+    cache.store(url_c, make_response(url_c, headers={"ETag": '"c"'}))
+    
+    assert cache.get_stats()["evicted"] == 1
+    assert cache.lookup(url_b) == (None, {})
+    assert cache.lookup(url_a)[1] == {"If-None-Match": '"a"'}
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_restart_restores_usage_order(tmp_path):
+    urls = [f"https://example.com/{i}" for i in range(3)]
+    cache = ResponseCache(str(tmp_path))
+    for i, url in enumerate(urls):
+        cache.store(url, make_response(url, headers={"ETag": f'"{i}"'}))
+        path = cache._path(cache._key(url))
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    size = cache.get_stats()["bytes"] // 3
+    
+    # 使用时间记录在mtime中，重启后最早使用的先淘汰
+    reopened = ResponseCache(str(tmp_path), max_bytes=2 * size + 10)
+    assert reopened.get_stats()["entries"] == 2
+    assert reopened.lookup(urls[0]) == (None, {})
+    assert reopened.lookup(urls[2])[1] == {"If-None-Match": '"2"'}
+
+
+def test_corrupted_file_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://example.com/1"
+    cache.store(url, make_response(url, headers={"Cache-Control": "max-age=60"}))
+    with open(cache._path(cache._key(url)), 'wb') as f:
+        f.write(b"not json")
+    
+    assert cache.lookup(url) == (None, {})
@@ -0,0 +1,85 @@
+import pytest
+
+from sentiment_analyzer import (
+    SentimentAnalyzer, SENTIMENT_POSITIVE, SENTIMENT_NEUTRAL, SENTIMENT_NEGATIVE, NEGATED_DEGREE_WEIGHT
+)
+
+
+@pytest.fixture
+def analyzer() -> SentimentAnalyzer:
+    return SentimentAnalyzer()
+
+
+def test_polarity_words(analyzer):
+    assert analyzer.score_tokens(["产品", "满意"]) == 1.0
+    assert analyzer.score_tokens(["产品", "失望"]) == -1.0
+    assert analyzer.score_tokens(["产品", "发布"]) == 0.0
+    assert analyzer.score_tokens(["满意", "失望"]) == 0.0
+
+
+def test_negation_flips_polarity(analyzer):
+    assert analyzer.score_tokens(["不", "满意"]) == -1.0
+    assert analyzer.score_tokens(["没有", "风险"]) == 1.0
+    # 双重否定恢复原极性
+    assert analyzer.score_tokens(["并非", "不", "满意"]) == 1.0
+
+
+def test_negation_merged_with_following_word(analyzer):
+    # jieba常把“不好”切为一个词
+    assert analyzer.score_tokens(["不好"]) == -1.0
+    assert analyzer.score_tokens(["不太", "满意"]) == -1.0
+    # 本身就是否定词或情感词的词不拆开
+    assert analyzer.score_tokens(["无法", "满意"]) == -1.0
+    assert analyzer.score_tokens(["不满"]) == -1.0
+
+
+def test_negation_stops_at_clause_boundary(analyzer):
+    assert analyzer.score_tokens(["不", "，", "满意"]) == 1.0
+    assert analyzer.score_tokens(["非常", "。", "满意", "失望"]) == 0.0
+
+
+def test_degree_words_scale_intensity(analyzer):
+    # 正面1.75对负面1
+    assert analyzer.score_tokens(["非常", "满意", "失望"]) == pytest.approx(0.75 / 2.75)
+    # 正面0.6对负面1
+    assert analyzer.score_tokens(["稍微", "满意", "失望"]) == pytest.approx(-0.4 / 1.6)
+    # 程度副词只作用于之后的第一个情感词
+    assert analyzer.score_tokens(["非常", "满意", "失望", "满意"]) == pytest.approx(1.75 / 3.75)
+
+
+def test_degree_after_negation_weakens(analyzer):
+    weight = 1.5 * NEGATED_DEGREE_WEIGHT
+    assert analyzer.score_tokens(["不", "太", "满意", "满意"]) == pytest.approx((1 - weight) / (1 + weight))
+
+
+def test_label_threshold():
+    analyzer = SentimentAnalyzer(threshold=0.3)
+    assert analyzer.label(0.3) == SENTIMENT_POSITIVE
+    assert analyzer.label(0.29) == SENTIMENT_NEUTRAL
+    assert analyzer.label(-0.29) == SENTIMENT_NEUTRAL
+    assert analyzer.label(-0.3) == SENTIMENT_NEGATIVE
+
+
+def test_custom_lexicon():
+    analyzer = SentimentAnalyzer(positive_words=["靠谱"], negative_words=["离谱"], negation_words=["并不"],
+                                 degree_words={"超": 3.0})
+    assert analyzer.score_tokens(["靠谱"]) == 1.0
+    assert analyzer.score_tokens(["满意"]) == 0.0
+    assert analyzer.score_tokens(["并不", "离谱"]) == 1.0
+    assert analyzer.score_tokens(["超", "靠谱", "离谱"]) == pytest.approx(2.0 / 4.0)
+
+
+def test_score_items_skips_scored_news(analyzer):
+    items = [
+        {"title": "业绩大涨", "content": "市场表现优秀"},
+        {"title": "公司亏损", "content": "投资者担忧", "sentiment": "positive"},
+        {"title": "公司亏损", "sentiment": "positive", "sentiment_score": 0.5}
+    ]
+    assert analyzer.score_items(items) == 2
+    assert items[0]["sentiment"] == SENTIMENT_POSITIVE
+    # 来源自带的sentiment没有sentiment_score，会被覆盖
+    assert items[1]["sentiment"] == SENTIMENT_NEGATIVE
+    assert items[2]["sentiment_score"] == 0.5
+    
+    assert analyzer.score_items(items, rescore=True) == 3
+    assert items[2]["sentiment"] == SENTIMENT_NEGATIVE
@@ -0,0 +1,192 @@
+import os
+import json
+
+from storage import FileStorage
+
+
+def make_storage(data_dir, **kwargs) -> FileStorage:
+    return FileStorage(str(data_dir), log_collections=["items"], **kwargs)
+
+
+def test_log_replay_round_trip(tmp_path):
+    storage = make_storage(tmp_path)
+    assert storage.extend_json("items", [{"id": i, "value": i} for i in range(5)])
+    assert storage.update_json("items", {"id": 1}, {"value": 10})
+    assert storage.update_many_json("items", [({"id": 2}, {"value": 20}), ({"id": 99}, {"value": 0})])
+    assert storage.delete_json("items", {"id": 3})
+    assert storage.append_json("items", {"id": 5, "value": 5})
+    
+    expected = [{"id": 0, "value": 0}, {"id": 1, "value": 10}, {"id": 2, "value": 20},
+                {"id": 4, "value": 4}, {"id": 5, "value": 5}]
+    assert storage.load_json("items") == expected
+    # 新实例没有缓存，从日志分段重放
+    assert make_storage(tmp_path).load_json("items") == expected
+
+
+def test_compact_round_trip(tmp_path):
+    storage = make_storage(tmp_path, segment_max_bytes=64)
+    storage.extend_json("items", [{"id": i, "value": i} for i in range(10)])
+    for i in range(10):
+        storage.extend_json("items", [{"id": 10 + i, "value": i}])
+    storage.update_json("items", {"id": 0}, {"value": -1})
+    storage.delete_json("items", {"id": 1})
+    before = storage.load_json("items")
+    assert len(storage._list_segments("items")) > 1
+    
+    assert storage.compact("items")
+    
+    assert len(storage._list_segments("items")) == 1
+    assert make_storage(tmp_path).load_json("items") == before
+    # 压缩后继续追加和更新
+    storage.append_json("items", {"id": 100, "value": 100})
+    storage.update_json("items", {"id": 100}, {"value": 101})
+    assert make_storage(tmp_path).load_json("items") == before + [{"id": 100, "value": 101}]
+
+
+def test_auto_compact_after_threshold(tmp_path):
+    storage = make_storage(tmp_path, compact_threshold=3)
+    storage.extend_json("items", [{"id": i, "value": i} for i in range(3)])
+    for i in range(3):
+        storage.update_json("items", {"id": i}, {"value": i + 100})
+    
+    with open(storage._list_segments("items")[-1], encoding="utf-8") as f:
+        ops = [json.loads(line)["op"] for line in f]
+    assert ops == ["base", "put", "put", "put"]
+    assert make_storage(tmp_path).load_json("items") == [{"id": i, "value": i + 100} for i in range(3)]
+
+
+def test_replay_skips_truncated_record(tmp_path):
+    storage = make_storage(tmp_path)
+    storage.extend_json("items", [{"id": 0}, {"id": 1}])
+    with open(storage._list_segments("items")[-1], "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "item": {"id"')
+    
+    reopened = make_storage(tmp_path)
+    assert reopened.load_json("items") == [{"id": 0}, {"id": 1}]
+    # 之后的写入另起一行，不与损坏的记录粘连
+    reopened.append_json("items", {"id": 2})
+    assert make_storage(tmp_path).load_json("items") == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+
+def test_legacy_json_file_is_imported(tmp_path):
+    with open(os.path.join(tmp_path, "items.json"), "w", encoding="utf-8") as f:
+        json.dump([{"id": 0}, {"id": 1}], f)
+    
+    storage = make_storage(tmp_path)
+    assert storage.load_json("items") == [{"id": 0}, {"id": 1}]
+    assert os.path.isdir(os.path.join(tmp_path, "items.log"))
+
+
+
+def test_cache_sees_writes_from_other_instances(tmp_path):
+    reader = make_storage(tmp_path)
+    writer = make_storage(tmp_path)
+    writer.extend_json("items", [{"id": 0}])
+    assert reader.load_json("items") == [{"id": 0}]
+    
+    writer.update_json("items", {"id": 0}, {"value": 1})
+    writer.append_json("items", {"id": 1})
+    assert reader.load_json("items") == [{"id": 0, "value": 1}, {"id": 1}]
+
+
+def test_unchanged_collection_is_served_from_cache(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    storage.save_json("doc", {"a": 1})
+    first = storage.load_json("doc")
+    assert storage.load_json("doc") is first
+    
+    # 其他实例重写文件后重新解析
+    FileStorage(str(tmp_path)).save_json("doc", {"a": 2, "b": 3})
+    assert storage.load_json("doc") == {"a": 2, "b": 3}
+
+
+def test_extend_appends_to_fresh_cache_in_place(tmp_path, monkeypatch):
+    storage = make_storage(tmp_path)
+    storage.extend_json("items", [{"id": 0}])
+    cached = storage.load_json("items")
+    
+    replays = []
+    replay = storage._replay_log
+    monkeypatch.setattr(storage, "_replay_log", lambda collection: replays.append(collection) or replay(collection))
+    storage.extend_json("items", [{"id": 1}, {"id": 2}])
+    
+    assert storage.load_json("items") is cached
+    assert cached == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert replays == []
+
+
+def test_extend_after_foreign_write_invalidates_cache(tmp_path):
+    storage = make_storage(tmp_path)
+    storage.extend_json("items", [{"id": 0}])
+    cached = storage.load_json("items")
+    
+    make_storage(tmp_path).append_json("items", {"id": 1})
+    storage.append_json("items", {"id": 2})
+    
+    # 缓存与写入前的文件不一致，不能直接追加，下次读取时重放日志
+    assert cached == [{"id": 0}]
+    assert storage.load_json("items") == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    writer = FileStorage(str(tmp_path))
+    for name in ("a", "b", "c"):
+        writer.save_json(name, ["x" * 40])
+    size = os.path.getsize(os.path.join(tmp_path, "a.json"))
+    
+    storage = FileStorage(str(tmp_path), cache_max_bytes=2 * size)
+    a = storage.load_json("a")
+    storage.load_json("b")
+    assert storage.load_json("a") is a
+    storage.load_json("c")
+    
+    assert list(storage._cache) == ["a", "c"]
+    assert storage._cache_bytes == 2 * size
+    assert storage.load_json("a") is a
+
+
+def test_collection_larger_than_budget_is_not_cached(tmp_path):
+    storage = FileStorage(str(tmp_path), cache_max_bytes=10)
+    storage.save_json("big", ["x" * 100])
+    
+    first = storage.load_json("big")
+    assert storage.load_json("big") == first
+    assert storage.load_json("big") is not first
+    assert storage._cache_bytes == 0
+
+
+def test_clear_cache(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    storage.save_json("doc", [1])
+    first = storage.load_json("doc")
+    storage.clear_cache()
+    assert storage.load_json("doc") is not first
+
+
+def test_update_many_applies_all_updates(tmp_path, monkeypatch):
+    storage = make_storage(tmp_path)
+    storage.extend_json("items", [{"id": i, "count": 0} for i in range(3)])
+    cached = storage.load_json("items")
+    
+    replays = []
+    replay = storage._replay_log
+    monkeypatch.setattr(storage, "_replay_log", lambda collection: replays.append(collection) or replay(collection))
+    # 同一数据项的多次更新按顺序应用，没有匹配的更新被忽略
+    assert storage.update_many_json("items", [
+        ({"id": 1}, {"count": 5}), ({"id": 2}, {"count": 1}), ({"id": 1}, {"count": 7}), ({"id": 9}, {"count": 1})
+    ])
+    
+    # 缓存已原地更新，读取时不重放日志
+    assert storage.load_json("items") is cached
+    assert replays == []
+    assert cached == [{"id": 0, "count": 0}, {"id": 1, "count": 7}, {"id": 2, "count": 1}]
+    assert make_storage(tmp_path).load_json("items") == cached
+
+
+def test_update_many_changes_query_field(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    storage.save_json("items", [{"id": 0}, {"id": 1}])
+    
+    # 更新改变了查询字段时，之后的查询不能使用过期的取值索引
+    assert storage.update_many_json("items", [({"id": 0}, {"id": 2}), ({"id": 2}, {"name": "a"}), ({"id": 0}, {"name": "b"})])
+    assert FileStorage(str(tmp_path)).load_json("items") == [{"id": 2, "name": "a"}, {"id": 1}]
@@ -1,26 +1,51 @@
 import os
+import time
 import logging
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime, timedelta
-import random
-from wordcloud import WordCloud
-import jieba
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from news_index import publish_timestamp, day_of
+from chart_cache import ChartCache
+from sentiment_analyzer import SENTIMENT_LABELS
+from chart_renderer import (
+    ChartRenderer, CHART_COLORS, render_trend_chart, render_tag_chart, render_wordcloud,
+    render_pie_chart, render_interaction_chart
+)
+
+# 图表渲染版本，修改图表样式后递增，使已缓存的图片失效
+RENDERER_VERSION = 2
+
+# 词云使用的词数，与词云的max_words一致
+WORDCLOUD_MAX_WORDS = 100
+
+# 分析页面词频图显示的词数
+TOP_WORDS_CHART_SIZE = 20
+
+# 互动数据图的类型名称和对应字段
+INTERACTION_FIELDS = [
+    ("阅读量", "read_count"),
+    ("评论数", "comment_count"),
+    ("点赞数", "like_count"),
+    ("分享数", "share_count"),
+    ("转发数", "forward_count")
+]
 
 class TrendAnalyzer:
     """
     趋势分析类，提供舆情趋势分析和可视化功能
     """
     
-    def __init__(self, news_data_manager, static_dir):
+    def __init__(self, news_data_manager, static_dir, chart_renderer: Optional[ChartRenderer] = None,
+                 render_timeout: float = 60.0):
         """
         初始化趋势分析器
         
         Args:
             news_data_manager: 新闻数据管理器
             static_dir: 静态文件目录
+            chart_renderer: 图表渲染服务，默认创建新的渲染进程池
+            render_timeout: 等待单个图表绘制完成的最长时间（秒）
         """
         self.news_data_manager = news_data_manager
         self.static_dir = static_dir
@@ -29,14 +54,20 @@ class TrendAnalyzer:
         
         # 确保图片目录存在
         os.makedirs(self.images_dir, exist_ok=True)
+        
+        # 相同输入的图表只渲染一次
+        self.chart_cache = ChartCache(self.images_dir, renderer_version=RENDERER_VERSION)
+        self.chart_renderer = chart_renderer or ChartRenderer()
+        self.render_timeout = render_timeout
     
-    def analyze_trend(self, keyword: str, days: int = 30) -> Dict[str, Any]:
+    def analyze_trend(self, keyword: str, days: int = 30, render_charts: bool = True) -> Dict[str, Any]:
         """
         分析关键词趋势
         
         Args:
             keyword: 关键词
             days: 天数
+            render_charts: 是否生成图表图片，为False时只返回chart_data中的图表数据，由页面绘制
             
         Returns:
             趋势分析结果
@@ -51,8 +82,13 @@ class TrendAnalyzer:
                 self.logger.warning(f"未找到关键词 '{keyword}' 的相关新闻")
                 return {}
             
-            # 生成趋势图
-            trend_chart_path = self.generate_trend_chart(keyword, news_list, days)
+            # 各图表提交后在渲染进程中并行绘制，最后统一等待
+            charts: Dict[str, Future] = {}
+            
+            # 统计每天的新闻数量并生成趋势图
+            date_counts = self.count_daily_news(news_list, days)
+            if render_charts:
+                charts["trend_chart"] = self.generate_trend_chart(keyword, date_counts, days)
             
             # 计算热度变化
             heat_change = self.calculate_heat_change(news_list)
@@ -62,42 +98,56 @@ class TrendAnalyzer:
             
             # 分析标签分布
             tag_distribution = self.news_data_manager.get_tag_distribution_by_keyword(keyword)
-            tag_chart_path = self.generate_tag_chart(keyword, tag_distribution)
+            if render_charts:
+                charts["tag_chart"] = self.generate_tag_chart(keyword, tag_distribution)
             
-            # 生成词云
-            wordcloud_path = self.generate_wordcloud(keyword, news_list)
+            # 生成词云，词频随新闻入库增量维护，无需重新分词
+            word_frequency = self.news_data_manager.get_top_words(keyword, WORDCLOUD_MAX_WORDS)
+            if render_charts:
+                charts["wordcloud"] = self.generate_wordcloud(keyword, word_frequency)
             
-            # 情感分析
-            sentiment_analysis = self.analyze_sentiment(news_list)
-            sentiment_chart_path = self.generate_sentiment_chart(keyword, sentiment_analysis)
+            # 情感分布，情感类别在入库时已分析
+            sentiment_analysis = self.analyze_sentiment(keyword)
+            if render_charts:
+                charts["sentiment_chart"] = self.generate_sentiment_chart(keyword, sentiment_analysis)
             
             # 平台分布
             platform_distribution = self.news_data_manager.get_platform_distribution_by_keyword(keyword)
-            platform_chart_path = self.generate_platform_chart(keyword, platform_distribution)
+            if render_charts:
+                charts["platform_chart"] = self.generate_platform_chart(keyword, platform_distribution)
             
             # 互动数据
             interaction_data = self.news_data_manager.get_interaction_data_by_keyword(keyword)
-            interaction_chart_path = self.generate_interaction_chart(keyword, interaction_data)
+            if render_charts:
+                charts["interaction_chart"] = self.generate_interaction_chart(keyword, interaction_data)
             
             # 生成分析结论
             conclusion = self.generate_conclusion(keyword, heat_change, sentiment_analysis, platform_distribution)
             
+            # 等待图表绘制完成
+            chart_paths = {f"{chart_type}_path": self.wait_chart(future, chart_type) for chart_type, future in charts.items()}
+            
             # 返回分析结果
             return {
                 "keyword": keyword,
                 "days": days,
-                "trend_chart_path": trend_chart_path,
+                **chart_paths,
                 "heat_change": heat_change,
                 "origin_analysis": origin_analysis,
                 "tag_distribution": tag_distribution,
-                "tag_chart_path": tag_chart_path,
-                "wordcloud_path": wordcloud_path,
                 "sentiment_analysis": sentiment_analysis,
-                "sentiment_chart_path": sentiment_chart_path,
                 "platform_distribution": platform_distribution,
-                "platform_chart_path": platform_chart_path,
                 "interaction_data": interaction_data,
-                "interaction_chart_path": interaction_chart_path,
+                "word_frequency": word_frequency,
+                "chart_data": {
+                    "trend": self.chart_series(date_counts),
+                    "tags": self.chart_series(tag_distribution),
+                    "sentiment": self.chart_series(sentiment_analysis),
+                    "platforms": self.chart_series(platform_distribution),
+                    "interactions": self.chart_series(self.interaction_counts(interaction_data)),
+                    "words": self.chart_series(dict(list(word_frequency.items())[:TOP_WORDS_CHART_SIZE])),
+                    "wordcloud": self.chart_series(word_frequency)
+                },
                 "conclusion": conclusion
             }
             
@@ -105,17 +155,103 @@ class TrendAnalyzer:
             self.logger.error(f"分析关键词趋势时发生错误: {str(e)}")
             return {}
     
-    def generate_trend_chart(self, keyword: str, news_list: List[Dict[str, Any]], days: int = 30) -> str:
+    def submit_chart(self, chart_type: str, keyword: str, days: Optional[int], data: Any,
+                     render: Callable[..., None], *args) -> Future:
         """
-        生成趋势图
+        提交图表绘制任务，输入数据未变化时直接使用已生成的图片
         
         Args:
+            chart_type: 图表类型，与默认图片的文件名前缀一致
             keyword: 关键词
+            days: 天数，图表与天数无关时为None
+            data: 决定图表内容的输入数据
+            render: chart_renderer中的绘图函数
+            *args: 绘图函数除保存路径外的参数
+            
+        Returns:
+            结果为图表路径的Future，绘制失败时结果为默认图片路径
+        """
+        result: Future = Future()
+        
+        def done(future: Future) -> None:
+            try:
+                result.set_result(future.result())
+            except Exception as e:
+                self.logger.error(f"绘制图表 {chart_type} 时发生错误: {str(e)}")
+                result.set_result(f"/static/images/{chart_type}_default.png")
+        
+        self.chart_cache.get_or_submit(
+            chart_type, keyword, days, data, lambda path: self.chart_renderer.submit(render, path, *args)
+        ).add_done_callback(done)
+        return result
+    
+    def default_chart(self, chart_type: str) -> Future:
+        """
+        返回默认图片
+        
+        Args:
+            chart_type: 图表类型
+            
+        Returns:
+            结果为默认图片路径的Future
+        """
+        result: Future = Future()
+        result.set_result(f"/static/images/{chart_type}_default.png")
+        return result
+    
+    def wait_chart(self, future: Future, chart_type: str) -> str:
+        """
+        等待图表绘制完成
+        
+        Args:
+            future: 图表路径的Future
+            chart_type: 图表类型
+            
+        Returns:
+            图表路径，超时时返回默认图片路径
+        """
+        try:
+            return future.result(timeout=self.render_timeout)
+        except FutureTimeoutError:
+            self.logger.error(f"等待图表 {chart_type} 绘制超时")
+            return f"/static/images/{chart_type}_default.png"
+    
+    def chart_series(self, counts: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        将名称到数量的字典转换为图表使用的标签和数值列表
+        
+        Args:
+            counts: 名称到数量的字典
+            
+        Returns:
+            包含labels和values的字典
+        """
+        counts = counts or {}
+        return {"labels": list(counts.keys()), "values": list(counts.values())}
+    
+    def interaction_counts(self, interaction_data: Dict[str, int]) -> Dict[str, int]:
+        """
+        按互动类型整理互动数据
+        
+        Args:
+            interaction_data: 互动数据
+            
+        Returns:
+            互动类型名称到数量的字典
+        """
+        interaction_data = interaction_data or {}
+        return {label: interaction_data.get(field, 0) for label, field in INTERACTION_FIELDS}
+    
+    def count_daily_news(self, news_list: List[Dict[str, Any]], days: int = 30) -> Dict[str, int]:
+        """
+        统计最近若干天每天的新闻数量
+        
+        Args:
             news_list: 新闻列表
             days: 天数
             
         Returns:
-            趋势图路径
+            日期到新闻数量的字典，按日期升序
         """
         try:
             # 生成日期范围
@@ -132,53 +268,45 @@ class TrendAnalyzer:
             
             # 统计每天的新闻数量
             for item in news_list:
-                try:
-                    publish_time = item.get("publish_time", "")
-                    if publish_time:
-                        publish_date = datetime.strptime(publish_time, "%Y-%m-%d %H:%M:%S")
-                        date_str = publish_date.strftime("%Y-%m-%d")
-                        
-                        if date_str in date_counts:
-                            date_counts[date_str] += 1
-                except Exception as e:
-                    self.logger.warning(f"解析新闻发布时间失败: {str(e)}")
+                timestamp = publish_timestamp(item)
+                if timestamp is None:
                     continue
+                
+                date_str = day_of(timestamp)
+                if date_str in date_counts:
+                    date_counts[date_str] += 1
             
-            # 准备数据
-            dates = list(date_counts.keys())
-            counts = list(date_counts.values())
-            
-            # 创建图表
-            plt.figure(figsize=(10, 6))
-            plt.plot(dates, counts, marker='o', linestyle='-', color='#3498db', linewidth=2)
-            plt.fill_between(dates, counts, color='#3498db', alpha=0.2)
+            return date_counts
             
-            # 设置标题和标签
-            plt.title(f"关键词 '{keyword}' 的热度趋势", fontsize=16)
-            plt.xlabel("日期", fontsize=12)
-            plt.ylabel("新闻数量", fontsize=12)
-            
-            # 设置x轴标签
-            plt.xticks(rotation=45)
-            
-            # 设置网格
-            plt.grid(True, linestyle='--', alpha=0.7)
+        except Exception as e:
+            self.logger.error(f"统计每天新闻数量时发生错误: {str(e)}")
+            return {}
+    
+    def generate_trend_chart(self, keyword: str, date_counts: Dict[str, int], days: int = 30) -> Future:
+        """
+        生成趋势图
+        
+        Args:
+            keyword: 关键词
+            date_counts: 日期到新闻数量的字典
+            days: 天数
             
-            # 调整布局
-            plt.tight_layout()
+        Returns:
+            结果为趋势图路径的Future
+        """
+        try:
+            if not date_counts:
+                return self.default_chart("trend_chart")
             
-            # 保存图表
-            chart_filename = f"trend_chart_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
+            # 准备数据
+            dates = list(date_counts.keys())
+            counts = list(date_counts.values())
             
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("trend_chart", keyword, days, date_counts, render_trend_chart, keyword, dates, counts)
             
         except Exception as e:
             self.logger.error(f"生成趋势图时发生错误: {str(e)}")
-            return "/static/images/trend_chart_default.png"
+            return self.default_chart("trend_chart")
     
     def calculate_heat_change(self, news_list: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -191,13 +319,7 @@ class TrendAnalyzer:
             热度变化数据
         """
         try:
-            # 按发布时间排序
-            sorted_news = sorted(
-                news_list,
-                key=lambda x: datetime.strptime(x.get("publish_time", "9999-12-31 23:59:59"), "%Y-%m-%d %H:%M:%S")
-            )
-            
-            if not sorted_news:
+            if not news_list:
                 return {
                     "24h_change": 0,
                     "24h_change_rate": 0.0,
@@ -207,37 +329,28 @@ class TrendAnalyzer:
                 }
             
             # 获取当前时间
-            now = datetime.now()
-            
-            # 计算24小时内的新闻数量
-            news_24h = [
-                item for item in sorted_news
-                if (now - datetime.strptime(item.get("publish_time", ""), "%Y-%m-%d %H:%M:%S")).total_seconds() <= 24 * 3600
-            ]
+            now = time.time()
             
-            # 计算24-48小时内的新闻数量
-            news_24h_48h = [
-                item for item in sorted_news
-                if 24 * 3600 < (now - datetime.strptime(item.get("publish_time", ""), "%Y-%m-%d %H:%M:%S")).total_seconds() <= 48 * 3600
-            ]
-            
-            # 计算7天内的新闻数量
-            news_7d = [
-                item for item in sorted_news
-                if (now - datetime.strptime(item.get("publish_time", ""), "%Y-%m-%d %H:%M:%S")).total_seconds() <= 7 * 24 * 3600
-            ]
-            
-            # 计算7-14天内的新闻数量
-            news_7d_14d = [
-                item for item in sorted_news
-                if 7 * 24 * 3600 < (now - datetime.strptime(item.get("publish_time", ""), "%Y-%m-%d %H:%M:%S")).total_seconds() <= 14 * 24 * 3600
-            ]
-            
-            # 计算变化
-            count_24h = len(news_24h)
-            count_24h_48h = len(news_24h_48h)
-            count_7d = len(news_7d)
-            count_7d_14d = len(news_7d_14d)
+            # 一次遍历统计各时间窗口内的新闻数量
+            count_24h = 0
+            count_24h_48h = 0
+            count_7d = 0
+            count_7d_14d = 0
+            for item in news_list:
+                timestamp = publish_timestamp(item)
+                if timestamp is None:
+                    continue
+                
+                age = now - timestamp
+                if age <= 24 * 3600:
+                    count_24h += 1
+                elif age <= 48 * 3600:
+                    count_24h_48h += 1
+                
+                if age <= 7 * 24 * 3600:
+                    count_7d += 1
+                elif age <= 14 * 24 * 3600:
+                    count_7d_14d += 1
             
             # 计算24小时变化
             change_24h = count_24h - count_24h_48h
@@ -327,7 +440,7 @@ class TrendAnalyzer:
                 "possible_causes": []
             }
     
-    def generate_tag_chart(self, keyword: str, tag_distribution: Dict[str, int]) -> str:
+    def generate_tag_chart(self, keyword: str, tag_distribution: Dict[str, int]) -> Future:
         """
         生成标签分布图
         
@@ -336,137 +449,62 @@ class TrendAnalyzer:
             tag_distribution: 标签分布
             
         Returns:
-            标签分布图路径
+            结果为标签分布图路径的Future
         """
         try:
             if not tag_distribution:
-                return "/static/images/tag_chart_default.png"
+                return self.default_chart("tag_chart")
             
             # 准备数据
             tags = list(tag_distribution.keys())
             counts = list(tag_distribution.values())
             
-            # 创建图表
-            plt.figure(figsize=(10, 6))
-            bars = plt.bar(tags, counts, color='#2ecc71')
-            
-            # 添加数值标签
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{int(height)}',
-                        ha='center', va='bottom')
-            
-            # 设置标题和标签
-            plt.title(f"关键词 '{keyword}' 的标签分布", fontsize=16)
-            plt.xlabel("标签", fontsize=12)
-            plt.ylabel("数量", fontsize=12)
-            
-            # 设置x轴标签
-            plt.xticks(rotation=45)
-            
-            # 调整布局
-            plt.tight_layout()
-            
-            # 保存图表
-            chart_filename = f"tag_chart_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
-            
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("tag_chart", keyword, None, tag_distribution, render_tag_chart, keyword, tags, counts)
             
         except Exception as e:
             self.logger.error(f"生成标签分布图时发生错误: {str(e)}")
-            return "/static/images/tag_chart_default.png"
+            return self.default_chart("tag_chart")
     
-    def generate_wordcloud(self, keyword: str, news_list: List[Dict[str, Any]]) -> str:
+    def generate_wordcloud(self, keyword: str, word_frequency: Dict[str, int]) -> Future:
         """
         生成词云
         
         Args:
             keyword: 关键词
-            news_list: 新闻列表
+            word_frequency: 词到出现次数的字典
             
         Returns:
-            词云图路径
+            结果为词云图路径的Future
         """
         try:
-            if not news_list:
-                return "/static/images/wordcloud_default.png"
+            if not word_frequency:
+                return self.default_chart("wordcloud")
             
-            # 提取所有标题和内容
-            text = ""
-            for item in news_list:
-                title = item.get("title", "")
-                content = item.get("content", "")
-                text += title + " " + content + " "
-            
-            # 分词
-            words = jieba.cut(text)
-            word_space_split = " ".join(words)
-            
-            # 创建词云
-            wordcloud = WordCloud(
-                width=800,
-                height=400,
-                background_color='white',
-                max_words=100,
-                max_font_size=150,
-                random_state=42
-            ).generate(word_space_split)
-            
-            # 创建图表
-            plt.figure(figsize=(10, 6))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis("off")
-            
-            # 保存图表
-            chart_filename = f"wordcloud_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
-            
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("wordcloud", keyword, None, word_frequency, render_wordcloud, word_frequency)
             
         except Exception as e:
             self.logger.error(f"生成词云时发生错误: {str(e)}")
-            return "/static/images/wordcloud_default.png"
+            return self.default_chart("wordcloud")
     
-    def analyze_sentiment(self, news_list: List[Dict[str, Any]]) -> Dict[str, int]:
+    def analyze_sentiment(self, keyword: str) -> Dict[str, int]:
         """
         情感分析
         
         Args:
-            news_list: 新闻列表
+            keyword: 关键词
             
         Returns:
-            情感分析结果
+            情感类别名称到新闻数量的字典
         """
         try:
-            # 模拟情感分析结果
-            total = len(news_list)
-            if total == 0:
-                return {"正面": 0, "中性": 0, "负面": 0}
-            
-            # 随机生成情感分布
-            positive = random.randint(int(total * 0.3), int(total * 0.6))
-            negative = random.randint(int(total * 0.1), int(total * 0.3))
-            neutral = total - positive - negative
-            
-            return {
-                "正面": positive,
-                "中性": neutral,
-                "负面": negative
-            }
+            sentiment_counts = self.news_data_manager.get_sentiment_distribution_by_keyword(keyword)
+            return {label: sentiment_counts.get(sentiment, 0) for sentiment, label in SENTIMENT_LABELS.items()}
             
         except Exception as e:
             self.logger.error(f"情感分析时发生错误: {str(e)}")
             return {"正面": 0, "中性": 0, "负面": 0}
     
-    def generate_sentiment_chart(self, keyword: str, sentiment_analysis: Dict[str, int]) -> str:
+    def generate_sentiment_chart(self, keyword: str, sentiment_analysis: Dict[str, int]) -> Future:
         """
         生成情感分析图
         
@@ -475,39 +513,25 @@ class TrendAnalyzer:
             sentiment_analysis: 情感分析结果
             
         Returns:
-            情感分析图路径
+            结果为情感分析图路径的Future
         """
         try:
             if not sentiment_analysis:
-                return "/static/images/sentiment_chart_default.png"
+                return self.default_chart("sentiment_chart")
             
             # 准备数据
             labels = list(sentiment_analysis.keys())
             sizes = list(sentiment_analysis.values())
             colors = ['#2ecc71', '#3498db', '#e74c3c']
             
-            # 创建图表
-            plt.figure(figsize=(8, 8))
-            plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90, shadow=True)
-            plt.axis('equal')
-            
-            # 设置标题
-            plt.title(f"关键词 '{keyword}' 的情感分析", fontsize=16)
-            
-            # 保存图表
-            chart_filename = f"sentiment_chart_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
-            
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("sentiment_chart", keyword, None, sentiment_analysis, render_pie_chart,
+                                     f"关键词 '{keyword}' 的情感分析", labels, sizes, colors)
             
         except Exception as e:
             self.logger.error(f"生成情感分析图时发生错误: {str(e)}")
-            return "/static/images/sentiment_chart_default.png"
+            return self.default_chart("sentiment_chart")
     
-    def generate_platform_chart(self, keyword: str, platform_distribution: Dict[str, int]) -> str:
+    def generate_platform_chart(self, keyword: str, platform_distribution: Dict[str, int]) -> Future:
         """
         生成平台分布图
         
@@ -516,39 +540,24 @@ class TrendAnalyzer:
             platform_distribution: 平台分布
             
         Returns:
-            平台分布图路径
+            结果为平台分布图路径的Future
         """
         try:
             if not platform_distribution:
-                return "/static/images/platform_chart_default.png"
+                return self.default_chart("platform_chart")
             
             # 准备数据
             platforms = list(platform_distribution.keys())
             counts = list(platform_distribution.values())
-            colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
-            
-            # 创建图表
-            plt.figure(figsize=(8, 8))
-            plt.pie(counts, labels=platforms, colors=colors[:len(platforms)], autopct='%1.1f%%', startangle=90, shadow=True)
-            plt.axis('equal')
             
-            # 设置标题
-            plt.title(f"关键词 '{keyword}' 的平台分布", fontsize=16)
-            
-            # 保存图表
-            chart_filename = f"platform_chart_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
-            
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("platform_chart", keyword, None, platform_distribution, render_pie_chart,
+                                     f"关键词 '{keyword}' 的平台分布", platforms, counts, CHART_COLORS[:len(platforms)])
             
         except Exception as e:
             self.logger.error(f"生成平台分布图时发生错误: {str(e)}")
-            return "/static/images/platform_chart_default.png"
+            return self.default_chart("platform_chart")
     
-    def generate_interaction_chart(self, keyword: str, interaction_data: Dict[str, int]) -> str:
+    def generate_interaction_chart(self, keyword: str, interaction_data: Dict[str, int]) -> Future:
         """
         生成互动数据图
         
@@ -557,57 +566,22 @@ class TrendAnalyzer:
             interaction_data: 互动数据
             
         Returns:
-            互动数据图路径
+            结果为互动数据图路径的Future
         """
         try:
             if not interaction_data:
-                return "/static/images/interaction_chart_default.png"
+                return self.default_chart("interaction_chart")
             
             # 准备数据
-            labels = ["阅读量", "评论数", "点赞数", "分享数", "转发数"]
-            values = [
-                interaction_data.get("read_count", 0),
-                interaction_data.get("comment_count", 0),
-                interaction_data.get("like_count", 0),
-                interaction_data.get("share_count", 0),
-                interaction_data.get("forward_count", 0)
-            ]
-            colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
-            
-            # 创建图表
-            plt.figure(figsize=(10, 6))
-            bars = plt.bar(labels, values, color=colors)
-            
-            # 添加数值标签
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{int(height)}',
-                        ha='center', va='bottom')
-            
-            # 设置标题和标签
-            plt.title(f"关键词 '{keyword}' 的互动数据", fontsize=16)
-            plt.xlabel("互动类型", fontsize=12)
-            plt.ylabel("数量", fontsize=12)
-            
-            # 设置y轴范围
-            plt.ylim(0, max(values) * 1.2)
-            
-            # 调整布局
-            plt.tight_layout()
-            
-            # 保存图表
-            chart_filename = f"interaction_chart_{keyword}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            chart_path = os.path.join(self.images_dir, chart_filename)
-            plt.savefig(chart_path)
-            plt.close()
+            interaction_counts = self.interaction_counts(interaction_data)
+            labels = list(interaction_counts.keys())
+            values = list(interaction_counts.values())
             
-            # 返回相对路径
-            return f"/static/images/{chart_filename}"
+            return self.submit_chart("interaction_chart", keyword, None, values, render_interaction_chart, keyword, labels, values)
             
         except Exception as e:
             self.logger.error(f"生成互动数据图时发生错误: {str(e)}")
-            return "/static/images/interaction_chart_default.png"
+            return self.default_chart("interaction_chart")
     
     def generate_conclusion(self, keyword: str, heat_change: Dict[str, Any], sentiment_analysis: Dict[str, int], platform_distribution: Dict[str, int]) -> str:
         """
@@ -0,0 +1,324 @@
+import os
+import time
+import signal
+import socket
+import logging
+import argparse
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage import FileStorage
+from data_manager import NewsDataManager
+from crawl_frontier import CrawlFrontier
+from crawl_orchestrator import merge_news
+from crawler_runtime import CrawlerRuntime
+from response_cache import ResponseCache
+from news_scraper import BaseCrawler, TencentNewsCrawler, ToutiaoNewsCrawler, WeixinCrawler, WeiboCrawler
+from job_queue import JobQueue, JOB_SEARCH, JOB_ARTICLE, JOB_DONE
+
+# 默认数据目录，与app.py一致
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# 任务队列数据库文件名，位于数据目录下
+QUEUE_FILE = "crawl_jobs.db"
+
+CRAWLER_CLASSES = (TencentNewsCrawler, ToutiaoNewsCrawler, WeixinCrawler, WeiboCrawler)
+
+LOG_FORMAT = '%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def build_crawlers(runtime: CrawlerRuntime) -> Dict[str, BaseCrawler]:
+    """
+    创建共用同一运行时的各平台爬虫
+    
+    Args:
+        runtime: 爬虫运行时
+    
+    Returns:
+        平台类型到爬虫的字典
+    """
+    return {cls.platform_type: cls(runtime) for cls in CRAWLER_CLASSES}
+
+
+def run_job(crawlers: Dict[str, BaseCrawler], job: Dict[str, Any]) -> Any:
+    """
+    执行一个抓取任务
+    
+    Args:
+        crawlers: 平台类型到爬虫的字典
+        job: 任务
+    
+    Returns:
+        搜索任务返回搜索结果列表，文章任务返回提取的新闻信息（提取失败时为None）
+    
+    Raises:
+        ValueError: 平台类型没有对应的爬虫
+    """
+    crawler = crawlers.get(job["platform_type"])
+    if crawler is None:
+        raise ValueError(f"未找到平台类型 {job['platform_type']} 的爬虫")
+    if job["kind"] == JOB_SEARCH:
+        return crawler.search_keyword(job["keyword"], (job["payload"] or {}).get("limit", 10))
+    return crawler.extract_news_info(job["url"])
+
+
+def worker_main(db_path: str, cache_dir: str, worker_id: str, stop_event: Any, poll_interval: float) -> None:
+    """
+    工作进程入口，循环领取并执行任务，直到收到停止信号
+    
+    每个进程使用自己的连接池和浏览器驱动池，响应缓存目录在进程间共用。
+    
+    Args:
+        db_path: 任务队列数据库路径
+        cache_dir: 响应缓存目录
+        worker_id: 工作进程标识
+        stop_event: 停止信号
+        poll_interval: 队列为空时的等待时间（秒）
+    """
+    # 停止由主进程通过stop_event通知，子进程忽略终端发来的中断信号
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    logger = logging.getLogger(__name__)
+    
+    queue = JobQueue(db_path)
+    runtime = CrawlerRuntime(driver_pool_size=1, response_cache=ResponseCache(cache_dir))
+    crawlers = build_crawlers(runtime)
+    try:
+        while not stop_event.is_set():
+            job = queue.claim(worker_id)
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+            
+            try:
+                queue.complete(job["id"], run_job(crawlers, job))
+            except Exception as e:
+                retry = queue.fail(job["id"], str(e))
+                logger.error(f"执行任务 {job['id']} ({job['kind']} {job['url']}) 失败: {str(e)}"
+                             f"{'，稍后重试' if retry else ''}")
+    finally:
+        runtime.close()
+
+
+class Ingester:
+    """
+    任务结果入库，将工作进程的抓取结果写入新闻数据和抓取边界
+    
+    通过队列中的命名锁保证同一时间只有一个入库进程：搜索结果经抓取边界筛选后
+    生成文章任务，文章结果与搜索结果合并后批量保存，并更新抓取边界。Web服务的
+    手动抓取和实时推送也会直接保存新闻，两者通过存储的集合文件锁互斥。
+    """
+    
+    def __init__(self, queue: JobQueue, data_manager: NewsDataManager, frontier: CrawlFrontier,
+                 owner: Optional[str] = None, batch_size: int = 500, retention: float = 7 * 24 * 3600,
+                 purge_interval: float = 3600.0):
+        """
+        初始化入库器
+        
+        Args:
+            queue: 任务队列
+            data_manager: 新闻数据管理器
+            frontier: 抓取边界
+            owner: 入库锁的持有者标识，默认为主机名和进程ID
+            batch_size: 每批处理的任务数
+            retention: 已入库任务在队列中的保留时间（秒）
+            purge_interval: 两次清理过期任务的最短间隔（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.queue = queue
+        self.data_manager = data_manager
+        self.frontier = frontier
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+    
+    def purge(self, force: bool = False) -> int:
+        """
+        定期删除队列中已入库且超过保留时间的任务，避免队列数据库无限增长
+        
+        Args:
+            force: 是否忽略两次清理的最短间隔
+        
+        Returns:
+            删除的任务数
+        """
+        now = time.time()
+        if not force and now - self._last_purge < self.purge_interval:
+            return 0
+        self._last_purge = now
+        
+        purged = self.queue.purge(self.retention)
+        if purged:
+            self.logger.info(f"已清理 {purged} 个过期任务")
+        return purged
+    
+    def run_once(self) -> int:
+        """
+        处理一批已结束的任务
+        
+        Returns:
+            处理的任务数，未获得入库锁时为0
+        """
+        if not self.queue.acquire_lock("ingest", self.owner):
+            return 0
+        self.purge()
+        
+        jobs = self.queue.finished(self.batch_size)
+        if not jobs:
+            return 0
+        
+        news_items: List[Dict[str, Any]] = []
+        article_jobs: List[Dict[str, Any]] = []
+        # (URL, 新闻信息)，新闻信息为None表示抓取失败，保存成功后再更新抓取边界
+        fetched: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        for job in jobs:
+            if job["kind"] == JOB_SEARCH:
+                search_results = job["result"] if job["status"] == JOB_DONE else None
+                for item in self.frontier.plan(job["platform_type"], job["keyword"], search_results or []):
+                    article_jobs.append({
+                        "kind": JOB_ARTICLE, "platform_type": job["platform_type"], "keyword": job["keyword"],
+                        "url": item["url"], "payload": item
+                    })
+                continue
+            
+            search_item = job["payload"] or {"url": job["url"], "platform_type": job["platform_type"]}
+            news_info = job["result"] if job["status"] == JOB_DONE else None
+            news_items.append(merge_news(search_item, news_info))
+            fetched.append((job["url"], news_info))
+        
+        # 排队或执行中的相同文章任务不会重复添加，保存失败后重新处理这批任务时最多重复抓取已完成的文章
+        self.queue.enqueue_many(article_jobs)
+        if not self.data_manager.save_news(news_items):
+            self.logger.error(f"保存 {len(news_items)} 条新闻失败，{len(jobs)} 个任务保留到下次入库")
+            return 0
+        
+        for url, news_info in fetched:
+            if news_info:
+                self.frontier.mark_done(url, news_info)
+            else:
+                self.frontier.mark_failed(url)
+        self.frontier.flush()
+        # 保存成功后才标记入库，中途退出时重新处理，重复的新闻在保存时去重
+        self.queue.mark_ingested([job["id"] for job in jobs])
+        self.logger.info(f"已入库 {len(jobs)} 个任务，新增 {len(article_jobs)} 个文章任务，保存 {len(news_items)} 条新闻")
+        return len(jobs)
+    
+    def release(self) -> None:
+        """
+        释放入库锁
+        """
+        self.queue.release_lock("ingest", self.owner)
+
+
+def open_storage(data_dir: str) -> FileStorage:
+    """
+    打开与app.py相同配置的数据存储
+    
+    Args:
+        data_dir: 数据目录
+    
+    Returns:
+        文件存储
+    """
+    return FileStorage(data_dir, log_collections=["news_data", "crawl_frontier", "news_tokens"])
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    启动工作进程，并在主进程中循环入库，收到SIGINT或SIGTERM后停止
+    
+    Args:
+        args: 命令行参数
+    """
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    cache_dir = os.path.join(args.data_dir, "http_cache")
+    stopping = []
+    
+    # 信号处理函数中不能操作stop_event，主线程可能正持有其内部锁
+    def handle_stop(signum, frame):
+        stopping.append(signum)
+    
+    signal.signal(signal.SIGINT, handle_stop)
+    signal.signal(signal.SIGTERM, handle_stop)
+    
+    processes: Dict[str, Any] = {}
+    
+    def spawn(worker_id: str) -> None:
+        process = ctx.Process(
+            target=worker_main, args=(args.queue, cache_dir, worker_id, stop_event, args.poll_interval),
+            name=worker_id, daemon=True
+        )
+        process.start()
+        processes[worker_id] = process
+    
+    host = socket.gethostname()
+    for i in range(args.processes):
+        spawn(f"{host}-worker-{i}")
+    logging.getLogger(__name__).info(f"已启动 {args.processes} 个工作进程")
+    
+    ingester = None
+    if not args.no_ingest:
+        storage = open_storage(args.data_dir)
+        ingester = Ingester(JobQueue(args.queue), NewsDataManager(storage), CrawlFrontier(storage))
+    
+    try:
+        while not stopping:
+            if ingester is not None:
+                ingester.run_once()
+            # 异常退出的工作进程重新启动
+            for worker_id, process in list(processes.items()):
+                if not process.is_alive():
+                    logging.getLogger(__name__).warning(f"工作进程 {worker_id} 已退出，重新启动")
+                    spawn(worker_id)
+            time.sleep(args.ingest_interval)
+    finally:
+        stop_event.set()
+        for process in processes.values():
+            process.join(timeout=30)
+        if ingester is not None:
+            while ingester.run_once():
+                pass
+            ingester.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻抓取工作进程，从任务队列领取抓取任务并统一入库")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="数据目录")
+    parser.add_argument("--queue", help=f"任务队列数据库路径，默认为数据目录下的{QUEUE_FILE}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = subparsers.add_parser("run", help="启动工作进程")
+    run_parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="工作进程数")
+    run_parser.add_argument("--poll-interval", type=float, default=1.0, help="队列为空时的等待时间（秒）")
+    run_parser.add_argument("--ingest-interval", type=float, default=1.0, help="入库间隔（秒）")
+    run_parser.add_argument("--no-ingest", action="store_true", help="只执行任务，由其他机器上的进程入库")
+    
+    enqueue_parser = subparsers.add_parser("enqueue", help="添加关键词搜索任务")
+    enqueue_parser.add_argument("keyword", help="关键词")
+    enqueue_parser.add_argument("--platforms", nargs="+", help="平台类型，默认为全部活跃平台")
+    enqueue_parser.add_argument("--limit", type=int, default=10, help="每个平台的结果数量限制")
+    
+    subparsers.add_parser("status", help="查看队列中各状态的任务数")
+    
+    args = parser.parse_args()
+    args.queue = args.queue or os.path.join(args.data_dir, QUEUE_FILE)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
+    if args.command == "run":
+        run(args)
+    elif args.command == "enqueue":
+        platform_types = args.platforms or [
+            p["type"] for p in open_storage(args.data_dir).load_json("platforms", []) if p.get("status") == "active"
+        ]
+        added = JobQueue(args.queue).enqueue_search(args.keyword, platform_types, args.limit)
+        print(f"已添加 {added} 个搜索任务")
+    elif args.command == "status":
+        for kind, counts in JobQueue(args.queue).get_summary().items():
+            print(kind, " ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()